@@ -0,0 +1,25 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+'''camdkit command-line entry point: python -m camdkit <command> ...'''
+
+import sys
+
+_COMMANDS = {
+  "analyze": "camdkit.analysis",
+  "batch": "camdkit.batch",
+}
+
+def main() -> int:
+  if len(sys.argv) < 2 or sys.argv[1] not in _COMMANDS:
+    print(f"usage: python -m camdkit {{{','.join(_COMMANDS)}}} ...", file=sys.stderr)
+    return 2
+  import importlib
+  command = importlib.import_module(_COMMANDS[sys.argv[1]])
+  return command.main(sys.argv[2:])
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,277 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+"""Dropped-sample and jitter analysis of the timing parameters of a Clip
+
+Three independent checks are made:
+
+- gaps in timing_sequence_number, optionally wrapping at a modulus (F4
+  sequence numbers are the packet status modulo 16)
+- deviation of the intervals between timing_sample_timestamp values from the
+  period implied by timing_sample_rate
+- discontinuities in timing_timecode
+
+TimingAnalyzer accumulates these over successive chunks of samples (or
+successive single-frame Clips, as received from a live source) carrying only
+the last sample of each chunk over to the next; analyze_clip() analyzes a
+whole Clip at once.
+"""
+
+import sys
+import json
+import math
+import argparse
+import operator
+import dataclasses
+from fractions import Fraction
+from typing import Optional, Sequence
+
+from camdkit.clip import Clip
+from camdkit.timing_types import NANOSECONDS_PER_SECOND, timecodes_to_frames
+
+__all__ = ['F4_SEQUENCE_MODULUS', 'TimingReport', 'TimingAnalyzer', 'analyze_clip']
+
+# Mo-Sys F4 sequence numbers are 4 bits wide
+F4_SEQUENCE_MODULUS = 16
+
+# At most this many sample indices are kept for each kind of event
+_MAX_EVENTS = 100
+
+
+@dataclasses.dataclass
+class TimingReport:
+    samples: int = 0
+
+    sequence_gaps: int = 0
+    """Number of places where sequence numbers skip ahead"""
+    sequence_dropped: int = 0
+    """Number of samples missing according to the sequence numbers"""
+    sequence_repeats: int = 0
+    sequence_resets: int = 0
+    """Number of places where (unwrapped) sequence numbers go backwards"""
+    sequence_gap_indices: tuple[int, ...] = ()
+
+    expected_interval_ns: Optional[float] = None
+    interval_mean_ns: Optional[float] = None
+    interval_stdev_ns: Optional[float] = None
+    interval_min_ns: Optional[int] = None
+    interval_max_ns: Optional[int] = None
+    interval_max_deviation_ns: Optional[float] = None
+    irregular_intervals: int = 0
+    """Number of intervals deviating from the expected interval by more than the tolerance"""
+    timestamp_dropped: int = 0
+    """Number of samples missing according to the timestamps"""
+    irregular_interval_indices: tuple[int, ...] = ()
+
+    timecode_discontinuities: int = 0
+    timecode_discontinuity_indices: tuple[int, ...] = ()
+
+
+class TimingAnalyzer:
+    """Streaming analysis of timing parameters"""
+
+    def __init__(self,
+                 sequence_modulus: Optional[int] = None,
+                 sample_rate: Optional[Fraction] = None,
+                 tolerance: float = 0.1,
+                 timecode_repeats: Optional[bool] = None):
+        """`sample_rate` defaults to the first timing_sample_rate seen. An
+        interval is irregular if it deviates from the expected interval by
+        more than `tolerance` times the expected interval. `timecode_repeats`
+        allows consecutive samples with the same timecode, and defaults to
+        whether the sample rate exceeds the timecode frame rate."""
+        self.sequence_modulus = sequence_modulus
+        self.sample_rate = sample_rate
+        self.tolerance = tolerance
+        self.timecode_repeats = timecode_repeats
+        self._report = TimingReport()
+        self._sequence_gap_indices: list[int] = []
+        self._irregular_interval_indices: list[int] = []
+        self._timecode_discontinuity_indices: list[int] = []
+        self._last_sequence_number: Optional[int] = None
+        self._last_timestamp_ns: Optional[int] = None
+        self._last_timecode_frames: Optional[int] = None
+        self._frames_per_day: Optional[int] = None
+        # running count, mean and sum of squared deviations of the intervals
+        self._intervals = 0
+        self._interval_mean = 0.0
+        self._interval_m2 = 0.0
+
+    @property
+    def _expected_interval_ns(self) -> Optional[float]:
+        return None if self.sample_rate is None else NANOSECONDS_PER_SECOND / float(self.sample_rate)
+
+    def update(self,
+               sequence_numbers: Optional[Sequence[int]] = None,
+               timestamps_ns: Optional[Sequence[int]] = None,
+               timecode_frames: Optional[Sequence[int]] = None,
+               frames_per_day: Optional[int] = None) -> None:
+        """Analyze the next chunk of samples. Each of the sequences, where
+        given, holds one value per sample of the chunk."""
+        base = self._report.samples
+        count = max(len(s) for s in (sequence_numbers, timestamps_ns, timecode_frames, ()) if s is not None)
+        if sequence_numbers:
+            self._update_sequence_numbers(base, sequence_numbers)
+        if timestamps_ns:
+            self._update_timestamps(base, timestamps_ns)
+        if timecode_frames:
+            if frames_per_day is not None:
+                self._frames_per_day = frames_per_day
+            self._update_timecodes(base, timecode_frames)
+        self._report.samples += count
+
+    def update_clip(self, clip: Clip) -> None:
+        """Analyze the samples of a clip, following on from those already analyzed"""
+        if self.sample_rate is None and clip.timing_sample_rate:
+            rate = clip.timing_sample_rate[0]
+            self.sample_rate = Fraction(rate.num, rate.denom)
+        timestamps_ns = None
+        if clip.timing_sample_timestamp:
+            timestamps_ns = [t.to_nanoseconds() for t in clip.timing_sample_timestamp]
+        timecode_frames = frames_per_day = None
+        if clip.timing_timecode:
+            timecode_format = clip.timing_timecode[0].format
+            if self.timecode_repeats is None and self.sample_rate is not None:
+                self.timecode_repeats = (self.sample_rate
+                                         > Fraction(timecode_format.frame_rate.num, timecode_format.frame_rate.denom))
+            timecode_frames = timecodes_to_frames(clip.timing_timecode)
+            frames_per_day = timecode_format.frames_per_day()
+        if clip.timing_sequence_number or timestamps_ns or timecode_frames:
+            self.update(clip.timing_sequence_number, timestamps_ns, timecode_frames, frames_per_day)
+        else:
+            self._report.samples += clip.frame_count()
+
+    def _update_sequence_numbers(self, base: int, sequence_numbers: Sequence[int]) -> None:
+        report = self._report
+        values = sequence_numbers if self._last_sequence_number is None else (self._last_sequence_number,
+                                                                              *sequence_numbers)
+        first = base if self._last_sequence_number is None else base - 1
+        self._last_sequence_number = sequence_numbers[-1]
+        modulus = self.sequence_modulus
+        steps = list(map(operator.sub, values[1:], values))
+        # the usual case, every step one (or a wrap), is checked without looping in Python
+        if steps.count(1) + (steps.count(1 - modulus) if modulus is not None else 0) == len(steps):
+            return
+        if modulus is not None:
+            steps = [step % modulus for step in steps]
+        for i, step in enumerate(steps):
+            if step == 1:
+                continue
+            if step == 0:
+                report.sequence_repeats += 1
+            elif step < 0:
+                report.sequence_resets += 1
+            else:
+                report.sequence_gaps += 1
+                report.sequence_dropped += step - 1
+                if len(self._sequence_gap_indices) < _MAX_EVENTS:
+                    self._sequence_gap_indices.append(first + i + 1)
+
+    def _update_timestamps(self, base: int, timestamps_ns: Sequence[int]) -> None:
+        report = self._report
+        values = timestamps_ns if self._last_timestamp_ns is None else (self._last_timestamp_ns, *timestamps_ns)
+        first = base if self._last_timestamp_ns is None else base - 1
+        self._last_timestamp_ns = timestamps_ns[-1]
+        intervals = list(map(operator.sub, values[1:], values))
+        if not intervals:
+            return
+
+        # merge the statistics of this chunk into the running ones (Chan et
+        # al.); intervals are integers, so the chunk's own sums are exact
+        n = len(intervals)
+        total_ns = sum(intervals)
+        mean = total_ns / n
+        m2 = (n * sum(map(operator.mul, intervals, intervals)) - total_ns * total_ns) / n
+        total = self._intervals + n
+        delta = mean - self._interval_mean
+        self._interval_mean += delta * n / total
+        self._interval_m2 += m2 + delta * delta * self._intervals * n / total
+        self._intervals = total
+        chunk_min, chunk_max = min(intervals), max(intervals)
+        report.interval_min_ns = chunk_min if report.interval_min_ns is None else min(report.interval_min_ns,
+                                                                                     chunk_min)
+        report.interval_max_ns = chunk_max if report.interval_max_ns is None else max(report.interval_max_ns,
+                                                                                     chunk_max)
+
+        if (expected := self._expected_interval_ns) is None:
+            return
+        limit = self.tolerance * expected
+        max_deviation = max(abs(chunk_min - expected), abs(chunk_max - expected))
+        if report.interval_max_deviation_ns is None or max_deviation > report.interval_max_deviation_ns:
+            report.interval_max_deviation_ns = max_deviation
+        if max_deviation <= limit:
+            return
+        low, high = expected - limit, expected + limit
+        irregular = [i for i, interval in enumerate(intervals) if not low <= interval <= high]
+        report.irregular_intervals += len(irregular)
+        report.timestamp_dropped += sum(max(0, round(intervals[i] / expected) - 1) for i in irregular)
+        room = _MAX_EVENTS - len(self._irregular_interval_indices)
+        self._irregular_interval_indices.extend(first + i + 1 for i in irregular[:room])
+
+    def _update_timecodes(self, base: int, timecode_frames: Sequence[int]) -> None:
+        report = self._report
+        values = (timecode_frames if self._last_timecode_frames is None
+                  else (self._last_timecode_frames, *timecode_frames))
+        first = base if self._last_timecode_frames is None else base - 1
+        self._last_timecode_frames = timecode_frames[-1]
+        steps = list(map(operator.sub, values[1:], values))
+        allow_repeats = bool(self.timecode_repeats)
+        if self._frames_per_day is not None and steps.count(1 - self._frames_per_day):
+            steps = [step % self._frames_per_day for step in steps]
+        if steps.count(1) + (steps.count(0) if allow_repeats else 0) == len(steps):
+            return
+        for i, step in enumerate(steps, 1):
+            if step != 1 and not (allow_repeats and step == 0):
+                report.timecode_discontinuities += 1
+                if len(self._timecode_discontinuity_indices) < _MAX_EVENTS:
+                    self._timecode_discontinuity_indices.append(first + i)
+
+    def report(self) -> TimingReport:
+        """The analysis of all samples so far"""
+        report = dataclasses.replace(self._report,
+                                     sequence_gap_indices=tuple(self._sequence_gap_indices),
+                                     irregular_interval_indices=tuple(self._irregular_interval_indices),
+                                     timecode_discontinuity_indices=tuple(self._timecode_discontinuity_indices),
+                                     expected_interval_ns=self._expected_interval_ns)
+        if self._intervals:
+            report.interval_mean_ns = self._interval_mean
+            report.interval_stdev_ns = math.sqrt(self._interval_m2 / self._intervals)
+        return report
+
+
+def analyze_clip(clip: Clip,
+                 sequence_modulus: Optional[int] = None,
+                 sample_rate: Optional[Fraction] = None,
+                 tolerance: float = 0.1) -> TimingReport:
+    """Analyze the timing parameters of a whole clip; see TimingAnalyzer"""
+    analyzer = TimingAnalyzer(sequence_modulus, sample_rate, tolerance)
+    analyzer.update_clip(clip)
+    return analyzer.report()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    from camdkit.registry import open_clip
+
+    parser = argparse.ArgumentParser(prog="camdkit analyze",
+                                     description="Report dropped samples, timestamp jitter and timecode"
+                                                 " discontinuities in a clip of vendor metadata.")
+    parser.add_argument('paths', nargs='+', type=str, help="The vendor file or files of the clip, in any order")
+    parser.add_argument('--modulus', type=int, default=None,
+                        help=f"Modulus at which sequence numbers wrap (e.g. {F4_SEQUENCE_MODULUS} for Mo-Sys F4)")
+    parser.add_argument('--rate', type=Fraction, default=None,
+                        help="Expected sample rate in Hz, if the clip carries none (e.g. 240 or 24000/1001)")
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help="Fraction of the expected interval beyond which an interval is irregular")
+
+    args = parser.parse_args(argv)
+
+    report = analyze_clip(open_clip(*args.paths), args.modulus, args.rate, args.tolerance)
+    print(json.dumps(dataclasses.asdict(report), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -27,57 +27,75 @@ def t_number_from_linear_iris_value(lin_value: int) -> typing.Optional[Fraction]
   """
   return math.pow(2, (lin_value - 1000)/1000/2)
 
-def to_clip(csv_path: str) -> camdkit.model.Clip:
-  """Read ARRI camera metadata into a `Clip`. `csv_path` is the path to a CSV
-  file extracted using ARRI Meta Extract (AME)."""
+def _clip_from_first_frame(frame_data: dict) -> camdkit.model.Clip:
+  assert frame_data["Lens Distance Unit"] == "Meter"
 
-  with open(csv_path, encoding="utf-8") as csvfile:
-    csv_data = list(csv.DictReader(csvfile, dialect="excel-tab"))
+  clip = camdkit.model.Clip()
 
-    n_frames = len(csv_data)
+  clip.iso = int(frame_data["Exposure Index ASA"])
 
-    if n_frames <= 0:
-      raise ValueError("No data")
+  clip.camera_make = "ARRI"
 
-    clip = camdkit.model.Clip()
+  clip.camera_model = frame_data["Camera Model"]
 
-    assert csv_data[0]["Lens Distance Unit"] == "Meter"
+  clip.camera_serial_number = frame_data["Camera Serial Number"]
 
-    clip.iso = int(csv_data[0]["Exposure Index ASA"])
+  lens_model = frame_data["Lens Model"]
 
-    clip.duration = len(csv_data)/Fraction(csv_data[0]["Project FPS"])
+  if lens_model.startswith("ARRI "):
+    clip.lens_make = "ARRI"
+    clip.lens_model = lens_model[5:]
+  else:
+    clip.lens_model = lens_model
 
-    clip.camera_make = "ARRI"
+  clip.lens_serial_number = frame_data["Lens Serial Number"]
 
-    clip.camera_model = csv_data[0]["Camera Model"]
+  clip.capture_frame_rate = utils.guess_fps(Fraction(frame_data["Project FPS"]))
 
-    clip.camera_serial_number = csv_data[0]["Camera Serial Number"]
+  clip.shutter_angle = float(frame_data["Shutter Angle"])
 
-    lens_model = csv_data[0]["Lens Model"]
+  clip.anamorphic_squeeze = Fraction(frame_data["Lens Squeeze"])
 
-    if lens_model.startswith("ARRI "):
-      clip.lens_make = "ARRI"
-      clip.lens_model = lens_model[5:]
-    else:
-      clip.lens_model = lens_model
+  pix_dims = camdkit.model.Dimensions(
+    width=int(frame_data["Image Width"]),
+    height=int(frame_data["Image Height"])
+  )
+  pixel_pitch = _CAMERA_FAMILY_PIXEL_PITCH_MAP[(frame_data["Camera Family"], pix_dims.width)]
+  clip.active_sensor_physical_dimensions = camdkit.model.Dimensions(
+      width=pix_dims.width * pixel_pitch / 1000.0,
+      height=pix_dims.height * pixel_pitch / 1000.0
+    )
 
-    clip.lens_serial_number = csv_data[0]["Lens Serial Number"]
+  return clip
 
-    clip.capture_frame_rate = utils.guess_fps(Fraction(csv_data[0]["Project FPS"]))
+def to_static(csv_path: str) -> camdkit.model.Static:
+  """Read only the static ARRI camera metadata, from the first frame row of
+  the CSV file extracted using ARRI Meta Extract (AME). The clip duration is
+  not set, as AME provides no frame count other than the number of rows."""
 
-    clip.shutter_angle = float(csv_data[0]["Shutter Angle"])
+  with open(csv_path, encoding="utf-8") as csvfile:
+    first_frame_data = next(csv.DictReader(csvfile, dialect="excel-tab"), None)
 
-    clip.anamorphic_squeeze = Fraction(csv_data[0]["Lens Squeeze"])
+  if first_frame_data is None:
+    raise ValueError("No data")
 
-    pix_dims = camdkit.model.Dimensions(
-      width=int(csv_data[0]["Image Width"]),
-      height=int(csv_data[0]["Image Height"])
-    )
-    pixel_pitch = _CAMERA_FAMILY_PIXEL_PITCH_MAP[(csv_data[0]["Camera Family"], pix_dims.width)]
-    clip.active_sensor_physical_dimensions = camdkit.model.Dimensions(
-        width=pix_dims.width * pixel_pitch / 1000.0,
-        height=pix_dims.height * pixel_pitch / 1000.0
-      )
+  return _clip_from_first_frame(first_frame_data).static
+
+def to_clip(csv_path: str) -> camdkit.model.Clip:
+  """Read ARRI camera metadata into a `Clip`. `csv_path` is the path to a CSV
+  file extracted using ARRI Meta Extract (AME)."""
+
+  with open(csv_path, encoding="utf-8") as csvfile:
+    csv_data = list(csv.DictReader(csvfile, dialect="excel-tab"))
+
+    n_frames = len(csv_data)
+
+    if n_frames <= 0:
+      raise ValueError("No data")
+
+    clip = _clip_from_first_frame(csv_data[0])
+
+    clip.duration = len(csv_data)/Fraction(csv_data[0]["Project FPS"])
 
     clip.lens_focal_length = tuple(float(m["Lens Focal Length"]) for m in csv_data)
 
@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+"""Batch ingest of many clips across the vendor readers
+
+A batch is described either by a JSON manifest, a list of entries of the form
+
+    {"vendor": "red", "paths": ["A001.static.csv", "A001.frames.csv"], "name": "A001"}
+
+(where "paths" are given in the order the vendor reader's to_clip() takes
+them, and "name" is optional), or by a directory that is scanned for vendor
+files, with vendors recognized by camdkit.registry from file headers.
+
+Clips are read by the existing to_clip() readers in a process pool, so that
+interpreter start-up and camdkit import costs are paid once per worker rather
+than once per clip.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import dataclasses
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, Optional
+
+from camdkit.clip import Clip
+from camdkit.registry import STATIC, DYNAMIC, READERS, detect, read_clip
+
+__all__ = ['VENDORS', 'OUTPUT_FORMATS', 'BatchJob', 'BatchResult',
+           'jobs_from_manifest', 'jobs_from_directory', 'run_batch']
+
+VENDORS = tuple(READERS)
+OUTPUT_FORMATS = ('json', 'rle.json', 'ndjson', 'parquet')
+
+
+@dataclasses.dataclass(frozen=True)
+class BatchJob:
+    vendor: str
+    paths: tuple[str, ...]
+    name: str
+
+
+@dataclasses.dataclass
+class BatchResult:
+    name: str
+    vendor: str
+    paths: tuple[str, ...]
+    frames: int = 0
+    read_seconds: float = 0.0
+    write_seconds: float = 0.0
+    outputs: tuple[str, ...] = ()
+    error: Optional[str] = None
+
+
+def jobs_from_manifest(manifest_path: str | Path) -> list[BatchJob]:
+    """Read batch jobs from a JSON manifest. Relative paths are resolved
+    against the directory containing the manifest."""
+    manifest_path = Path(manifest_path)
+    with open(manifest_path, "r", encoding="utf-8") as fp:
+        entries = json.load(fp)
+    jobs = []
+    for entry in entries:
+        vendor = entry["vendor"]
+        if vendor not in VENDORS:
+            raise ValueError(f"manifest entry has unknown vendor '{vendor}'")
+        paths = tuple(str(manifest_path.parent / p) for p in entry["paths"])
+        jobs.append(BatchJob(vendor, paths, entry.get("name", Path(paths[-1]).name)))
+    return jobs
+
+
+def jobs_from_directory(directory: str | Path) -> list[BatchJob]:
+    """Scan a directory tree for vendor files, recognized by their headers.
+    Within each directory, the static and per-frame files of two-file vendors
+    (RED, Canon, Venice) are paired by the longest common file name prefix.
+    """
+    jobs = []
+    for dirpath, _, filenames in sorted(os.walk(directory)):
+        detected: dict[tuple[str, str], list[str]] = {}
+        for filename in sorted(filenames):
+            if vendor_and_role := detect(os.path.join(dirpath, filename)):
+                detected.setdefault(vendor_and_role, []).append(filename)
+        for (vendor, role), filenames_in_role in detected.items():
+            if READERS[vendor].roles == (role,):
+                jobs.extend(BatchJob(vendor, (os.path.join(dirpath, f),), os.path.splitext(f)[0])
+                            for f in filenames_in_role)
+            elif role == STATIC:
+                dynamic_filenames = detected.get((vendor, DYNAMIC), [])
+                for static_filename in filenames_in_role:
+                    if not dynamic_filenames:
+                        break
+                    dynamic_filename = max(dynamic_filenames,
+                                           key=lambda f: len(os.path.commonprefix((static_filename, f))))
+                    dynamic_filenames.remove(dynamic_filename)
+                    name = os.path.commonprefix((static_filename, dynamic_filename)).rstrip("._- ")
+                    jobs.append(BatchJob(vendor,
+                                         (os.path.join(dirpath, static_filename),
+                                          os.path.join(dirpath, dynamic_filename)),
+                                         name or os.path.splitext(dynamic_filename)[0]))
+    return jobs
+
+
+def _parquet_row(frame_json: dict) -> dict:
+    """The Parquet row of the JSON of one frame: its regular parameters, with
+    those of nested objects in dotted columns"""
+    row = {}
+    for key, value in frame_json.items():
+        if key == "static":
+            continue
+        if isinstance(value, dict):
+            for k, v in value.items():
+                row[f"{key}.{k}"] = v[0]
+        else:
+            row[key] = value[0]
+    return row
+
+
+def _write_parquet(clip: Clip, path: Path) -> None:
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise RuntimeError("Parquet output requires the pyarrow package") from e
+
+    table = pyarrow.Table.from_pylist([_parquet_row(f) for f in clip.frames_to_json()])
+    static_json = Clip.to_json(clip).get("static", {})
+    table = table.replace_schema_metadata({"static": json.dumps(static_json)})
+    pyarrow.parquet.write_table(table, path)
+
+
+def write_clip(clip: Clip, output_dir: Path, name: str, formats: Iterable[str]) -> tuple[str, ...]:
+    """Write a clip in each of the requested formats, returning the paths written"""
+    outputs = []
+    for output_format in formats:
+        path = output_dir / f"{name}.{output_format}"
+        match output_format:
+            case 'json':
+                with open(path, "w", encoding="utf-8") as fp:
+                    json.dump(clip.to_json(), fp, indent=2)
+            case 'rle.json':
+                with open(path, "w", encoding="utf-8") as fp:
+                    json.dump(clip.to_json(rle=True), fp, indent=2)
+            case 'ndjson':
+                with open(path, "w", encoding="utf-8") as fp:
+                    for frame_json in clip.frames_to_json():
+                        fp.write(json.dumps(frame_json))
+                        fp.write("\n")
+            case 'parquet':
+                _write_parquet(clip, path)
+            case _:
+                raise ValueError(f"unknown output format '{output_format}'")
+        outputs.append(str(path))
+    return tuple(outputs)
+
+
+def _ingest(job: BatchJob, output_dir: Path, formats: tuple[str, ...]) -> BatchResult:
+    result = BatchResult(job.name, job.vendor, job.paths)
+    start = time.perf_counter()
+    try:
+        clip = read_clip(job.vendor, job.paths)
+        result.read_seconds = time.perf_counter() - start
+        result.frames = clip.frame_count()
+        start = time.perf_counter()
+        result.outputs = write_clip(clip, output_dir, job.name, formats)
+        result.write_seconds = time.perf_counter() - start
+    except Exception as e:  # one bad clip must not sink the whole shoot day
+        result.error = f"{type(e).__name__}: {e}"
+        if not result.read_seconds:
+            result.read_seconds = time.perf_counter() - start
+    return result
+
+
+def run_batch(jobs: Iterable[BatchJob],
+              output_dir: str | Path,
+              formats: Iterable[str] = ('json',),
+              workers: Optional[int] = None) -> Iterator[BatchResult]:
+    """Ingest each job in a pool of `workers` processes (by default, one per
+    CPU), yielding results in job order as they complete"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    formats = tuple(formats)
+    for output_format in formats:
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"unknown output format '{output_format}'")
+    jobs = list(jobs)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_ingest, jobs,
+                                [output_dir] * len(jobs),
+                                [formats] * len(jobs))
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="camdkit batch",
+                                     description="Convert many clips of vendor camera and tracking metadata"
+                                                 " to JSON according to the OSVP Camera Metadata Model.")
+    parser.add_argument('source', type=str,
+                        help="Path to a JSON batch manifest, or to a directory to be scanned for clips")
+    parser.add_argument('output_dir', type=str, help="Directory into which converted clips are written")
+    parser.add_argument('--format', dest='formats', action='append', choices=OUTPUT_FORMATS,
+                        help="Output format; may be repeated (default: json)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Number of worker processes (default: number of CPUs)")
+    parser.add_argument('--report', type=str, default=None,
+                        help="Path of the per-clip timing report (default: <output_dir>/batch_report.json)")
+
+    args = parser.parse_args(argv)
+
+    jobs = (jobs_from_directory(args.source) if os.path.isdir(args.source)
+            else jobs_from_manifest(args.source))
+
+    start = time.perf_counter()
+    results = []
+    for result in run_batch(jobs, args.output_dir, args.formats or ('json',), args.workers):
+        results.append(result)
+        status = result.error or f"{result.frames} frames"
+        print(f"{result.vendor:7} {result.name}: {status}"
+              f" (read {result.read_seconds:.3f}s, write {result.write_seconds:.3f}s)", file=sys.stderr)
+    elapsed = time.perf_counter() - start
+
+    report = {
+        "elapsed_seconds": elapsed,
+        "clips": len(results),
+        "failed": sum(1 for r in results if r.error),
+        "frames": sum(r.frames for r in results),
+        "results": [dataclasses.asdict(r) for r in results]
+    }
+    report_path = args.report or os.path.join(args.output_dir, "batch_report.json")
+    with open(report_path, "w", encoding="utf-8") as fp:
+        json.dump(report, fp, indent=2)
+
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
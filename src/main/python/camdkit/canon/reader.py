@@ -7,31 +7,35 @@
 '''Canon camera reader'''
 
 import csv
+import sys
 import typing
-import struct
+from array import array
 from fractions import Fraction
 
 import camdkit.model
 
 def _read_float32_as_hex(float32_hex: str) -> float:
-  return struct.unpack('>f', bytes.fromhex(float32_hex))[0]
-
-def to_clip(static_csv: typing.IO, frames_csv: typing.IO) -> camdkit.model.Clip:
-  """Read Canon camera metadata into a `Clip`.
-  `static_csv`: Static camera metadata.
-  `frames_csv`: Per-frame camera metadata.
-  """
-
-  # read clip metadata
-  clip_metadata = next(csv.DictReader(static_csv))
+  return _read_float32_column_as_hex((float32_hex,))[0]
+
+def _read_float32_column_as_hex(float32_hex_column: typing.Sequence[str]) -> tuple[float, ...]:
+  """Decode a column of big-endian float32 hex strings with a single
+  `bytes.fromhex` call rather than one `struct.unpack` per row."""
+  if not all(len(s) == 8 for s in float32_hex_column):
+    raise ValueError("float32 hex values must be 8 hex digits long")
+  values = array('f', bytes.fromhex("".join(float32_hex_column)))
+  if sys.byteorder == "little":
+    values.byteswap()
+  return tuple(values)
+
+def _read_rational_column(rational_column: typing.Sequence[str]) -> tuple[float, ...]:
+  """Decode a column of 'num/denom' strings, parsing each distinct string
+  only once. Canon rational columns are constant over long runs of frames."""
+  decoded = {s: float(Fraction(s)) for s in set(rational_column)}
+  return tuple(map(decoded.__getitem__, rational_column))
+
+def _clip_from_clip_and_first_frame(clip_metadata: dict, first_frame_data: dict) -> camdkit.model.Clip:
   clip = camdkit.model.Clip()
 
-  # read frame metadata
-  frame_data = list(csv.DictReader(frames_csv))
-  first_frame_data = frame_data[0]
-
-  # clip metadata
-
   # duration
   clip.duration = Fraction(int(clip_metadata["Duration"]), int(clip_metadata["Timescale"]))
 
@@ -58,20 +62,65 @@ def to_clip(static_csv: typing.IO, frames_csv: typing.IO) -> camdkit.model.Clip:
   # shutter angle
   clip.shutter_angle = float(Fraction(first_frame_data['ExposureTime']))
 
+  return clip
+
+def to_static(static_csv: typing.IO, frames_csv: typing.IO) -> camdkit.model.Static:
+  """Read only the static Canon camera metadata, reading no more than the
+  first row of per-frame metadata.
+  `static_csv`: Static camera metadata.
+  `frames_csv`: Per-frame camera metadata.
+  """
+  clip_metadata = next(csv.DictReader(static_csv))
+  first_frame_data = next(csv.DictReader(frames_csv), None)
+
+  if first_frame_data is None:
+    raise ValueError("No data")
+
+  return _clip_from_clip_and_first_frame(clip_metadata, first_frame_data).static
+
+def to_clip(static_csv: typing.IO, frames_csv: typing.IO) -> camdkit.model.Clip:
+  """Read Canon camera metadata into a `Clip`.
+  `static_csv`: Static camera metadata.
+  `frames_csv`: Per-frame camera metadata.
+  """
+
+  # read clip metadata
+  clip_metadata = next(csv.DictReader(static_csv))
+
+  # read frame metadata, streaming the rows and keeping only the columns
+  # that are sampled rather than every row dict
+  frame_reader = csv.DictReader(frames_csv)
+  first_frame_data = next(frame_reader, None)
+
+  if first_frame_data is None:
+    raise ValueError("No data")
+
+  focal_lengths = [first_frame_data["FocalLength"]]
+  focus_positions = [first_frame_data["FocusPosition"]]
+  aperture_numbers = [first_frame_data["ApertureNumber"]]
+  for m in frame_reader:
+    focal_lengths.append(m["FocalLength"])
+    focus_positions.append(m["FocusPosition"])
+    aperture_numbers.append(m["ApertureNumber"])
+
+  # clip metadata
+
+  clip = _clip_from_clip_and_first_frame(clip_metadata, first_frame_data)
+
   # sampled metadata
 
   # focal_length
-  clip.lens_focal_length = tuple(Fraction(m["FocalLength"]) for m in frame_data)
+  clip.lens_focal_length = _read_rational_column(focal_lengths)
 
   # focus_position
-  clip.lens_focus_distance = tuple(_read_float32_as_hex(m["FocusPosition"]) for m in frame_data)
+  clip.lens_focus_distance = _read_float32_column_as_hex(focus_positions)
 
   # entrance_pupil_offset not supported
 
   # t_number
   if int(first_frame_data['ApertureMode']) == 2:
-    clip.lens_t_number = tuple(Fraction(m["ApertureNumber"]) for m in frame_data)
+    clip.lens_t_number = _read_rational_column(aperture_numbers)
   elif int(first_frame_data['ApertureMode']) == 1:
-    clip.lens_f_number = tuple(Fraction(m["ApertureNumber"]) for m in frame_data)
+    clip.lens_f_number = _read_rational_column(aperture_numbers)
 
   return clip
@@ -5,7 +5,7 @@
 # Copyright Contributors to the SMTPE RIS OSVP Metadata Project
 
 """Types for modeling clips"""
-from typing import Annotated, Any, get_type_hints, Callable, Self, Optional
+from typing import Annotated, Any, get_type_hints, Callable, Self, Optional, ClassVar, Iterator
 
 from pydantic import Field, field_validator, BaseModel, ConfigDict
 from pydantic.json_schema import JsonSchemaMode, JsonSchemaValue
@@ -29,6 +29,8 @@
 from camdkit.timing_types import Timing, Sampling
 from camdkit.versioning_types import VersionedProtocol
 from camdkit.transform_types import Transform
+from camdkit.rle import share_runs, compress_json, expand_json, is_compressed
+from camdkit.memory import MemoryReport, memory_report
 
 __all__ = ['Clip']
 
@@ -61,6 +63,11 @@ def coerce_duration_to_strictly_positive_rational(cls, v):
 class Clip(CompatibleBaseModel):
 
     model_config = ConfigDict(extra="ignore")
+
+    # Clip property names, in schema order, filled in by setup_clip_properties()
+    _regular_clip_properties: ClassVar[tuple[str, ...]] = ()
+    _static_clip_properties: ClassVar[tuple[str, ...]] = ()
+
     static: Static = Static()
 
     tracker: Tracker = Tracker()
@@ -216,9 +223,17 @@ def property_adder(property_name: str,
             clip_property_name = property_schema["clip_property"]
             # print(f"calling cls.add_property({clip_property_name}, {property_name}, {model_path})")
             cls.add_property(clip_property_name, model_path, field_name)
+            if "static" in model_path:
+                static_clip_properties.append(clip_property_name)
+            else:
+                regular_clip_properties.append(clip_property_name)
 
+        regular_clip_properties: list[str] = []
+        static_clip_properties: list[str] = []
         full_schema = cls.make_json_schema(mode='validation', exclude_camdkit_internals=False)
         cls.traverse_json_schema(Clip, full_schema, (), property_adder)
+        cls._regular_clip_properties = tuple(regular_clip_properties)
+        cls._static_clip_properties = tuple(static_clip_properties)
         return cls
 
     @classmethod
@@ -289,11 +304,71 @@ def extractor(property_name: str,
         Clip.traverse_json_schema(Clip, full_schema, ('',), extractor)
         return result
 
-    def to_json(self, i: Optional[int] = None) -> Self:
+    def to_json(self, i: Optional[int] = None, rle: bool = False) -> Self:
+        """The JSON of the clip, or of its ith frame. With `rle`, runs of equal
+        values of regular parameters are run-length encoded (see camdkit.rle)."""
         if i:
             single_frame_clip: Self =  self[i]
             return CompatibleBaseModel.to_json(single_frame_clip)
-        return CompatibleBaseModel.to_json(self)
+        clip_json = CompatibleBaseModel.to_json(self)
+        return compress_json(clip_json) if rle else clip_json
+
+    @classmethod
+    def from_json(cls, json_or_tuple: JsonSchemaValue | tuple[Any, ...]) -> Any:
+        """As CompatibleBaseModel.from_json(), also accepting run-length encoded
+        clip JSON, from which runs of equal values share one instance (see
+        compact() for what that means for changing values in place)"""
+        if isinstance(json_or_tuple, dict) and is_compressed(json_or_tuple):
+            clip = super(Clip, cls).from_json(expand_json(json_or_tuple))
+            clip.compact()
+            return clip
+        return super(Clip, cls).from_json(json_or_tuple)
+
+    def compact(self) -> None:
+        """Make each run of consecutive equal values of each regular parameter
+        share a single instance, so that e.g. a sample rate constant over a
+        take is held once rather than once per frame. The values themselves
+        are unchanged.
+
+        The shared values are not copies: changing an attribute of a value in
+        place changes it for every sample of its run. To change one sample,
+        assign the parameter a new tuple holding a new value for it."""
+        for clip_property_name in self._regular_clip_properties:
+            if (values := getattr(self, clip_property_name)) is not None:
+                setattr(self, clip_property_name, share_runs(values))
+
+    def memory_report(self) -> MemoryReport:
+        """The memory footprint of each parameter of the clip, with estimates
+        of its size under alternative encodings (see camdkit.memory)"""
+        return memory_report(self)
+
+    def frame_count(self) -> int:
+        """Number of samples held by the regular parameters of the clip"""
+        for clip_property_name in self._regular_clip_properties:
+            if (ours := getattr(self, clip_property_name)) is not None:
+                return len(ours)
+        return 0
+
+    def frames_to_json(self) -> Iterator[JsonSchemaValue]:
+        """Yield the JSON of each frame in turn, i.e. the JSON of self[i] for
+        each i, serializing the clip only once rather than once per frame.
+        Frames run to the end of the longest regular parameter; parameters
+        with fewer samples are left out of the frames beyond their last.
+        """
+        clip_json = CompatibleBaseModel.to_json(self)
+        lengths = [len(v) for key, value in clip_json.items() if key != "static"
+                   for v in (value.values() if isinstance(value, dict) else (value,))]
+        for i in range(max(lengths, default=0)):
+            frame_json = {}
+            for key, value in clip_json.items():
+                if key == "static":
+                    frame_json[key] = value
+                elif isinstance(value, dict):
+                    if section := {k: (v[i],) for k, v in value.items() if i < len(v)}:
+                        frame_json[key] = section
+                elif i < len(value):
+                    frame_json[key] = (value[i],)
+            yield frame_json
 
     def _print_non_none(self):
         full_schema = Clip.make_json_schema(mode='validation', exclude_camdkit_internals=False)
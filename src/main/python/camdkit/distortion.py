@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+"""Evaluation of OpenLensIO Brown-Conrady lens distortion
+
+Coordinates are OpenLensIO screen coordinates: millimeters on the sensor,
+relative to its centre, x positive to the right and y positive downwards.
+With distortion centre shift C and perspective shift P (Lens.distortion_offset
+and Lens.projection_offset) the OpenLensIO model (equations 4 to 7) is
+
+    undistorted = D(distorted - C) + C - P
+
+where D is the closed-form Brown-Conrady function
+
+    D(x, y) = (R x + 2 p1 x y + p2 (r^2 + 2 x^2),
+               R y + 2 p2 x y + p1 (r^2 + 2 y^2))
+
+    R = 1 + k1 r^2 + k2 r^4 + k3 r^6 + ...
+
+A "Brown-Conrady D-U" distortion (the default) is D in that direction; a
+"Brown-Conrady U-D" distortion is D in the opposite one,
+
+    distorted = D(undistorted + P - C) + C
+
+Whichever direction has no closed form is solved per point by Newton's
+method. Points are processed in batches of parallel x and y sequences, and
+results are returned as array('d') columns.
+"""
+
+import math
+import dataclasses
+from array import array
+from typing import Iterable, Optional, Self
+
+from camdkit.clip import Clip
+from camdkit.camera_types import PhysicalDimensions
+from camdkit.lens_types import Distortion
+
+__all__ = ['BROWN_CONRADY_D_U', 'BROWN_CONRADY_U_D', 'LensDistortion',
+           'sensor_from_normalized', 'normalized_from_sensor']
+
+BROWN_CONRADY_D_U = "Brown-Conrady D-U"
+BROWN_CONRADY_U_D = "Brown-Conrady U-D"
+
+_MODELS = (BROWN_CONRADY_D_U, BROWN_CONRADY_U_D)
+
+
+def _brown_conrady(radial: tuple[float, ...], tangential: tuple[float, ...],
+                   xs: Iterable[float], ys: Iterable[float]) -> tuple[array, array]:
+    p1, p2 = (tuple(tangential) + (0.0, 0.0))[:2]
+    out_xs, out_ys = array('d'), array('d')
+    append_x, append_y = out_xs.append, out_ys.append
+    for x, y in zip(xs, ys):
+        s = x * x + y * y
+        r = 0.0
+        for k in reversed(radial):
+            r = (r + k) * s
+        r += 1.0
+        append_x(r * x + 2.0 * p1 * x * y + p2 * (s + 2.0 * x * x))
+        append_y(r * y + 2.0 * p2 * x * y + p1 * (s + 2.0 * y * y))
+    return out_xs, out_ys
+
+
+def _inverse_brown_conrady(radial: tuple[float, ...], tangential: tuple[float, ...],
+                           xs: Iterable[float], ys: Iterable[float],
+                           iterations: int, tolerance: float) -> tuple[array, array]:
+    """Solve D(x, y) = (u, v) for each (u, v) by Newton's method, starting
+    from (u, v) itself. Points that do not converge are NaN."""
+    p1, p2 = (tuple(tangential) + (0.0, 0.0))[:2]
+    out_xs, out_ys = array('d'), array('d')
+    append_x, append_y = out_xs.append, out_ys.append
+    tolerance2 = tolerance * tolerance
+    for u, v in zip(xs, ys):
+        x, y = u, v
+        for _ in range(iterations):
+            s = x * x + y * y
+            # R and its derivative with respect to s
+            r = dr = 0.0
+            for k in reversed(radial):
+                dr = dr * s + r + k
+                r = (r + k) * s
+            r += 1.0
+            fx = r * x + 2.0 * p1 * x * y + p2 * (s + 2.0 * x * x) - u
+            fy = r * y + 2.0 * p2 * x * y + p1 * (s + 2.0 * y * y) - v
+            a = r + 2.0 * x * x * dr + 2.0 * p1 * y + 6.0 * p2 * x
+            b = 2.0 * x * y * dr + 2.0 * p1 * x + 2.0 * p2 * y
+            c = 2.0 * x * y * dr + 2.0 * p2 * y + 2.0 * p1 * x
+            e = r + 2.0 * y * y * dr + 2.0 * p2 * x + 6.0 * p1 * y
+            det = a * e - b * c
+            if det == 0.0:
+                x = y = math.nan
+                break
+            step_x = (e * fx - b * fy) / det
+            step_y = (a * fy - c * fx) / det
+            x -= step_x
+            y -= step_y
+            if step_x * step_x + step_y * step_y <= tolerance2:
+                break
+        else:
+            x = y = math.nan
+        append_x(x)
+        append_y(y)
+    return out_xs, out_ys
+
+
+@dataclasses.dataclass(frozen=True)
+class LensDistortion:
+    """The distortion of a lens at one sample, ready for evaluation. Instances
+    are hashable, so may key caches of derived data."""
+    radial: tuple[float, ...] = ()
+    tangential: tuple[float, ...] = ()
+    model: str = BROWN_CONRADY_D_U
+    distortion_offset: tuple[float, float] = (0.0, 0.0)
+    """Centre shift C of the distortion, in millimeters"""
+    projection_offset: tuple[float, float] = (0.0, 0.0)
+    """Perspective shift P, in millimeters"""
+    iterations: int = 20
+    """Maximum number of Newton iterations for the direction with no closed form"""
+    tolerance: float = 1e-9
+    """Newton iterations stop once a step is shorter than this, in millimeters"""
+
+    def __post_init__(self):
+        if self.model not in _MODELS:
+            raise ValueError(f"unsupported distortion model '{self.model}'")
+
+    @classmethod
+    def from_distortion(cls, distortion: Distortion,
+                        distortion_offset: tuple[float, float] = (0.0, 0.0),
+                        projection_offset: tuple[float, float] = (0.0, 0.0)) -> Self:
+        return cls(radial=tuple(distortion.radial),
+                   tangential=tuple(distortion.tangential or ()),
+                   model=distortion.model or BROWN_CONRADY_D_U,
+                   distortion_offset=distortion_offset,
+                   projection_offset=projection_offset)
+
+    @classmethod
+    def from_clip(cls, clip: Clip, i: int = 0, model: Optional[str] = None) -> Self:
+        """The distortion of the ith sample of a clip. Where the sample carries
+        distortions for both models, the one for `model` is chosen, else the
+        first; a sample without distortion has none (the identity)."""
+        distortion_offset = projection_offset = (0.0, 0.0)
+        if clip.lens_distortion_offset:
+            offset = clip.lens_distortion_offset[i]
+            distortion_offset = (offset.x, offset.y)
+        if clip.lens_projection_offset:
+            offset = clip.lens_projection_offset[i]
+            projection_offset = (offset.x, offset.y)
+        if not clip.lens_distortions:
+            return cls(distortion_offset=distortion_offset, projection_offset=projection_offset)
+        candidates = clip.lens_distortions[i]
+        chosen = next((d for d in candidates if (d.model or BROWN_CONRADY_D_U) == model), candidates[0])
+        return cls.from_distortion(chosen, distortion_offset, projection_offset)
+
+    def _forward(self, xs: Iterable[float], ys: Iterable[float]) -> tuple[array, array]:
+        return _brown_conrady(self.radial, self.tangential, xs, ys)
+
+    def _inverse(self, xs: Iterable[float], ys: Iterable[float]) -> tuple[array, array]:
+        return _inverse_brown_conrady(self.radial, self.tangential, xs, ys, self.iterations, self.tolerance)
+
+    def undistort(self, xs: Iterable[float], ys: Iterable[float]) -> tuple[array, array]:
+        """Undistorted screen coordinates of distorted ones"""
+        cx, cy = self.distortion_offset
+        px, py = self.projection_offset
+        shifted_xs, shifted_ys = (x - cx for x in xs), (y - cy for y in ys)
+        if self.model == BROWN_CONRADY_D_U:
+            out_xs, out_ys = self._forward(shifted_xs, shifted_ys)
+        else:
+            out_xs, out_ys = self._inverse(shifted_xs, shifted_ys)
+        return _shifted(out_xs, cx - px), _shifted(out_ys, cy - py)
+
+    def distort(self, xs: Iterable[float], ys: Iterable[float]) -> tuple[array, array]:
+        """Distorted screen coordinates of undistorted ones"""
+        cx, cy = self.distortion_offset
+        px, py = self.projection_offset
+        shifted_xs, shifted_ys = (x + px - cx for x in xs), (y + py - cy for y in ys)
+        if self.model == BROWN_CONRADY_D_U:
+            out_xs, out_ys = self._inverse(shifted_xs, shifted_ys)
+        else:
+            out_xs, out_ys = self._forward(shifted_xs, shifted_ys)
+        return _shifted(out_xs, cx), _shifted(out_ys, cy)
+
+
+def _shifted(values: array, offset: float) -> array:
+    return values if offset == 0.0 else array('d', [v + offset for v in values])
+
+
+def sensor_from_normalized(us: Iterable[float], vs: Iterable[float],
+                           dimensions: PhysicalDimensions) -> tuple[array, array]:
+    """Screen coordinates in millimeters of normalized image coordinates, which
+    run from 0 to 1 from the left and top edges of the active sensor area
+    (OpenLensIO equation 10)"""
+    width, height = dimensions.width, dimensions.height
+    return (array('d', [(u - 0.5) * width for u in us]),
+            array('d', [(v - 0.5) * height for v in vs]))
+
+
+def normalized_from_sensor(xs: Iterable[float], ys: Iterable[float],
+                           dimensions: PhysicalDimensions) -> tuple[array, array]:
+    """Normalized image coordinates of screen coordinates in millimeters"""
+    width, height = dimensions.width, dimensions.height
+    return (array('d', [x / width + 0.5 for x in xs]),
+            array('d', [y / height + 0.5 for y in ys]))
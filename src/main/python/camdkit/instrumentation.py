@@ -0,0 +1,276 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+"""Optional timers and counters around camdkit's hot paths
+
+Instrumentation is off by default and then costs nothing: enable() replaces
+each registered hot path (the Mo-Sys F4 packet parser, the vendor readers and
+their per-frame conversions, Clip.append, Clip.to_json...) with a wrapper that
+counts and times its calls, and wraps Clip.__setattr__ to time assignments to
+the clip properties; disable() puts the originals back. Metrics are read with snapshot(), or written periodically to a JSON
+file by an Exporter:
+
+    from camdkit import instrumentation
+    instrumentation.enable()
+    with instrumentation.Exporter("metrics.json", interval=5.0):
+        clip = read_clip("mosys", ["take.f4"])
+    print(instrumentation.snapshot()["f4.get_tracking_frame"].mean_ns)
+"""
+
+import os
+import json
+import time
+import inspect
+import functools
+import importlib
+import threading
+import dataclasses
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+__all__ = ['Metric', 'HOT_PATHS', 'add_hot_path', 'enable', 'disable', 'is_enabled',
+           'snapshot', 'reset', 'export', 'Exporter']
+
+# (module, qualified name within the module, metric name)
+HOT_PATHS: list[tuple[str, str, str]] = [
+    ("camdkit.mosys.f4", "F4PacketParser.initialise", "f4.initialise"),
+    ("camdkit.mosys.f4", "F4PacketParser.get_tracking_frame", "f4.get_tracking_frame"),
+    ("camdkit.mosys.reader", "to_frame", "reader.mosys.to_frame"),
+    ("camdkit.mosys.reader", "to_clip", "reader.mosys.to_clip"),
+    ("camdkit.arri.reader", "to_clip", "reader.arri.to_clip"),
+    ("camdkit.arri.reader", "t_number_from_linear_iris_value", "reader.arri.t_number"),
+    ("camdkit.bmd.reader", "to_clip", "reader.bmd.to_clip"),
+    ("camdkit.canon.reader", "to_clip", "reader.canon.to_clip"),
+    ("camdkit.canon.reader", "_read_float32_column_as_hex", "reader.canon.float32_column"),
+    ("camdkit.red.reader", "to_clip", "reader.red.to_clip"),
+    ("camdkit.venice.reader", "to_clip", "reader.venice.to_clip"),
+    ("camdkit.venice.reader", "t_number_from_frac_stop", "reader.venice.t_number"),
+    ("camdkit.clip", "Clip.append", "clip.append"),
+    ("camdkit.clip", "Clip.__getitem__", "clip.getitem"),
+    ("camdkit.clip", "Clip.to_json", "clip.to_json"),
+    ("camdkit.clip", "Clip.from_json", "clip.from_json"),
+    ("camdkit.clip", "Clip.make_json_schema", "clip.make_json_schema"),
+]
+
+# assignment to every clip property is timed as clip.set.<property name>
+_CLIP_SETTER_PREFIX = "clip.set."
+
+
+@dataclasses.dataclass
+class Metric:
+    count: int = 0
+    total_ns: int = 0
+    min_ns: Optional[int] = None
+    max_ns: Optional[int] = None
+
+    @property
+    def mean_ns(self) -> float:
+        return self.total_ns / self.count if self.count else 0.0
+
+    def add(self, elapsed_ns: int) -> None:
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if self.min_ns is None or elapsed_ns < self.min_ns:
+            self.min_ns = elapsed_ns
+        if self.max_ns is None or elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+
+
+_enabled = False
+_metrics: dict[str, Metric] = {}
+_lock = threading.Lock()
+# (owner, attribute name, original value or _ABSENT) of each installed wrapper
+_installed: list[tuple[Any, str, Any]] = []
+_ABSENT = object()
+
+
+def _record(name: str, elapsed_ns: int) -> None:
+    with _lock:
+        metric = _metrics.get(name)
+        if metric is None:
+            metric = _metrics[name] = Metric()
+        metric.add(elapsed_ns)
+
+
+def _timed(name: str, function: Callable) -> Callable:
+    clock = time.perf_counter_ns
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = clock()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _record(name, clock() - start)
+    return wrapper
+
+
+def _wrapped(name: str, attribute: Any) -> Any:
+    """A timed replacement for a raw class or module attribute"""
+    if isinstance(attribute, classmethod):
+        return classmethod(_timed(name, attribute.__func__))
+    if isinstance(attribute, staticmethod):
+        return staticmethod(_timed(name, attribute.__func__))
+    if isinstance(attribute, property):
+        if attribute.fset is None:
+            raise ValueError(f"cannot instrument read-only property {name}")
+        return property(attribute.fget, _timed(name, attribute.fset), attribute.fdel, attribute.__doc__)
+    if callable(attribute):
+        return _timed(name, attribute)
+    raise ValueError(f"cannot instrument {name}: {attribute!r} is not callable")
+
+
+def _timed_setattr(names: frozenset[str], function: Callable) -> Callable:
+    """A __setattr__ timing assignments to the attributes in `names`"""
+    clock = time.perf_counter_ns
+
+    @functools.wraps(function)
+    def wrapper(self, name: str, value: Any) -> None:
+        if name not in names:
+            return function(self, name, value)
+        start = clock()
+        try:
+            function(self, name, value)
+        finally:
+            _record(_CLIP_SETTER_PREFIX + name, clock() - start)
+    return wrapper
+
+
+def _replace(owner: Any, attribute_name: str, replacement: Any) -> None:
+    # inherited attributes are shadowed on the owner, then removed again
+    original = vars(owner).get(attribute_name, _ABSENT)
+    setattr(owner, attribute_name, replacement)
+    _installed.append((owner, attribute_name, original))
+
+
+def _install(owner: Any, attribute_name: str, metric_name: str) -> None:
+    _replace(owner, attribute_name, _wrapped(metric_name, inspect.getattr_static(owner, attribute_name)))
+
+
+def _resolve(module_name: str, qualname: str) -> tuple[Any, str]:
+    owner: Any = importlib.import_module(module_name)
+    *path, attribute_name = qualname.split(".")
+    for part in path:
+        owner = getattr(owner, part)
+    return owner, attribute_name
+
+
+def add_hot_path(module_name: str, qualname: str, metric_name: str) -> None:
+    """Register a function, method or property setter to be timed while
+    instrumentation is enabled; if it is already enabled, it is timed at once"""
+    HOT_PATHS.append((module_name, qualname, metric_name))
+    if _enabled:
+        with _lock:
+            _install(*_resolve(module_name, qualname), metric_name)
+
+
+def enable() -> None:
+    """Start timing the registered hot paths and clip property assignments"""
+    global _enabled
+    if _enabled:
+        return
+    from camdkit.clip import Clip
+    with _lock:
+        try:
+            for module_name, qualname, metric_name in HOT_PATHS:
+                _install(*_resolve(module_name, qualname), metric_name)
+            names = frozenset(Clip._regular_clip_properties + Clip._static_clip_properties)
+            _replace(Clip, "__setattr__", _timed_setattr(names, Clip.__setattr__))
+        except Exception:
+            _uninstall()
+            raise
+        _enabled = True
+
+
+def _uninstall() -> None:
+    while _installed:
+        owner, attribute_name, original = _installed.pop()
+        if original is _ABSENT:
+            delattr(owner, attribute_name)
+        else:
+            setattr(owner, attribute_name, original)
+
+
+def disable() -> None:
+    """Restore the original hot paths; metrics recorded so far are kept"""
+    global _enabled
+    with _lock:
+        _uninstall()
+        _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def snapshot() -> dict[str, Metric]:
+    """A copy of the metrics recorded so far, by name"""
+    with _lock:
+        return {name: dataclasses.replace(metric) for name, metric in _metrics.items()}
+
+
+def reset() -> None:
+    """Forget the metrics recorded so far"""
+    with _lock:
+        _metrics.clear()
+
+
+def _snapshot_json() -> dict[str, Any]:
+    return {"time": time.time(),
+            "pid": os.getpid(),
+            "enabled": _enabled,
+            "metrics": {name: dataclasses.asdict(metric) | {"mean_ns": metric.mean_ns}
+                        for name, metric in sorted(snapshot().items())}}
+
+
+def export(path: str | os.PathLike) -> Path:
+    """Write a snapshot of the metrics to a JSON file, replacing it atomically
+    so that a reader polling the file never sees a partial snapshot"""
+    path = Path(path)
+    partial = path.with_name(path.name + ".tmp")
+    with open(partial, "w", encoding="utf-8") as fp:
+        json.dump(_snapshot_json(), fp, indent=2)
+    os.replace(partial, path)
+    return path
+
+
+class Exporter:
+    """Background thread exporting a snapshot of the metrics to a JSON file
+    every `interval` seconds, and once more when stopped"""
+
+    def __init__(self, path: str | os.PathLike, interval: float = 10.0):
+        if interval <= 0.0:
+            raise ValueError("export interval must be positive")
+        self.path = Path(path)
+        self.interval = interval
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            raise RuntimeError("exporter already started")
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="camdkit-metrics-exporter", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._thread.join()
+        self._thread = None
+        export(self.path)
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self.interval):
+            export(self.path)
+
+    def __enter__(self) -> "Exporter":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
@@ -6,7 +6,11 @@
 
 """Types for lens modeling"""
 
-from typing import Annotated, Self, Optional
+import json
+import dataclasses
+from array import array
+from bisect import bisect_right
+from typing import Annotated, Any, Iterable, Mapping, Self, Optional, Sequence
 
 from pydantic import Field, model_validator
 
@@ -306,3 +310,275 @@ class Lens(CompatibleBaseModel):
     """Linear t-number of the lens, equal to the F-number of the lens
     divided by the square root of the transmittance of the lens.
     """
+
+
+_ENCODER_AXES = ('focus', 'iris', 'zoom')
+
+
+@dataclasses.dataclass
+class EncoderRange:
+    """The span of raw values of one encoder axis between its end stops"""
+    minimum: int
+    maximum: int
+    inverted: bool = False
+    """The raw value decreases as the normalized value increases"""
+
+    def include(self, values: Iterable[int]) -> None:
+        """Widen the range to include the given raw values"""
+        values = list(values)
+        if values:
+            self.minimum = min(self.minimum, min(values))
+            self.maximum = max(self.maximum, max(values))
+
+    def normalize(self, values: Iterable[Optional[int]]) -> list[Optional[float]]:
+        """Normalized values, clamped to 0..1, of raw values; a range with no
+        extent normalizes everything to 0, and None stays None"""
+        minimum, span = self.minimum, self.maximum - self.minimum
+        if span <= 0:
+            return [None if v is None else 0.0 for v in values]
+        scale = 1.0 / span
+        if self.inverted:
+            return [None if v is None else min(max((self.maximum - v) * scale, 0.0), 1.0) for v in values]
+        return [None if v is None else min(max((v - minimum) * scale, 0.0), 1.0) for v in values]
+
+
+class EncoderRanging:
+    """Conversion of raw FIZ encoder values to normalized ones, from known
+    per-axis ranges or, when learning, ranges widened to take in every raw
+    value seen so far, as for a live system ranging on the fly"""
+
+    def __init__(self,
+                 focus: Optional[EncoderRange] = None,
+                 iris: Optional[EncoderRange] = None,
+                 zoom: Optional[EncoderRange] = None,
+                 learn: bool = False,
+                 inverted: Sequence[str] = ()):
+        """`inverted` names the axes whose learned ranges are inverted"""
+        self.ranges: dict[str, Optional[EncoderRange]] = {'focus': focus, 'iris': iris, 'zoom': zoom}
+        self.learn = learn
+        self.inverted = frozenset(inverted)
+
+    def update(self, raw_encoders: Sequence[RawFizEncoders]) -> None:
+        """Widen the ranges to include a chunk of raw encoder values"""
+        for axis in _ENCODER_AXES:
+            values = [v for v in (getattr(e, axis) for e in raw_encoders) if v is not None]
+            if not values:
+                continue
+            if (encoder_range := self.ranges[axis]) is None:
+                self.ranges[axis] = EncoderRange(min(values), max(values), axis in self.inverted)
+            else:
+                encoder_range.include(values)
+
+    def normalize(self, raw_encoders: Sequence[RawFizEncoders]) -> tuple[FizEncoders, ...]:
+        """Normalized encoder values of a chunk of raw ones, first widening the
+        ranges to include them if learning. Axes without a range are omitted."""
+        if self.learn:
+            self.update(raw_encoders)
+        columns = {axis: encoder_range.normalize([getattr(e, axis) for e in raw_encoders])
+                   for axis, encoder_range in self.ranges.items() if encoder_range is not None}
+        if raw_encoders and not columns:
+            raise ValueError("raw encoder values have no axis with a known range")
+        empty = [None] * len(raw_encoders)
+        # raw values are quantized and so repeat, and repeats share an instance
+        normalized: dict[tuple, FizEncoders] = {}
+        result = []
+        for i, values in enumerate(zip(*(columns.get(axis, empty) for axis in _ENCODER_AXES))):
+            if (encoders := normalized.get(values)) is None:
+                if all(v is None for v in values):
+                    raise ValueError(f"raw encoder sample {i} has no value on an axis with a known range")
+                encoders = normalized[values] = FizEncoders(*values)
+            result.append(encoders)
+        return tuple(result)
+
+    def apply(self, clip) -> None:
+        """Set the normalized lens encoders of a Clip from its raw ones"""
+        if not clip.lens_raw_encoders:
+            raise ValueError("clip has no raw lens encoder values to normalize")
+        clip.lens_encoders = self.normalize(clip.lens_raw_encoders)
+
+
+# Hermite basis: cubic coefficients in t of a segment, from its end values and
+# end derivatives (with respect to t)
+_HERMITE = ((1.0, 0.0, 0.0, 0.0),
+            (0.0, 0.0, 1.0, 0.0),
+            (-3.0, 3.0, -2.0, -1.0),
+            (2.0, -2.0, 1.0, 1.0))
+
+
+def _axis(nodes: Sequence[float], name: str) -> tuple[float, ...]:
+    nodes = tuple(float(n) for n in nodes)
+    if not nodes:
+        raise ValueError(f"lens calibration {name} axis must not be empty")
+    if any(a >= b for a, b in zip(nodes, nodes[1:])):
+        raise ValueError(f"lens calibration {name} axis must be strictly increasing")
+    return nodes
+
+
+def _end_slope(x0: float, x1: float, x2: float, y0: float, y1: float, y2: float) -> float:
+    """Derivative at x0 of the parabola through three points"""
+    h0, h1 = x1 - x0, x2 - x1
+    return (-(2.0 * h0 + h1) / (h0 * (h0 + h1)) * y0 + (h0 + h1) / (h0 * h1) * y1
+            - h0 / (h1 * (h0 + h1)) * y2)
+
+
+def _slopes(xs: Sequence[float], ys: Sequence[float]) -> list[float]:
+    """Derivatives at the nodes from three-point differences, which are exact
+    for quadratics, or from two points if there are only two"""
+    n = len(xs)
+    if n == 2:
+        slope = (ys[1] - ys[0]) / (xs[1] - xs[0])
+        return [slope, slope]
+    slopes = [_end_slope(xs[0], xs[1], xs[2], ys[0], ys[1], ys[2])]
+    for i in range(1, n - 1):
+        h0, h1 = xs[i] - xs[i - 1], xs[i + 1] - xs[i]
+        slopes.append((h0 * (ys[i + 1] - ys[i]) / h1 + h1 * (ys[i] - ys[i - 1]) / h0) / (h0 + h1))
+    slopes.append(-_end_slope(-xs[n - 1], -xs[n - 2], -xs[n - 3], ys[n - 1], ys[n - 2], ys[n - 3]))
+    return slopes
+
+
+class _CalibrationSurface:
+    """Bicubic Hermite interpolation of one lens parameter over the zoom x
+    focus grid, with the 16 polynomial coefficients of each cell precomputed"""
+
+    __slots__ = ('zoom', 'focus', 'cells')
+
+    def __init__(self, zoom: tuple[float, ...], focus: tuple[float, ...], grid: Sequence[Sequence[float]]):
+        rows = [[float(v) for v in row] for row in grid]
+        if len(rows) != len(zoom) or any(len(row) != len(focus) for row in rows):
+            raise ValueError("lens calibration grid must have one row per zoom and one column per focus")
+        # a single node (e.g. the zoom of a prime) is treated as a constant span
+        if len(zoom) == 1:
+            zoom, rows = (zoom[0], zoom[0] + 1.0), rows * 2
+        if len(focus) == 1:
+            focus, rows = (focus[0], focus[0] + 1.0), [row * 2 for row in rows]
+        self.zoom, self.focus = zoom, focus
+        columns = list(zip(*rows))
+        d_zoom = list(zip(*(_slopes(zoom, column) for column in columns)))
+        d_focus = [_slopes(focus, row) for row in rows]
+        d_both = [_slopes(focus, row) for row in d_zoom]
+        self.cells: list[tuple[float, ...]] = []
+        for i in range(len(zoom) - 1):
+            hz = zoom[i + 1] - zoom[i]
+            for j in range(len(focus) - 1):
+                hf = focus[j + 1] - focus[j]
+                f = ((rows[i][j], rows[i][j + 1], d_focus[i][j] * hf, d_focus[i][j + 1] * hf),
+                     (rows[i + 1][j], rows[i + 1][j + 1], d_focus[i + 1][j] * hf, d_focus[i + 1][j + 1] * hf),
+                     (d_zoom[i][j] * hz, d_zoom[i][j + 1] * hz,
+                      d_both[i][j] * hz * hf, d_both[i][j + 1] * hz * hf),
+                     (d_zoom[i + 1][j] * hz, d_zoom[i + 1][j + 1] * hz,
+                      d_both[i + 1][j] * hz * hf, d_both[i + 1][j + 1] * hz * hf))
+                # a[p][q] multiplies t^p u^q: a = H f H^T
+                hf_rows = [[sum(_HERMITE[p][k] * f[k][m] for k in range(4)) for m in range(4)] for p in range(4)]
+                self.cells.append(tuple(sum(hf_rows[p][m] * _HERMITE[q][m] for m in range(4))
+                                        for p in range(4) for q in range(4)))
+
+    def __call__(self, zooms: Iterable[float], focuses: Iterable[float]) -> array:
+        zoom, focus, cells = self.zoom, self.focus, self.cells
+        last_zoom, last_focus = len(zoom) - 2, len(focus) - 2
+        cells_per_row = last_focus + 1
+        result = array('d')
+        append = result.append
+        for z, f in zip(zooms, focuses):
+            # outside the grid, values are those at its edge
+            i = min(max(bisect_right(zoom, z) - 1, 0), last_zoom)
+            j = min(max(bisect_right(focus, f) - 1, 0), last_focus)
+            t = min(max((z - zoom[i]) / (zoom[i + 1] - zoom[i]), 0.0), 1.0)
+            u = min(max((f - focus[j]) / (focus[j + 1] - focus[j]), 0.0), 1.0)
+            a = cells[i * cells_per_row + j]
+            append((((a[15] * u + a[14]) * u + a[13]) * u + a[12]) * t * t * t
+                   + (((a[11] * u + a[10]) * u + a[9]) * u + a[8]) * t * t
+                   + (((a[7] * u + a[6]) * u + a[5]) * u + a[4]) * t
+                   + ((a[3] * u + a[2]) * u + a[1]) * u + a[0])
+        return result
+
+
+class LensCalibrationTable:
+    """Calibrated lens parameters on a grid of normalized zoom and focus
+    encoder values, interpolated between grid points with bicubic Hermite
+    splines. Each parameter grid has one row per zoom value and one column
+    per focus value; a lens without zoom (or focus) has a single one. Encoder
+    values outside the grid take the values at its edge."""
+
+    def __init__(self,
+                 zoom: Sequence[float],
+                 focus: Sequence[float],
+                 focal_length: Optional[Sequence[Sequence[float]]] = None,
+                 focus_distance: Optional[Sequence[Sequence[float]]] = None,
+                 entrance_pupil_offset: Optional[Sequence[Sequence[float]]] = None,
+                 radial: Sequence[Sequence[Sequence[float]]] = (),
+                 tangential: Sequence[Sequence[Sequence[float]]] = (),
+                 model: Optional[str] = None):
+        """`radial` and `tangential` hold one grid per distortion coefficient"""
+        self.zoom = _axis(zoom, "zoom")
+        self.focus = _axis(focus, "focus")
+        self.model = model
+
+        def surface(grid):
+            return None if grid is None else _CalibrationSurface(self.zoom, self.focus, grid)
+
+        self._focal_length = surface(focal_length)
+        self._focus_distance = surface(focus_distance)
+        self._entrance_pupil_offset = surface(entrance_pupil_offset)
+        self._radial = tuple(surface(grid) for grid in radial)
+        self._tangential = tuple(surface(grid) for grid in tangential)
+
+    @classmethod
+    def from_json(cls, table_json: Mapping[str, Any]) -> Self:
+        return cls(zoom=table_json["zoom"],
+                   focus=table_json["focus"],
+                   focal_length=table_json.get("focalLength"),
+                   focus_distance=table_json.get("focusDistance"),
+                   entrance_pupil_offset=table_json.get("entrancePupilOffset"),
+                   radial=table_json.get("radial", ()),
+                   tangential=table_json.get("tangential", ()),
+                   model=table_json.get("model"))
+
+    @classmethod
+    def load(cls, path: str) -> Self:
+        """Load a table from a JSON file with keys "zoom" and "focus" (the axes)
+        and any of "focalLength", "focusDistance", "entrancePupilOffset" (grids),
+        "radial", "tangential" (lists of grids) and "model\""""
+        with open(path, "r", encoding="utf-8") as fp:
+            return cls.from_json(json.load(fp))
+
+    @staticmethod
+    def _evaluate(surface: Optional[_CalibrationSurface], zooms: Sequence[float],
+                  focuses: Sequence[float]) -> Optional[array]:
+        return None if surface is None else surface(zooms, focuses)
+
+    def focal_length(self, zooms: Sequence[float], focuses: Sequence[float]) -> Optional[array]:
+        return self._evaluate(self._focal_length, zooms, focuses)
+
+    def focus_distance(self, zooms: Sequence[float], focuses: Sequence[float]) -> Optional[array]:
+        return self._evaluate(self._focus_distance, zooms, focuses)
+
+    def entrance_pupil_offset(self, zooms: Sequence[float], focuses: Sequence[float]) -> Optional[array]:
+        return self._evaluate(self._entrance_pupil_offset, zooms, focuses)
+
+    def distortion(self, zooms: Sequence[float], focuses: Sequence[float]) -> Optional[tuple[Distortion, ...]]:
+        """One Distortion per pair of encoder values, or None if the table has
+        no radial coefficients"""
+        if not self._radial:
+            return None
+        radial = list(zip(*(surface(zooms, focuses) for surface in self._radial)))
+        tangential = (list(zip(*(surface(zooms, focuses) for surface in self._tangential)))
+                      if self._tangential else [None] * len(radial))
+        return tuple(Distortion(r, t, self.model) for r, t in zip(radial, tangential))
+
+    def apply(self, clip) -> None:
+        """Set the focal length, focus distance, entrance pupil offset and
+        distortion of a Clip from its normalized lens encoders, for whichever
+        of those the table holds. A missing zoom or focus encoder value is
+        taken to be at the start of its axis."""
+        if not clip.lens_encoders:
+            raise ValueError("clip has no lens encoder values to which to apply calibration")
+        zooms = [self.zoom[0] if e.zoom is None else e.zoom for e in clip.lens_encoders]
+        focuses = [self.focus[0] if e.focus is None else e.focus for e in clip.lens_encoders]
+        if (values := self.focal_length(zooms, focuses)) is not None:
+            clip.lens_focal_length = tuple(values)
+        if (values := self.focus_distance(zooms, focuses)) is not None:
+            clip.lens_focus_distance = tuple(values)
+        if (values := self.entrance_pupil_offset(zooms, focuses)) is not None:
+            clip.lens_entrance_pupil_offset = tuple(values)
+        if (distortions := self.distortion(zooms, focuses)) is not None:
+            clip.lens_distortions = tuple((d,) for d in distortions)
@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+"""Memory footprint of the parameters of a Clip
+
+memory_report() (or Clip.memory_report()) measures, for each regular and
+static parameter of a clip, the deep size of its value, i.e. the size of
+every object reachable from it, counted once however often it is referenced,
+and the number of those objects. For each regular parameter it also
+estimates the size under two alternative encodings:
+
+- shared: each run of equal consecutive values held once, as after
+  Clip.compact() or loading run-length encoded JSON (see camdkit.rle)
+- packed: one array('d') column per numeric leaf of the values (a
+  Fraction being two), for parameters whose values are all numeric and have
+  the same shape in every frame
+
+Sizes are those reported by sys.getsizeof(), so are estimates: objects the
+interpreter shares between parameters (small integers, interned strings) are
+counted for each parameter that references them.
+"""
+
+import sys
+import dataclasses
+from array import array
+from fractions import Fraction
+from types import FunctionType, ModuleType
+from typing import Any, Optional
+
+from camdkit.rle import encode_runs
+
+__all__ = ['deep_size', 'ParameterMemory', 'MemoryReport', 'memory_report']
+
+_NOT_COUNTED = (type, ModuleType, FunctionType)
+_ARRAY_BYTES = sys.getsizeof(array('d'))
+_DOUBLE_BYTES = array('d').itemsize
+
+
+def _slot_names(cls: type) -> list[str]:
+    names = []
+    for klass in cls.__mro__:
+        slots = vars(klass).get("__slots__", ())
+        names.extend((slots,) if isinstance(slots, str) else slots)
+    return [name for name in names if name not in ("__dict__", "__weakref__")]
+
+
+def deep_size(obj: Any, seen: Optional[set[int]] = None) -> tuple[int, int]:
+    """The number of bytes and of objects reachable from `obj`, skipping the
+    objects whose ids are in `seen` (to which those visited are added). None,
+    booleans, classes, modules and functions are not counted."""
+    seen = set() if seen is None else seen
+    size = objects = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if o is None or o is True or o is False or isinstance(o, _NOT_COUNTED) or id(o) in seen:
+            continue
+        seen.add(id(o))
+        size += sys.getsizeof(o)
+        objects += 1
+        if isinstance(o, (str, bytes, int, float, array)):
+            continue
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (tuple, list, set, frozenset)):
+            stack.extend(o)
+        if hasattr(o, "__dict__") and not isinstance(o, dict):
+            stack.append(vars(o))
+        for name in _slot_names(type(o)):
+            stack.append(getattr(o, name, None))
+    return size, objects
+
+
+def _numeric_leaves(value: Any) -> Optional[int]:
+    """The number of numbers making up a value, or None if it holds anything
+    but numbers (None, where a model field is unset, counting as one, to be
+    stored as NaN)"""
+    if value is None or isinstance(value, (bool, int, float)):
+        return 1
+    if isinstance(value, Fraction):
+        return 2
+    if isinstance(value, (tuple, list)):
+        leaves = 0
+        for item in value:
+            if (n := _numeric_leaves(item)) is None:
+                return None
+            leaves += n
+        return leaves
+    if isinstance(value, (str, bytes, dict)) or not hasattr(value, "__dict__"):
+        return None
+    return _numeric_leaves(tuple(vars(value).values()))
+
+
+@dataclasses.dataclass(frozen=True)
+class ParameterMemory:
+    name: str
+    static: bool
+    deep_bytes: int
+    objects: int
+    frames: int = 1
+    runs: Optional[int] = None
+    """Number of runs of equal consecutive values, for regular parameters"""
+    shared_bytes: Optional[int] = None
+    """Estimated deep size with each run of equal values held once"""
+    packed_bytes: Optional[int] = None
+    """Estimated size as array('d') columns, where the values are numeric"""
+
+    @property
+    def per_frame_bytes(self) -> float:
+        return self.deep_bytes / self.frames if self.frames else 0.0
+
+    @property
+    def best_bytes(self) -> int:
+        """The smallest of the current and estimated sizes"""
+        return min(b for b in (self.deep_bytes, self.shared_bytes, self.packed_bytes) if b is not None)
+
+
+@dataclasses.dataclass(frozen=True)
+class MemoryReport:
+    frames: int
+    total_bytes: int
+    """Deep size of the whole clip, each object counted once"""
+    total_objects: int
+    parameters: tuple[ParameterMemory, ...]
+
+    def __getitem__(self, name: str) -> ParameterMemory:
+        for parameter in self.parameters:
+            if parameter.name == name:
+                return parameter
+        raise KeyError(name)
+
+    @property
+    def best_bytes(self) -> int:
+        """Estimated deep size of the parameters, each in its smallest encoding"""
+        return sum(p.best_bytes for p in self.parameters)
+
+    def to_json(self) -> dict[str, Any]:
+        return {"frames": self.frames,
+                "total_bytes": self.total_bytes,
+                "total_objects": self.total_objects,
+                "best_bytes": self.best_bytes,
+                "parameters": {p.name: dataclasses.asdict(p) for p in self.parameters}}
+
+    def __str__(self) -> str:
+        def kib(n: Optional[int]) -> str:
+            return "-" if n is None else f"{n / 1024:.1f}"
+        lines = [f"{self.frames} frames, {kib(self.total_bytes)} KiB in {self.total_objects} objects",
+                 f"{'parameter':40} {'kind':>7} {'KiB':>10} {'objects':>9} {'B/frame':>9}"
+                 f" {'runs':>7} {'shared KiB':>11} {'packed KiB':>11}"]
+        for p in sorted(self.parameters, key=lambda p: p.deep_bytes, reverse=True):
+            lines.append(f"{p.name:40} {'static' if p.static else 'regular':>7} {kib(p.deep_bytes):>10}"
+                         f" {p.objects:>9} {p.per_frame_bytes:>9.0f} {'-' if p.runs is None else p.runs:>7}"
+                         f" {kib(p.shared_bytes):>11} {kib(p.packed_bytes):>11}")
+        return "\n".join(lines)
+
+
+def _regular(name: str, values: tuple) -> ParameterMemory:
+    deep_bytes, objects = deep_size(values)
+    runs = encode_runs(values)
+    seen: set[int] = set()
+    shared_bytes = sys.getsizeof(values) + sum(deep_size(value, seen)[0] for _, value in runs)
+    packed_bytes = None
+    leaves = {_numeric_leaves(value) for value in values}
+    if len(leaves) == 1 and None not in leaves:
+        columns = leaves.pop()
+        packed_bytes = columns * (_ARRAY_BYTES + len(values) * _DOUBLE_BYTES)
+    return ParameterMemory(name, False, deep_bytes, objects, len(values), len(runs), shared_bytes, packed_bytes)
+
+
+def memory_report(clip: Any) -> MemoryReport:
+    """The memory footprint of each parameter of a Clip that has a value"""
+    parameters = []
+    for name in clip._regular_clip_properties:
+        if (values := getattr(clip, name)) is not None:
+            parameters.append(_regular(name, values))
+    for name in clip._static_clip_properties:
+        if (value := getattr(clip, name)) is not None:
+            parameters.append(ParameterMemory(name, True, *deep_size(value)))
+    total_bytes, total_objects = deep_size(clip)
+    return MemoryReport(clip.frame_count(), total_bytes, total_objects, tuple(parameters))
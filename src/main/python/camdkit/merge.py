@@ -0,0 +1,228 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+"""Temporal alignment and merge of Clips from several sources
+
+Typically one Clip comes from the tracker and another from the camera, each
+sampled at its own rate and from its own start time. merge_clips() places
+every source on a common timeline of integer nanoseconds and samples each
+regular parameter of the merged Clip from the first source carrying it:
+
+- floats, and models and tuples of floats (e.g. lens encoders, custom
+  parameters), are interpolated linearly
+- transforms are interpolated with slerp (see camdkit.transform_types)
+- everything else (strings, integers, enumerations...) takes the nearest sample
+
+Sources timed by their sample rate start at time 0; merged with sources
+carrying sample timestamps, they must be given an offset placing them on the
+timeline of those timestamps. Times outside the range of a source take its
+first or last sample. Source
+samples are located on the timeline by binary search, so merging is
+O(n log n) in the number of samples.
+"""
+
+import dataclasses
+from bisect import bisect_right
+from fractions import Fraction
+from typing import Any, Optional, Sequence
+
+from pydantic import BaseModel
+
+from camdkit.clip import Clip
+from camdkit.timing_types import NANOSECONDS_PER_SECOND, Timestamp
+from camdkit.transform_types import Transform, interpolate_transforms
+
+__all__ = ['MergeSource', 'sample_times', 'merge_clips']
+
+# Regular parameters captured at the time of a synchronization offset, rather
+# than at the sample time
+_LENS_ENCODER_PROPERTIES = ('lens_encoders', 'lens_raw_encoders')
+
+# Where along the timeline each target time falls in a source: the index of the
+# preceding source sample and the fraction of the way to the next one
+type Location = tuple[int, float]
+
+
+@dataclasses.dataclass(frozen=True)
+class MergeSource:
+    clip: Clip
+    offset: Optional[float] = None
+    """Seconds added to every sample time of the clip, e.g. a measured latency,
+    or None if not given (no offset)"""
+    first_index: int = 0
+    """Index within its take of the first sample of the clip (e.g. a chunk of
+    the take), for clips timed by their sample rate"""
+
+
+def sample_times(clip: Clip, offset: Optional[float] = None, first_index: int = 0) -> tuple[int, ...]:
+    """Time in nanoseconds of each sample of a clip, from its sample timestamps
+    or, lacking those, from the sample index (counted from `first_index`) and
+    its sample rate, plus an offset in seconds"""
+    offset_ns = round((offset or 0.0) * NANOSECONDS_PER_SECOND)
+    if clip.timing_sample_timestamp:
+        return tuple(t.to_nanoseconds() + offset_ns for t in clip.timing_sample_timestamp)
+    if clip.timing_sample_rate:
+        rate = Fraction(clip.timing_sample_rate[0].num, clip.timing_sample_rate[0].denom)
+        return tuple(i * NANOSECONDS_PER_SECOND * rate.denominator // rate.numerator + offset_ns
+                     for i in range(first_index, first_index + clip.frame_count()))
+    raise ValueError("clip has neither sample timestamps nor a sample rate from which to time its samples")
+
+
+def _synchronization_offsets(clip: Clip, name: str) -> Optional[tuple[int, ...]]:
+    """Per-sample synchronization offsets in nanoseconds, or None if there are none"""
+    if not clip.timing_synchronization:
+        return None
+    offsets = tuple(round(((s.offsets and getattr(s.offsets, name)) or 0.0) * NANOSECONDS_PER_SECOND)
+                    for s in clip.timing_synchronization)
+    return offsets if any(offsets) else None
+
+
+def _locate(times: Sequence[int], timeline: Sequence[int]) -> list[Location]:
+    last = len(times) - 1
+    locations = []
+    for t in timeline:
+        i = bisect_right(times, t) - 1
+        if i < 0:
+            locations.append((0, 0.0))
+        elif i >= last or times[i] == t:
+            locations.append((min(i, last), 0.0))
+        else:
+            locations.append((i, (t - times[i]) / (times[i + 1] - times[i])))
+    return locations
+
+
+def _interpolate(a: Any, b: Any, u: float) -> Any:
+    if u == 0.0 or a == b:
+        return a
+    if type(a) is float and type(b) is float:
+        return a + (b - a) * u
+    if isinstance(a, BaseModel) and type(a) is type(b):
+        update = {}
+        for name in type(a).model_fields:
+            x, y = getattr(a, name), getattr(b, name)
+            if type(x) is float and type(y) is float:
+                update[name] = x + (y - x) * u
+            elif x != y:
+                return a if u < 0.5 else b
+        return a.model_copy(update=update)
+    if (isinstance(a, tuple) and isinstance(b, tuple) and len(a) == len(b)
+            and all(type(x) is float and type(y) is float for x, y in zip(a, b))):
+        return tuple(x + (y - x) * u for x, y in zip(a, b))
+    return a if u < 0.5 else b
+
+
+def _sample(values: Sequence[Any], locations: Sequence[Location]) -> tuple[Any, ...]:
+    return tuple(values[i] if u == 0.0 else _interpolate(values[i], values[i + 1], u)
+                 for i, u in locations)
+
+
+def _sample_transforms(values: Sequence[Sequence[Transform]],
+                       locations: Sequence[Location]) -> tuple[tuple[Transform, ...], ...]:
+    return tuple(tuple(values[i]) if u == 0.0 else interpolate_transforms(values[i], values[i + 1], u)
+                 for i, u in locations)
+
+
+class _AlignedSource:
+    """A source clip, sorted by sample time, with its samples located on the timeline"""
+
+    def __init__(self, source: MergeSource, timeline: Sequence[int]):
+        clip = source.clip
+        times = sample_times(clip, source.offset, source.first_index)
+        self.order = None
+        if any(a > b for a, b in zip(times, times[1:])):
+            self.order = sorted(range(len(times)), key=times.__getitem__)
+            times = tuple(times[i] for i in self.order)
+        self.clip = clip
+        self.times = times
+        self.timeline = timeline
+        self.locations = _locate(times, timeline)
+        self._offset_locations: dict[str, Optional[list[Location]]] = {}
+
+    def values(self, clip_property_name: str) -> Optional[Sequence[Any]]:
+        values = getattr(self.clip, clip_property_name)
+        if values is None or self.order is None:
+            return values
+        return tuple(values[i] for i in self.order)
+
+    def locations_with_offset(self, name: str) -> list[Location]:
+        """Locations of samples captured at the given synchronization offset"""
+        if name not in self._offset_locations:
+            offsets = _synchronization_offsets(self.clip, name)
+            if offsets is not None and self.order is not None:
+                offsets = tuple(offsets[i] for i in self.order)
+            self._offset_locations[name] = (None if offsets is None
+                                            else _locate([t + o for t, o in zip(self.times, offsets)],
+                                                         self.timeline))
+        return self._offset_locations[name] or self.locations
+
+
+def _merged_transforms(source: _AlignedSource) -> tuple[tuple[Transform, ...], ...]:
+    values = source.values('transforms')
+    translation_locations = source.locations_with_offset('translation')
+    rotation_locations = source.locations_with_offset('rotation')
+    translated = _sample_transforms(values, translation_locations)
+    if rotation_locations is translation_locations:
+        return translated
+    rotated = _sample_transforms(values, rotation_locations)
+    return tuple(tuple(Transform(translation=t.translation, rotation=r.rotation, scale=t.scale, id=t.id)
+                       if t.id == r.id else t
+                       for t, r in zip(translated_chain, rotated_chain))
+                 if len(translated_chain) == len(rotated_chain) else translated_chain
+                 for translated_chain, rotated_chain in zip(translated, rotated))
+
+
+def merge_clips(sources: Sequence[Clip | MergeSource],
+                timeline: Optional[Sequence[int]] = None) -> Clip:
+    """Merge clips onto a common timeline of increasing times in nanoseconds,
+    by default the sample times of the first source. Where more than one
+    source carries a parameter, the earlier source in `sources` wins.
+
+    Synchronization offsets (translation, rotation and lens encoder) are
+    taken as the time in seconds from each sample's time to the capture of
+    the corresponding parameter.
+
+    Raises ValueError if sources with sample timestamps are merged with
+    sources timed by their sample rate that were given no offset.
+    """
+    sources = [s if isinstance(s, MergeSource) else MergeSource(s) for s in sources]
+    if not sources:
+        raise ValueError("nothing to merge")
+    timed = [s for s in sources if s.clip.frame_count()]
+    if (any(s.clip.timing_sample_timestamp for s in timed)
+            and any(not s.clip.timing_sample_timestamp and s.offset is None for s in timed)):
+        raise ValueError("sources without sample timestamps are timed from 0 by their sample rate;"
+                         " give them an offset placing them on the timeline of the timestamped sources")
+    absolute_timeline = timeline is not None or bool(sources[0].clip.timing_sample_timestamp)
+    if timeline is None:
+        timeline = sorted(sample_times(sources[0].clip, sources[0].offset, sources[0].first_index))
+    elif any(a > b for a, b in zip(timeline, timeline[1:])):
+        raise ValueError("timeline times must be increasing")
+
+    aligned = [_AlignedSource(s, timeline) for s in timed]
+    result = Clip()
+    for clip_property_name in Clip._static_clip_properties:
+        for source in sources:
+            if (value := getattr(source.clip, clip_property_name)) is not None:
+                setattr(result, clip_property_name, value)
+                break
+    for clip_property_name in Clip._regular_clip_properties:
+        if clip_property_name == 'timing_sample_timestamp' and absolute_timeline:
+            if timeline and timeline[0] >= 0:
+                result.timing_sample_timestamp = tuple(Timestamp.from_nanoseconds(t)
+                                                       for t in timeline)
+            continue
+        for source in aligned:
+            if (values := source.values(clip_property_name)) is None:
+                continue
+            if clip_property_name == 'transforms':
+                merged = _merged_transforms(source)
+            elif clip_property_name in _LENS_ENCODER_PROPERTIES:
+                merged = _sample(values, source.locations_with_offset('lensEncoders'))
+            else:
+                merged = _sample(values, source.locations)
+            setattr(result, clip_property_name, merged)
+            break
+    return result
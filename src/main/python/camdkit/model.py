@@ -1,4 +1,4 @@
-from camdkit.clip import Clip
+from camdkit.clip import Clip, Static
 
 from camdkit.camera_types import PhysicalDimensions as Dimensions
 from camdkit.lens_types import Distortion as LensDistortions
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+'''Mo-Sys F4 replay: play back a recorded .f4 file as live UDP traffic'''
+
+import sys
+import json
+import time
+import socket
+import argparse
+import ipaddress
+import statistics
+import dataclasses
+from fractions import Fraction
+from typing import Optional
+
+from camdkit.mosys.f4 import F4, F4PacketParser
+
+# Sleep until this long before each deadline, then spin, since sleep() wakes late
+_SPIN_NS = 1_000_000
+
+# An F4 packet holds at most 255 five-byte axis blocks and a five-byte header
+_MAX_PACKET_SIZE = 255 * 5 + 5
+
+@dataclasses.dataclass
+class ReplayStats:
+  packets: int
+  elapsed_seconds: float
+  target_rate: Optional[float]
+  achieved_rate: float
+  interval_jitter_mean_ns: float
+  interval_jitter_stdev_ns: float
+  interval_jitter_max_ns: int
+  lateness_max_ns: int
+
+def split_packets(data: bytes) -> list[bytes]:
+  """Split the contents of an .f4 file into its F4 packets, stopping at the
+  first packet that does not parse or fails its checksum"""
+  packets = []
+  parser = F4PacketParser()
+  offset = 0
+  # parse from a window of at most one packet, rather than copying the rest
+  # of the file for each packet
+  while parser.initialise(data[offset:offset + _MAX_PACKET_SIZE]):
+    size = parser._packet.size
+    packets.append(data[offset:offset + size])
+    offset += size
+  return packets
+
+def frame_rate(packets: list[bytes]) -> Optional[Fraction]:
+  """The frame rate of the timecode format carried by the first packet with
+  a timecode axis, or None if no packet has one"""
+  parser = F4PacketParser()
+  for packet in packets:
+    if parser.initialise(packet):
+      for axis_block in parser._packet.axis_block_list:
+        if axis_block.axis_id == F4.FIELD_ID_TIMECODE:
+          rate = axis_block.to_timecode().format.frame_rate
+          return Fraction(rate.num, rate.denom)
+  return None
+
+def decode_packets(packets: list[bytes]) -> list[bytes]:
+  """Decode each packet into the UTF-8 JSON of a single-frame Clip"""
+  payloads = []
+  parser = F4PacketParser()
+  for packet in packets:
+    if parser.initialise(packet):
+      frame = parser.get_tracking_frame()
+      payloads.append(json.dumps(next(frame.frames_to_json())).encode("utf-8"))
+  return payloads
+
+def open_socket(host: str, ttl: int = 1) -> socket.socket:
+  sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+  if ipaddress.ip_address(host).is_multicast:
+    sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, ttl)
+    sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1)
+  return sock
+
+def replay(payloads: list[bytes],
+           sock: socket.socket,
+           address: tuple[str, int],
+           rate: Optional[Fraction],
+           speed: Optional[float] = 1.0) -> ReplayStats:
+  """Send each payload to `address` at `rate` times `speed` payloads per second,
+  or as fast as possible if `rate` or `speed` is None.
+
+  Deadlines are computed from the start time on the monotonic performance
+  counter, not from the previous send, so lateness never accumulates.
+  """
+  period_ns = None if rate is None or speed is None else 1e9 / (float(rate) * speed)
+  send_times = []
+  lateness_max = 0
+  start = time.perf_counter_ns()
+  for i, payload in enumerate(payloads):
+    if period_ns is not None:
+      deadline = start + round(i * period_ns)
+      while (remaining := deadline - time.perf_counter_ns()) > 0:
+        if remaining > _SPIN_NS:
+          time.sleep((remaining - _SPIN_NS) / 1e9)
+    now = time.perf_counter_ns()
+    sock.sendto(payload, address)
+    if period_ns is not None:
+      lateness_max = max(lateness_max, now - deadline)
+    send_times.append(now)
+  elapsed_ns = (send_times[-1] - start) if send_times else 0
+
+  intervals = [b - a for a, b in zip(send_times, send_times[1:])]
+  jitter = [abs(interval - period_ns) for interval in intervals] if period_ns is not None else []
+  return ReplayStats(
+    packets=len(send_times),
+    elapsed_seconds=elapsed_ns / 1e9,
+    target_rate=None if period_ns is None else 1e9 / period_ns,
+    achieved_rate=(len(intervals) * 1e9 / elapsed_ns) if elapsed_ns else 0.0,
+    interval_jitter_mean_ns=statistics.fmean(jitter) if jitter else 0.0,
+    interval_jitter_stdev_ns=statistics.pstdev(jitter) if jitter else 0.0,
+    interval_jitter_max_ns=round(max(jitter)) if jitter else 0,
+    lateness_max_ns=lateness_max)
+
+def main(argv: Optional[list[str]] = None) -> int:
+  parser = argparse.ArgumentParser(description="Replay a Mo-Sys F4 recording as live UDP traffic, paced at the rate of its timecode.")
+  parser.add_argument('frame_f4_path', type=str, help="Path to F4 file containing Mo-Sys camera tracking data")
+  parser.add_argument('host', type=str, help="Destination IPv4 address (unicast, loopback or multicast)")
+  parser.add_argument('port', type=int, help="Destination UDP port")
+  parser.add_argument('--speed', type=str, default="1",
+                      help="Playback speed as a multiple of the recorded rate (e.g. 1, 2, 0.5), or 'max'")
+  parser.add_argument('--rate', type=Fraction, default=None,
+                      help="Recorded rate in Hz, if the recording carries no timecode (e.g. 25 or 30000/1001)")
+  parser.add_argument('--decoded', action='store_true',
+                      help="Send each frame as OpenTrackIO JSON rather than as the raw F4 packet")
+  parser.add_argument('--ttl', type=int, default=1, help="Multicast TTL")
+
+  args = parser.parse_args(argv)
+
+  with open(args.frame_f4_path, "rb") as f4_file:
+    packets = split_packets(f4_file.read())
+
+  speed = None if args.speed == "max" else float(args.speed)
+  rate = args.rate or frame_rate(packets)
+  if rate is None and speed is not None:
+    parser.error("the recording carries no timecode; supply --rate or use --speed max")
+
+  # decode everything up front, so that decoding cost never perturbs pacing
+  payloads = decode_packets(packets) if args.decoded else packets
+
+  with open_socket(args.host, args.ttl) as sock:
+    stats = replay(payloads, sock, (args.host, args.port), rate, speed)
+
+  print(json.dumps(dataclasses.asdict(stats), indent=2))
+  return 0
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -8,8 +8,10 @@
 
 import numbers
 from fractions import Fraction
-from typing import Any, Final, Annotated
-from pydantic import Field
+from typing import Any, ClassVar, Final, Annotated, Self
+from pydantic import Field, GetCoreSchemaHandler, GetJsonSchemaHandler
+from pydantic.json_schema import JsonSchemaValue
+from pydantic_core import core_schema
 
 from camdkit.compatibility import CompatibleBaseModel
 
@@ -21,7 +23,8 @@
            'NonNegative8BitInt',
            'NonNegativeInt', 'NonNegative48BitInt', 'StrictlyPositiveInt',
            'NonNegativeFloat', 'StrictlyPositiveFloat', 'NormalizedFloat', 'UnityOrGreaterFloat',
-           'Rational', 'StrictlyPositiveRational', 'rationalize_strictly_and_positively']
+           'Rational', 'StrictlyPositiveRational', 'rationalize_strictly_and_positively',
+           'RationalValue', 'StrictlyPositiveRationalValue']
 
 MIN_INT_8: Final[int] = -2**7
 MAX_INT_8: Final[int] = 2**7-1
@@ -126,3 +129,108 @@ def rationalize_strictly_and_positively(x: Any) -> StrictlyPositiveRational:
                 return StrictlyPositiveRational(int(x["num"]), int(x["denom"]))
             raise ValueError(f"could not convert input of type {type(x)} to a StrictlyPositiveRational")
     return x
+
+
+# Frame rates common enough to be worth sharing one instance of across samples
+COMMON_FRAME_RATES: Final[tuple[tuple[int, int], ...]] = (
+    (24000, 1001), (24, 1), (25, 1), (30000, 1001), (30, 1),
+    (48000, 1001), (48, 1), (50, 1), (60000, 1001), (60, 1),
+    (100, 1), (120000, 1001), (120, 1), (240, 1))
+
+
+class RationalValue(Fraction):
+    """An immutable rational number with the num and denom attributes of
+    Rational. Being a Fraction, it hashes, orders and takes part in arithmetic
+    like any other number (arithmetic returning plain Fractions), and Pydantic
+    validates it as a plain value rather than as a model, serializing it as
+    {"num": ..., "denom": ...}. Like any Fraction it is kept in lowest terms.
+
+    Common frame rates are interned, so that e.g. the 24000/1001 sample rate
+    of every frame of a clip is one shared object.
+    """
+    __slots__ = ()
+
+    _min_num: ClassVar[int] = MIN_INT_32
+    _interned: ClassVar[dict[tuple[int, int], "RationalValue"]] = {}
+
+    def __new__(cls, numerator: Any = 0, denominator: Any = None) -> Self:
+        if type(numerator) is int:
+            if denominator is None:
+                denominator_key = 1
+            elif type(denominator) is int and denominator > 0:
+                denominator_key = denominator
+            else:
+                denominator_key = None
+            if (interned := cls._interned.get((numerator, denominator_key))) is not None:
+                return interned
+        result = super(RationalValue, cls).__new__(cls, numerator, denominator)
+        if not cls._min_num <= result.numerator <= MAX_INT_32 or result.denominator > MAX_UINT_32:
+            raise ValueError(f"{result.numerator}/{result.denominator} is outside the range of a {cls.__name__}")
+        return result
+
+    @classmethod
+    def _intern(cls, rates: tuple[tuple[int, int], ...]) -> None:
+        cls._interned = {}
+        for num, denom in rates:
+            cls._interned[(num, denom)] = cls(num, denom)
+
+    @property
+    def num(self) -> int:
+        return self.numerator
+
+    @property
+    def denom(self) -> int:
+        return self.denominator
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.numerator}, {self.denominator})"
+
+    @classmethod
+    def validate(cls, value: Any) -> Self:
+        # in order of likelihood, JSON being the commonest source of many values
+        if type(value) is cls:
+            result = value
+        elif (type(value) is dict and value.keys() == {"num", "denom"}
+              and type(value["num"]) is int and type(value["denom"]) is int):
+            if value["denom"] < 1:
+                raise ValueError("the denominator must be a positive integer")
+            result = cls(value["num"], value["denom"])
+        elif isinstance(value, (Rational, StrictlyPositiveRational)):
+            result = cls(value.num, value.denom)
+        elif isinstance(value, numbers.Rational) and not isinstance(value, bool):
+            result = cls(int(value.numerator), int(value.denominator))
+        else:
+            raise ValueError(f"could not convert input of type {type(value)} to a {cls.__name__}")
+        # the range of the value was checked on construction
+        return result
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        return core_schema.no_info_plain_validator_function(
+            cls.validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda v: {"num": v.numerator, "denom": v.denominator}))
+
+    @classmethod
+    def __get_pydantic_json_schema__(cls, schema: core_schema.CoreSchema,
+                                     handler: GetJsonSchemaHandler) -> JsonSchemaValue:
+        return {
+            "type": "object",
+            "properties": {
+                "num": {"type": "integer", "maximum": MAX_INT_32, "minimum": cls._min_num},
+                "denom": {"type": "integer", "maximum": MAX_UINT_32, "minimum": 1}
+            },
+            "required": ["num", "denom"],
+            "additionalProperties": False
+        }
+
+
+class StrictlyPositiveRationalValue(RationalValue):
+    """A RationalValue greater than zero, e.g. a frame rate"""
+    __slots__ = ()
+
+    _min_num: ClassVar[int] = 1
+
+
+RationalValue._intern(COMMON_FRAME_RATES)
+StrictlyPositiveRationalValue._intern(COMMON_FRAME_RATES)
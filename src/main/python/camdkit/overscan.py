@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+"""Computation of overscan factors from lens distortion
+
+Following OpenLensIO 0.9 (appendix A.2), the distortion overscan is the
+factor by which the width of a rendered undistorted image must exceed the
+sensor width so that, once distorted, it covers the whole distorted image:
+
+    overscan = 2 max(max |x|, (w / h) max |y|) / w
+
+over the undistorted coordinates (x, y) of the points of the distorted image.
+The undistortion overscan is the same over the distorted coordinates of the
+points of the undistorted image, i.e. how much of the camera image an
+undistorted image needs. Neither is less than one.
+
+The extremes are taken over points along the edges of the image, which is
+where they lie for any lens whose distortion is monotonic in the radius.
+Overscan depends only on the lens distortion and sensor size, so results are
+memoized: a clip whose distortion changes rarely costs little more than one
+evaluation per distinct lens state.
+"""
+
+import math
+import dataclasses
+import functools
+from typing import Optional
+
+from camdkit.camera_types import PhysicalDimensions
+from camdkit.clip import Clip
+from camdkit.distortion import LensDistortion
+
+__all__ = ['Overscan', 'overscan', 'clip_overscans', 'fill_overscan']
+
+# points sampled along each edge of the image
+DEFAULT_EDGE_SAMPLES = 33
+
+
+@dataclasses.dataclass(frozen=True)
+class Overscan:
+    distortion: float = 1.0
+    undistortion: float = 1.0
+
+
+def _edges(width: float, height: float, samples: int) -> tuple[list[float], list[float]]:
+    """Points spaced evenly along the edges of a width x height rectangle
+    centred on the origin, corners included"""
+    half_width, half_height = width / 2, height / 2
+    steps = [-1.0 + 2.0 * i / (samples - 1) for i in range(samples)]
+    xs = ([s * half_width for s in steps] * 2
+          + [-half_width] * samples + [half_width] * samples)
+    ys = ([-half_height] * samples + [half_height] * samples
+          + [s * half_height for s in steps] * 2)
+    return xs, ys
+
+
+def _factor(xs, ys, width: float, height: float) -> float:
+    # a point where Newton's method did not converge is NaN, and max() would
+    # return or drop it depending on where it falls, so is refused outright
+    if not all(map(math.isfinite, xs)) or not all(map(math.isfinite, ys)):
+        raise ValueError("lens distortion could not be inverted at the edge of the image")
+    extent = max(max(map(abs, xs)), max(map(abs, ys)) * width / height)
+    return max(1.0, 2.0 * extent / width)
+
+
+@functools.lru_cache(maxsize=4096)
+def _overscan(distortion: LensDistortion, width: float, height: float, samples: int) -> Overscan:
+    xs, ys = _edges(width, height, samples)
+    undistorted_xs, undistorted_ys = distortion.undistort(xs, ys)
+    distorted_xs, distorted_ys = distortion.distort(xs, ys)
+    return Overscan(distortion=_factor(undistorted_xs, undistorted_ys, width, height),
+                    undistortion=_factor(distorted_xs, distorted_ys, width, height))
+
+
+def overscan(distortion: LensDistortion, dimensions: PhysicalDimensions,
+             samples: int = DEFAULT_EDGE_SAMPLES) -> Overscan:
+    """The distortion and undistortion overscan of a lens state on a sensor,
+    sampling `samples` points along each edge of the image. Raises ValueError
+    if the distortion cannot be inverted at any of those points."""
+    if samples < 2:
+        raise ValueError("at least two samples per edge are needed to include the corners")
+    if dimensions.width <= 0.0 or dimensions.height <= 0.0:
+        raise ValueError("sensor width and height must be positive to compute overscan")
+    return _overscan(distortion, dimensions.width, dimensions.height, samples)
+
+
+def _dimensions(clip: Clip, dimensions: Optional[PhysicalDimensions]) -> PhysicalDimensions:
+    if dimensions is None:
+        if clip.active_sensor_physical_dimensions is None:
+            raise ValueError("clip has no active sensor physical dimensions from which to compute overscan")
+        dimensions = clip.active_sensor_physical_dimensions
+    return dimensions
+
+
+def clip_overscans(clip: Clip, dimensions: Optional[PhysicalDimensions] = None,
+                   samples: int = DEFAULT_EDGE_SAMPLES) -> tuple[Overscan, ...]:
+    """The overscan of each sample of a clip, on the given sensor or by default
+    that of the clip"""
+    dimensions = _dimensions(clip, dimensions)
+    return tuple(overscan(LensDistortion.from_clip(clip, i), dimensions, samples)
+                 for i in range(clip.frame_count()))
+
+
+def fill_overscan(clip: Clip, dimensions: Optional[PhysicalDimensions] = None,
+                  samples: int = DEFAULT_EDGE_SAMPLES) -> Clip:
+    """Set the per-sample and maximum distortion and undistortion overscan
+    of a clip from its lens distortion, returning the clip"""
+    overscans = clip_overscans(clip, dimensions, samples)
+    if not overscans:
+        return clip
+    clip.lens_distortion_overscan = tuple(o.distortion for o in overscans)
+    clip.lens_undistortion_overscan = tuple(o.undistortion for o in overscans)
+    clip.lens_distortion_overscan_max = max(clip.lens_distortion_overscan)
+    clip.lens_undistortion_overscan_max = max(clip.lens_undistortion_overscan)
+    return clip
@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+"""Parallel validation and loading of large clip JSON
+
+Validating clip JSON (Clip.from_json(), i.e. Clip.model_validate()) runs in
+one thread and takes time in proportion to the number of samples. The
+samples of a regular parameter are validated independently of each other,
+so the JSON is split into chunks of samples that are validated in a pool of
+processes:
+
+- validate_clip_json() returns the validation errors of every chunk; the
+  workers return only errors, so it scales with the number of workers
+- from_json_parallel() also returns the Clip, its chunks being sent back
+  pickled and concatenated. Unpickling a Clip costs about as much as
+  validating it, so each chunk is compacted (see Clip.compact()) before it
+  is returned, and the speedup depends on how many parameter values repeat
+  from sample to sample. Unpickling and concatenating the chunks in the
+  parent still limits it: for the Mo-Sys clip of bench_parallel_json.py,
+  whose values mostly vary, that work takes over half as long as
+  Clip.from_json(), so loading is at most 1.8 times faster on any number of
+  CPUs.
+
+Errors are reported as by Pydantic, with sample indices counted from the
+start of the whole clip, in a ClipValidationError.
+"""
+
+import os
+import json
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterator, Optional
+
+from pydantic import ValidationError
+from pydantic.json_schema import JsonSchemaValue
+
+from camdkit.clip import Clip
+from camdkit.pipeline import concatenate
+from camdkit.rle import expand_json
+
+__all__ = ['MIN_CHUNK_SIZE', 'ClipValidationError', 'split_json', 'validate_clip_json',
+           'from_json_parallel', 'load_json_parallel']
+
+# Below this many samples per chunk, sending chunks to the workers costs more
+# than it saves
+MIN_CHUNK_SIZE = 256
+
+# chunks per worker, so that workers finishing early pick up more work
+_CHUNKS_PER_WORKER = 4
+
+
+class ClipValidationError(ValueError):
+
+    def __init__(self, errors: list[dict[str, Any]]):
+        locations = "; ".join(f"{'.'.join(str(p) for p in e['loc'])}: {e['msg']}" for e in errors[:5])
+        more = f" (and {len(errors) - 5} more)" if len(errors) > 5 else ""
+        super(ClipValidationError, self).__init__(f"{len(errors)} validation error(s): {locations}{more}")
+        self.errors = errors
+
+
+def _frame_count(clip_json: JsonSchemaValue) -> int:
+    for key, value in clip_json.items():
+        if key == "static":
+            continue
+        if isinstance(value, dict):
+            for values in value.values():
+                return len(values)
+        else:
+            return len(value)
+    return 0
+
+
+def _slice_json(clip_json: JsonSchemaValue, start: int, stop: int) -> JsonSchemaValue:
+    """The JSON of the samples from `start` up to `stop`, with the static
+    parameters only in the first chunk"""
+    chunk = {}
+    for key, value in clip_json.items():
+        if key == "static":
+            if start == 0:
+                chunk[key] = value
+        elif isinstance(value, dict):
+            chunk[key] = {k: v[start:stop] for k, v in value.items()}
+        else:
+            chunk[key] = value[start:stop]
+    return chunk
+
+
+def _split_expanded(clip_json: JsonSchemaValue, chunk_size: int) -> Iterator[tuple[int, JsonSchemaValue]]:
+    if chunk_size < 1:
+        raise ValueError("chunk size must be positive")
+    frame_count = _frame_count(clip_json)
+    for start in range(0, max(frame_count, 1), chunk_size):
+        yield start, _slice_json(clip_json, start, start + chunk_size)
+
+
+def split_json(clip_json: JsonSchemaValue, chunk_size: int) -> Iterator[tuple[int, JsonSchemaValue]]:
+    """(index of the first sample, JSON) of each chunk of clip JSON, which may
+    be run-length encoded (see camdkit.rle)"""
+    return _split_expanded(expand_json(clip_json), chunk_size)
+
+
+def _offset_errors(errors: list[dict[str, Any]], start: int) -> list[dict[str, Any]]:
+    """Errors with the sample index in each location, the first integer, made
+    relative to the whole clip"""
+    if not start:
+        return errors
+    result = []
+    for error in errors:
+        loc = list(error['loc'])
+        for i, part in enumerate(loc):
+            if isinstance(part, int):
+                loc[i] = part + start
+                break
+        result.append(error | {'loc': tuple(loc)})
+    return result
+
+
+def _validate_chunk(start: int, chunk_json: JsonSchemaValue,
+                    build: bool) -> tuple[Optional[Clip], list[dict[str, Any]]]:
+    try:
+        clip = Clip.from_json(chunk_json)
+    except ValidationError as e:
+        return None, _offset_errors(e.errors(include_url=False, include_context=False), start)
+    return clip if build else None, []
+
+
+def _validate_chunk_in_worker(start: int, chunk_json: JsonSchemaValue,
+                              build: bool) -> tuple[Optional[Clip], list[dict[str, Any]]]:
+    clip, errors = _validate_chunk(start, chunk_json, build)
+    # repeated values are pickled once, which makes the result much cheaper
+    # to send back and unpickle
+    if clip is not None:
+        clip.compact()
+    return clip, errors
+
+
+def _chunk_size(frame_count: int, workers: int) -> int:
+    return max(MIN_CHUNK_SIZE, -(-frame_count // (workers * _CHUNKS_PER_WORKER)))
+
+
+def _run(clip_json: JsonSchemaValue, workers: Optional[int], chunk_size: Optional[int],
+         build: bool) -> tuple[list[Clip], list[dict[str, Any]]]:
+    workers = workers or os.cpu_count() or 1
+    # expanded once here, so that neither splitting nor the validation of each
+    # chunk walks the whole clip again
+    clip_json = expand_json(clip_json)
+    if workers == 1 and chunk_size is None:
+        clip, errors = _validate_chunk(0, clip_json, build)
+        return [clip], errors
+    chunk_size = chunk_size or _chunk_size(_frame_count(clip_json), workers)
+    starts, chunk_jsons = zip(*_split_expanded(clip_json, chunk_size))
+    builds = [build] * len(starts)
+    if workers == 1 or len(chunk_jsons) == 1:
+        results = list(map(_validate_chunk, starts, chunk_jsons, builds))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunk_jsons))) as executor:
+            results = list(executor.map(_validate_chunk_in_worker, starts, chunk_jsons, builds))
+    return [clip for clip, _ in results], [error for _, errors in results for error in errors]
+
+
+def validate_clip_json(clip_json: JsonSchemaValue, workers: Optional[int] = None,
+                       chunk_size: Optional[int] = None) -> list[dict[str, Any]]:
+    """The validation errors of clip JSON, validated in chunks of `chunk_size`
+    samples by `workers` processes (by default, one per CPU)"""
+    return _run(clip_json, workers, chunk_size, build=False)[1]
+
+
+def from_json_parallel(clip_json: JsonSchemaValue, workers: Optional[int] = None,
+                       chunk_size: Optional[int] = None) -> Clip:
+    """As Clip.from_json(), validating chunks of `chunk_size` samples in
+    `workers` processes (by default, one per CPU). Raises ClipValidationError
+    listing the errors of every chunk."""
+    clips, errors = _run(clip_json, workers, chunk_size, build=True)
+    if errors:
+        raise ClipValidationError(errors)
+    return clips[0] if len(clips) == 1 else concatenate(clips)
+
+
+def load_json_parallel(path: str | os.PathLike, workers: Optional[int] = None,
+                       chunk_size: Optional[int] = None) -> Clip:
+    """The Clip of a JSON clip file, validated in parallel"""
+    with open(path, "r", encoding="utf-8") as fp:
+        return from_json_parallel(json.load(fp), workers, chunk_size)
@@ -0,0 +1,360 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+"""Chunked processing of Clips with bounded memory
+
+Rather than one Clip holding a whole take, a pipeline passes chunk Clips of
+a fixed number of samples (DEFAULT_CHUNK_SIZE) from a source, through
+stages, to a sink:
+
+    chunks = pipeline(read_chunks("mosys", ("take.f4",)),
+                      scale_property("lens_focus_distance", 0.001),
+                      retime(Fraction(24000, 1001)),
+                      analyze(analyzer))
+    frames = write_ndjson(chunks, "take.ndjson")
+
+Sources and stages are generators, so each chunk is read, transformed and
+written before the next is read, and memory is bounded by the chunk size
+rather than by the length of the take. A chunk's regular parameters hold
+its samples; its static parameters are those of the whole take.
+
+Only Mo-Sys F4 files are read incrementally. The other vendor readers
+(ARRI, Blackmagic, Canon, RED, Venice) read a whole camera metadata file
+into one Clip, so read_chunks() holds the whole take in memory for them,
+and only the stages and sinks after it are bounded by the chunk size.
+
+Chunks are concatenated as Clip.append() concatenates clips, but each
+parameter's tuple is built once rather than once per appended clip.
+"""
+
+import os
+import math
+import mmap
+import json
+import time
+import socket
+import itertools
+from bisect import bisect_left, bisect_right
+from fractions import Fraction
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Sequence
+
+from camdkit.clip import Clip
+from camdkit.analysis import TimingAnalyzer
+from camdkit.merge import MergeSource, merge_clips, sample_times
+from camdkit.numeric_types import StrictlyPositiveRational
+from camdkit.registry import read_clip
+from camdkit.timing_types import NANOSECONDS_PER_SECOND
+
+__all__ = ['DEFAULT_CHUNK_SIZE', 'Stage', 'slice_clip', 'concatenate', 'chunks', 'read_chunks',
+           'mosys_chunks', 'pipeline', 'rechunk', 'map_property', 'scale_property', 'retime',
+           'merge_with', 'analyze', 'collect', 'write_ndjson', 'write_parquet', 'send_udp']
+
+DEFAULT_CHUNK_SIZE = 4096
+
+# An F4 packet holds at most 255 five-byte axis blocks and a five-byte header
+_MAX_F4_PACKET_SIZE = 255 * 5 + 5
+
+# Sleep until this long before each send deadline, then spin, since sleep() wakes late
+_SPIN_NS = 1_000_000
+
+type Stage = Callable[[Iterator[Clip]], Iterator[Clip]]
+
+
+def slice_clip(clip: Clip, start: int, stop: int) -> Clip:
+    """The samples from `start` up to `stop` of a clip, sharing its static
+    parameters and its values"""
+    result = Clip()
+    for clip_property_name in Clip._static_clip_properties:
+        if (value := getattr(clip, clip_property_name)) is not None:
+            setattr(result, clip_property_name, value)
+    for clip_property_name in Clip._regular_clip_properties:
+        if (values := getattr(clip, clip_property_name)) is not None:
+            setattr(result, clip_property_name, values[start:stop])
+    return result
+
+
+def concatenate(clips: Sequence[Clip]) -> Clip:
+    """The samples of the clips one after the other, with the static parameters
+    of the first clip carrying each"""
+    result = Clip()
+    for clip_property_name in Clip._static_clip_properties:
+        for clip in clips:
+            if (value := getattr(clip, clip_property_name)) is not None:
+                setattr(result, clip_property_name, value)
+                break
+    for clip_property_name in Clip._regular_clip_properties:
+        parts = [values for clip in clips if (values := getattr(clip, clip_property_name))]
+        if parts:
+            setattr(result, clip_property_name, parts[0] if len(parts) == 1 else tuple(itertools.chain(*parts)))
+    return result
+
+
+def chunks(clip: Clip, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Clip]:
+    """The successive chunks of a clip"""
+    if chunk_size < 1:
+        raise ValueError("chunk size must be positive")
+    frame_count = clip.frame_count()
+    for start in range(0, frame_count, chunk_size):
+        yield slice_clip(clip, start, start + chunk_size)
+
+
+def mosys_chunks(path: str | os.PathLike, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 frames: int = -1) -> Iterator[Clip]:
+    """The chunks of a Mo-Sys F4 file, read a packet at a time through a memory
+    map, so that neither the file nor the clip is ever held whole. As with
+    camdkit.mosys.reader.to_clip(), reading stops at the first packet that does
+    not parse, and a non-negative `frames` limits the number of frames read."""
+    from camdkit.mosys.f4 import F4PacketParser
+
+    if chunk_size < 1:
+        raise ValueError("chunk size must be positive")
+    parser = F4PacketParser()
+    pending: list[Clip] = []
+    count = 0
+    with open(path, "rb") as fp:
+        if os.fstat(fp.fileno()).st_size == 0:
+            return
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            offset = 0
+            while (frames < 0 or count < frames) and parser.initialise(
+                    mapped[offset:offset + _MAX_F4_PACKET_SIZE]):
+                pending.append(parser.get_tracking_frame())
+                offset += parser._packet.size
+                count += 1
+                if len(pending) == chunk_size:
+                    yield concatenate(pending)
+                    pending = []
+    if pending:
+        yield concatenate(pending)
+
+
+def read_chunks(vendor: str, paths: tuple[str, ...],
+                chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Clip]:
+    """The chunks of a clip read by a vendor reader. Mo-Sys F4 files are read
+    incrementally; the other readers read a whole (camera metadata) file, whose
+    clip is then split into chunks sharing its values."""
+    if vendor == 'mosys':
+        yield from mosys_chunks(paths[0], chunk_size)
+    else:
+        yield from chunks(read_clip(vendor, paths), chunk_size)
+
+
+def pipeline(source: Iterable[Clip], *stages: Stage) -> Iterator[Clip]:
+    """The chunks of a source passed through each stage in turn"""
+    chunks_ = iter(source)
+    for stage in stages:
+        chunks_ = stage(chunks_)
+    return chunks_
+
+
+def rechunk(chunk_size: int = DEFAULT_CHUNK_SIZE) -> Stage:
+    """A stage regrouping chunks of any sizes into chunks of `chunk_size`
+    samples, but for the last"""
+    if chunk_size < 1:
+        raise ValueError("chunk size must be positive")
+
+    def stage(chunks_: Iterator[Clip]) -> Iterator[Clip]:
+        pending: list[Clip] = []
+        pending_frames = 0
+        for chunk in chunks_:
+            pending.append(chunk)
+            pending_frames += chunk.frame_count()
+            if pending_frames < chunk_size:
+                continue
+            combined = concatenate(pending)
+            start = 0
+            while pending_frames - start >= chunk_size:
+                yield slice_clip(combined, start, start + chunk_size)
+                start += chunk_size
+            pending = [slice_clip(combined, start, pending_frames)] if start < pending_frames else []
+            pending_frames -= start
+        if pending_frames:
+            yield concatenate(pending)
+    return stage
+
+
+def map_property(clip_property_name: str, function: Callable) -> Stage:
+    """A stage replacing each value of a regular parameter by the result of
+    `function` on it"""
+    if clip_property_name not in Clip._regular_clip_properties:
+        raise ValueError(f"'{clip_property_name}' is not a regular clip property")
+
+    def stage(chunks_: Iterator[Clip]) -> Iterator[Clip]:
+        for chunk in chunks_:
+            if (values := getattr(chunk, clip_property_name)) is not None:
+                setattr(chunk, clip_property_name, tuple(function(v) for v in values))
+            yield chunk
+    return stage
+
+
+def scale_property(clip_property_name: str, factor: float) -> Stage:
+    """A stage converting the units of a numeric regular parameter, e.g.
+    millimeters to meters with a factor of 0.001"""
+    return map_property(clip_property_name, lambda value: value * factor)
+
+
+def retime(sample_rate: Fraction, start: Optional[int] = None) -> Stage:
+    """A stage resampling chunks onto a regular timeline of `sample_rate`
+    samples per second from `start` (in nanoseconds, by default the time of
+    the first sample), interpolating as merge_clips() does. The last sample
+    of each chunk is carried over to the next, so that samples between chunks
+    are interpolated too; output chunks vary in size, so may be followed by
+    rechunk()."""
+    sample_rate = Fraction(sample_rate)
+    if sample_rate <= 0:
+        raise ValueError("sample rate must be positive")
+    period_ns = NANOSECONDS_PER_SECOND / sample_rate
+    rate = StrictlyPositiveRational(sample_rate.numerator, sample_rate.denominator)
+
+    def stage(chunks_: Iterator[Clip]) -> Iterator[Clip]:
+        origin: Optional[int] = start
+        tick = 0
+        first_index = 0
+        previous: Optional[Clip] = None
+        for chunk in chunks_:
+            frame_count = chunk.frame_count()
+            if not frame_count:
+                continue
+            if previous is None:
+                source = MergeSource(chunk, first_index=first_index)
+            else:
+                source = MergeSource(concatenate((previous, chunk)), first_index=first_index - 1)
+            times = sample_times(source.clip, first_index=source.first_index)
+            if origin is None:
+                origin = times[0]
+            # skip straight to the last tick before the chunk, however far
+            # `start` is before it, rather than counting periods up to it
+            tick = max(tick, math.ceil((times[0] - origin) / period_ns) - 1)
+            timeline = []
+            while (t := origin + round(tick * period_ns)) <= times[-1]:
+                if t >= times[0]:
+                    timeline.append(t)
+                tick += 1
+            previous = slice_clip(chunk, frame_count - 1, frame_count)
+            first_index += frame_count
+            if not timeline:
+                continue
+            retimed = merge_clips([source], timeline)
+            if not chunk.timing_sample_timestamp:
+                retimed.timing_sample_timestamp = None
+            retimed.timing_sample_rate = (rate,) * len(timeline)
+            yield retimed
+    return stage
+
+
+def merge_with(sources: Sequence[Clip | MergeSource]) -> Stage:
+    """A stage merging other clips (e.g. the camera's, alongside a tracker's
+    chunks) into each chunk onto the chunk's sample times, as merge_clips()
+    does with the chunk as its first source. Only the samples of each other
+    clip around the chunk's time range are located, so each chunk costs time
+    in proportion to its own size."""
+    sources = [s if isinstance(s, MergeSource) else MergeSource(s) for s in sources]
+    source_times = [sample_times(s.clip, s.offset, s.first_index) for s in sources]
+
+    def around(source: MergeSource, times: tuple[int, ...], first: int, last: int) -> MergeSource:
+        if any(a > b for a, b in zip(times, times[1:])):
+            return source
+        begin = max(bisect_right(times, first) - 1, 0)
+        end = min(bisect_left(times, last) + 1, len(times))
+        return MergeSource(slice_clip(source.clip, begin, end), source.offset, source.first_index + begin)
+
+    def stage(chunks_: Iterator[Clip]) -> Iterator[Clip]:
+        first_index = 0
+        for chunk in chunks_:
+            if not (frame_count := chunk.frame_count()):
+                yield chunk
+                continue
+            times = sample_times(chunk, first_index=first_index)
+            others = [around(s, t, min(times), max(times)) for s, t in zip(sources, source_times)]
+            yield merge_clips([MergeSource(chunk, first_index=first_index), *others])
+            first_index += frame_count
+    return stage
+
+
+def analyze(analyzer: TimingAnalyzer) -> Stage:
+    """A stage passing chunks through unchanged, analyzing their timing; the
+    analysis of the take is analyzer.report() once the chunks are consumed"""
+    def stage(chunks_: Iterator[Clip]) -> Iterator[Clip]:
+        for chunk in chunks_:
+            analyzer.update_clip(chunk)
+            yield chunk
+    return stage
+
+
+def collect(chunks_: Iterable[Clip]) -> Clip:
+    """A sink concatenating chunks back into one Clip, for takes that fit in
+    memory"""
+    return concatenate(list(chunks_))
+
+
+def write_ndjson(chunks_: Iterable[Clip], path: str | os.PathLike) -> int:
+    """A sink writing each sample as a line of JSON, as camdkit batch writes
+    .ndjson files, returning the number of samples written"""
+    count = 0
+    with open(path, "w", encoding="utf-8") as fp:
+        for chunk in chunks_:
+            for frame_json in chunk.frames_to_json():
+                fp.write(json.dumps(frame_json))
+                fp.write("\n")
+                count += 1
+    return count
+
+
+def write_parquet(chunks_: Iterable[Clip], path: str | os.PathLike) -> int:
+    """A sink writing the samples to a Parquet file, one row group per chunk,
+    as camdkit batch writes .parquet files, returning the number of samples
+    written. Columns are those of the first chunk."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise RuntimeError("Parquet output requires the pyarrow package") from e
+    from camdkit.batch import _parquet_row
+
+    count = 0
+    writer = None
+    try:
+        for chunk in chunks_:
+            rows = [_parquet_row(frame_json) for frame_json in chunk.frames_to_json()]
+            if not rows:
+                continue
+            if writer is None:
+                table = pyarrow.Table.from_pylist(rows)
+                static_json = Clip.to_json(chunk).get("static", {})
+                schema = table.schema.with_metadata({"static": json.dumps(static_json)})
+                writer = pyarrow.parquet.ParquetWriter(Path(path), schema)
+            table = pyarrow.Table.from_pylist(rows, schema=writer.schema)
+            writer.write_table(table)
+            count += len(rows)
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+
+def send_udp(chunks_: Iterable[Clip], sock: socket.socket, address: tuple[str, int],
+             sample_rate: Optional[Fraction] = None) -> int:
+    """A sink sending each sample as a UDP datagram of JSON, as the Mo-Sys
+    replay does, at `sample_rate` samples per second or as fast as possible,
+    returning the number of samples sent. Deadlines run from the first send,
+    so a slow chunk delays the samples after it only until they catch up."""
+    period_ns = None if sample_rate is None else NANOSECONDS_PER_SECOND / Fraction(sample_rate)
+    count = 0
+    start: Optional[int] = None
+    for chunk in chunks_:
+        for frame_json in chunk.frames_to_json():
+            payload = json.dumps(frame_json).encode("utf-8")
+            if start is None:
+                start = time.perf_counter_ns()
+            if period_ns is not None:
+                deadline = start + round(count * period_ns)
+                while (remaining := deadline - time.perf_counter_ns()) > 0:
+                    if remaining > _SPIN_NS:
+                        time.sleep((remaining - _SPIN_NS) / 1e9)
+            sock.sendto(payload, address)
+            count += 1
+    return count
@@ -23,14 +23,7 @@
   "DRAGON": 5
 }
 
-def to_clip(meta_3_file: typing.IO, meta_5_file: typing.IO) -> camdkit.model.Clip:
-  """Read RED camera metadata into a `Clip`.
-  `meta_3_file`: Static camera metadata. CSV file generated using REDline (`REDline --silent --i {camera_file_path} --printMeta 3`)
-  `meta_5_file`: Per-frame camera metadata. CSV file generated using REDline (`REDline --silent --i {camera_file_path} --printMeta 5`)
-  """
-
-  # read clip metadata
-  clip_metadata = next(csv.DictReader(meta_3_file))
+def _clip_from_static(clip_metadata: dict) -> camdkit.model.Clip:
   clip = camdkit.model.Clip()
 
   clip.iso = int(clip_metadata['ISO'])
@@ -61,6 +54,32 @@ def to_clip(meta_3_file: typing.IO, meta_5_file: typing.IO) -> camdkit.model.Cli
     height=pix_dims.height * pixel_pitch / 1000.0
   )
 
+  clip.capture_frame_rate = utils.guess_fps(Fraction(clip_metadata["FPS"]))
+
+  clip.duration = int(clip_metadata["Total Frames"])/clip.capture_frame_rate
+
+  clip.anamorphic_squeeze = Fraction(clip_metadata["Pixel Aspect Ratio"])
+
+  clip.shutter_angle = float(clip_metadata["Shutter (deg)"])
+
+  return clip
+
+def to_static(meta_3_file: typing.IO) -> camdkit.model.Static:
+  """Read only the static RED camera metadata, without reading any per-frame metadata.
+  `meta_3_file`: Static camera metadata. CSV file generated using REDline (`REDline --silent --i {camera_file_path} --printMeta 3`)
+  """
+  return _clip_from_static(next(csv.DictReader(meta_3_file))).static
+
+def to_clip(meta_3_file: typing.IO, meta_5_file: typing.IO) -> camdkit.model.Clip:
+  """Read RED camera metadata into a `Clip`.
+  `meta_3_file`: Static camera metadata. CSV file generated using REDline (`REDline --silent --i {camera_file_path} --printMeta 3`)
+  `meta_5_file`: Per-frame camera metadata. CSV file generated using REDline (`REDline --silent --i {camera_file_path} --printMeta 5`)
+  """
+
+  # read clip metadata
+  clip_metadata = next(csv.DictReader(meta_3_file))
+  clip = _clip_from_static(clip_metadata)
+
   # read frame metadata
   csv_data = list(csv.DictReader(meta_5_file))
 
@@ -69,14 +88,6 @@ def to_clip(meta_3_file: typing.IO, meta_5_file: typing.IO) -> camdkit.model.Cli
   if len(csv_data) != n_frames:
     raise ValueError(f"Inconsistent frame count between header {n_frames} and frame {len(csv_data)} files")
 
-  clip.capture_frame_rate = utils.guess_fps(Fraction(clip_metadata["FPS"]))
-
-  clip.duration = len(csv_data)/clip.capture_frame_rate
-
-  clip.anamorphic_squeeze = Fraction(clip_metadata["Pixel Aspect Ratio"])
-
-  clip.shutter_angle = float(clip_metadata["Shutter (deg)"])
-
   clip.lens_focal_length = tuple(int(m["Focal Length"]) for m in csv_data)
 
   clip.lens_focus_distance = tuple(int(m["Focus Distance"]) for m in csv_data)
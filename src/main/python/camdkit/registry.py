@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+"""Registry of vendor readers, and detection of vendor files from their headers
+
+Each reader is registered by the name of its module, which is imported only
+when a file of that vendor is actually read, so that start-up cost does not
+grow with the number of supported vendors.
+"""
+
+import re
+import importlib
+import dataclasses
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, Optional
+
+from camdkit.clip import Clip, Static
+
+__all__ = ['STATIC', 'DYNAMIC', 'ReaderInfo', 'READERS',
+           'register_reader', 'get_reader', 'detect', 'read_clip', 'read_static', 'open_clip']
+
+# Roles a file can play in a call to a reader's to_clip()
+STATIC = "static"
+DYNAMIC = "dynamic"
+
+# How much of the start of a file sniffers get to look at
+_SNIFF_LENGTH = 64 * 1024
+
+type Sniffer = Callable[[bytes], Optional[str]]
+
+
+@dataclasses.dataclass(frozen=True)
+class ReaderInfo:
+    vendor: str
+    module: str
+    """Name of the module providing to_clip()"""
+    roles: tuple[str, ...]
+    """Roles of the to_clip() file arguments, in order"""
+    opens_files: bool
+    """Whether to_clip() takes paths (True) rather than open text files (False)"""
+    sniff: Sniffer
+    """Returns the role of a file from its first bytes, or None if it is not this vendor's"""
+    static_roles: tuple[str, ...] = ()
+    """Roles of the to_static() file arguments, in order; empty if the reader has no to_static()"""
+
+
+READERS: dict[str, ReaderInfo] = {}
+
+
+def register_reader(vendor: str, module: str, roles: tuple[str, ...],
+                    opens_files: bool, sniff: Sniffer, static_roles: tuple[str, ...] = ()) -> None:
+    READERS[vendor] = ReaderInfo(vendor, module, roles, opens_files, sniff, static_roles)
+
+
+def get_reader(vendor: str) -> ModuleType:
+    """Import (on first use) and return the reader module for a vendor"""
+    try:
+        return importlib.import_module(READERS[vendor].module)
+    except KeyError:
+        raise ValueError(f"unknown vendor '{vendor}'; expected one of {', '.join(READERS)}") from None
+
+
+def detect(path: str | Path) -> Optional[tuple[str, str]]:
+    """Return the vendor and role of a file from its header, or None if no
+    registered reader recognizes it"""
+    with open(path, "rb") as fp:
+        head = fp.read(_SNIFF_LENGTH)
+    for info in READERS.values():
+        if role := info.sniff(head):
+            return info.vendor, role
+    return None
+
+
+def _call(vendor: str, fn: Callable, paths: tuple[str, ...]):
+    if READERS[vendor].opens_files:
+        return fn(*paths)
+    files = [open(path, "r", encoding="utf-8") for path in paths]
+    try:
+        return fn(*files)
+    finally:
+        for f in files:
+            f.close()
+
+
+def read_clip(vendor: str, paths: tuple[str, ...]) -> Clip:
+    """Read a clip with the reader of the given vendor, from paths given in
+    the order of that reader's to_clip() arguments"""
+    return _call(vendor, get_reader(vendor).to_clip, paths)
+
+
+def read_static(vendor: str, paths: tuple[str, ...]) -> Static:
+    """Read only the static metadata of a clip with the reader of the given
+    vendor, from the same paths as read_clip(), of which only those its
+    to_static() needs are read"""
+    reader = get_reader(vendor)
+    info = READERS[vendor]
+    if not info.static_roles:
+        raise ValueError(f"the {vendor} reader cannot read static metadata on its own")
+    by_role = dict(zip(info.roles, paths))
+    return _call(vendor, reader.to_static, tuple(by_role[role] for role in info.static_roles))
+
+
+def open_clip(*paths: str | Path) -> Clip:
+    """Read a clip from its vendor file or files, given in any order, detecting
+    the vendor and the role of each file"""
+    detected = []
+    for path in paths:
+        if (vendor_and_role := detect(path)) is None:
+            raise ValueError(f"{path} is not a file of any known vendor")
+        detected.append(vendor_and_role)
+    vendors = {vendor for vendor, _ in detected}
+    if len(vendors) != 1:
+        raise ValueError(f"files are from more than one vendor: {', '.join(sorted(vendors))}")
+    vendor = vendors.pop()
+    by_role = {role: str(path) for path, (_, role) in zip(paths, detected)}
+    roles = READERS[vendor].roles
+    if len(by_role) != len(paths) or set(by_role) != set(roles):
+        raise ValueError(f"{vendor} clips need exactly one file of each of: {', '.join(roles)}")
+    return read_clip(vendor, tuple(by_role[role] for role in roles))
+
+
+def _first_line(head: bytes) -> bytes:
+    return head.split(b"\n", 1)[0]
+
+
+def _sniff_arri(head: bytes) -> Optional[str]:
+    line = _first_line(head)
+    return DYNAMIC if b"\t" in line and b"Camera Family" in line and b"Lens Focal Length" in line else None
+
+
+def _sniff_bmd(head: bytes) -> Optional[str]:
+    return DYNAMIC if re.search(rb"^(?:Clip|Frame \d+) Metadata\r?$", head, re.MULTILINE) else None
+
+
+def _sniff_canon(head: bytes) -> Optional[str]:
+    line = _first_line(head)
+    if b"LensSqueezeFactor" in line and b"Timescale" in line:
+        return STATIC
+    if b"FocusPosition" in line and b"ApertureMode" in line:
+        return DYNAMIC
+    return None
+
+
+def _sniff_mosys(head: bytes) -> Optional[str]:
+    # F4 command byte, then camera id and a non-zero axis count whose 5-byte
+    # axis blocks, plus 4 header bytes and the checksum, fit in the file
+    if len(head) >= 10 and head[0] == 0xF4 and head[2] and head[2] * 5 + 5 <= len(head):
+        return DYNAMIC
+    return None
+
+
+def _sniff_red(head: bytes) -> Optional[str]:
+    line = _first_line(head)
+    if b"Camera PIN" in line and b"Total Frames" in line:
+        return STATIC
+    if b"FrameNo" in line and b"Cooke Metadata" in line:
+        return DYNAMIC
+    return None
+
+
+def _sniff_venice(head: bytes) -> Optional[str]:
+    if head.lstrip().startswith(b"<?xml") and b"nonRealTimeMeta" in head:
+        return STATIC
+    line = _first_line(head)
+    if b"Focal Length (mm)" in line and b"Focus Distance (ft)" in line:
+        return DYNAMIC
+    return None
+
+
+register_reader('arri', 'camdkit.arri.reader', (DYNAMIC,), True, _sniff_arri, (DYNAMIC,))
+register_reader('bmd', 'camdkit.bmd.reader', (DYNAMIC,), False, _sniff_bmd)
+# Canon clip metadata lacks the ISO and shutter angle, which come from the first frame
+register_reader('canon', 'camdkit.canon.reader', (STATIC, DYNAMIC), False, _sniff_canon, (STATIC, DYNAMIC))
+register_reader('mosys', 'camdkit.mosys.reader', (DYNAMIC,), True, _sniff_mosys)
+register_reader('red', 'camdkit.red.reader', (STATIC, DYNAMIC), False, _sniff_red, (STATIC,))
+register_reader('venice', 'camdkit.venice.reader', (STATIC, DYNAMIC), False, _sniff_venice, (STATIC,))
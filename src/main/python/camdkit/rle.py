@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+"""Run-length encoding of regular parameters
+
+Many regular parameters (sample rate, timing mode, protocol, source id, the
+distortion of a prime...) are constant, or constant for long stretches, over
+a take. In memory, Clip.compact() makes each run of equal values share a
+single instance, leaving tuples of the same length and content; in JSON,
+compress_json() replaces the list of values of a parameter by
+
+    {"rle": [[count, value], [count, value], ...]}
+
+wherever that is shorter, and expand_json() restores the plain form.
+
+Values shared by compaction are ordinary, mutable model instances: changing
+an attribute of one sample in place, e.g.
+
+    clip.transforms[i][0].translation.x = 1.0
+
+changes every sample of its run. To change one sample, assign the parameter
+a new tuple holding a new value for that sample instead.
+"""
+
+from typing import Any, Iterable, Sequence
+
+from pydantic.json_schema import JsonSchemaValue
+
+__all__ = ['RLE_KEY', 'encode_runs', 'decode_runs', 'share_runs', 'compress_json', 'expand_json',
+           'is_compressed']
+
+RLE_KEY = "rle"
+
+
+def encode_runs(values: Iterable[Any]) -> list[tuple[int, Any]]:
+    """(count, value) for each run of consecutive equal values"""
+    runs: list[list] = []
+    for value in values:
+        if runs and (runs[-1][1] is value or runs[-1][1] == value):
+            runs[-1][0] += 1
+        else:
+            runs.append([1, value])
+    return [(count, value) for count, value in runs]
+
+
+def decode_runs(runs: Iterable[Sequence[Any]]) -> tuple[Any, ...]:
+    """The values of (count, value) runs, as a tuple"""
+    result = []
+    for count, value in runs:
+        result.extend([value] * count)
+    return tuple(result)
+
+
+def share_runs(values: Sequence[Any]) -> tuple[Any, ...]:
+    """The values, with each run of consecutive equal values replaced by
+    repetitions of its first value"""
+    return decode_runs(encode_runs(values))
+
+
+def _compress(values: Any) -> Any:
+    if not isinstance(values, (list, tuple)) or len(values) < 2:
+        return values
+    runs = encode_runs(values)
+    # each run costs a count as well as a value
+    return {RLE_KEY: [[count, value] for count, value in runs]} if len(runs) * 2 < len(values) else values
+
+
+def _expand(values: Any) -> Any:
+    if _is_runs(values):
+        return decode_runs(values[RLE_KEY])
+    return values
+
+
+def _is_runs(values: Any) -> bool:
+    return isinstance(values, dict) and values.keys() == {RLE_KEY}
+
+
+def _map_regular(clip_json: JsonSchemaValue, fn) -> JsonSchemaValue:
+    result = {}
+    for key, value in clip_json.items():
+        if key == "static":
+            result[key] = value
+        elif isinstance(value, dict) and not _is_runs(value):
+            result[key] = {k: fn(v) for k, v in value.items()}
+        else:
+            result[key] = fn(value)
+    return result
+
+
+def compress_json(clip_json: JsonSchemaValue) -> JsonSchemaValue:
+    """Run-length encode the regular parameters of the JSON of a Clip, where
+    that makes them shorter"""
+    return _map_regular(clip_json, _compress)
+
+
+def expand_json(clip_json: JsonSchemaValue) -> JsonSchemaValue:
+    """Undo compress_json(); JSON without run-length encoding is returned as is"""
+    return _map_regular(clip_json, _expand)
+
+
+def is_compressed(clip_json: JsonSchemaValue) -> bool:
+    """Whether any regular parameter of the JSON of a Clip is run-length
+    encoded, found without expanding it"""
+    for key, value in clip_json.items():
+        if key == "static":
+            continue
+        if _is_runs(value) or (isinstance(value, dict) and any(map(_is_runs, value.values()))):
+            return True
+    return False
@@ -0,0 +1,320 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+"""Compiled JSON Schema validation of samples, without Pydantic models
+
+compile_schema() generates the Python source of a function that checks an
+instance against a JSON schema, each keyword becoming inline code specialized
+to its value, and compiles it. sample_validator() does this once for the
+OpenTrackIO schema of Clip; validate_sample() uses it.
+
+The keywords camdkit schemas use are supported: type, enum, const, minimum,
+maximum, exclusiveMinimum, exclusiveMaximum, minLength, maxLength, pattern,
+items, minItems, maxItems, uniqueItems, properties, required,
+additionalProperties, allOf, anyOf and oneOf. Annotations (description,
+units...) are ignored, and any other keyword is rejected when compiling.
+Unlike jsonschema, tuples are accepted as arrays, as camdkit produces them.
+"""
+
+import re
+import json
+import functools
+import itertools
+from typing import Any, Callable
+
+__all__ = ['SchemaValidationError', 'compile_schema', 'validator_source',
+           'sample_validator', 'validate_sample', 'sample_from_frame']
+
+_ANNOTATIONS = frozenset(('$id', '$schema', '$comment', 'title', 'description', 'default', 'examples',
+                          'units', 'format', 'deprecated', 'readOnly', 'writeOnly'))
+
+_TYPE_CHECKS = {
+    'object': "isinstance({v}, dict)",
+    'array': "isinstance({v}, (list, tuple))",
+    'string': "isinstance({v}, str)",
+    'integer': "(type({v}) is int or (type({v}) is float and {v}.is_integer()))",
+    'number': "type({v}) in (int, float)",
+    'boolean': "type({v}) is bool",
+    'null': "{v} is None",
+}
+
+# the keywords that apply to instances of each type
+_KEYWORDS_BY_TYPE = {
+    'number': ('minimum', 'maximum', 'exclusiveMinimum', 'exclusiveMaximum'),
+    'string': ('minLength', 'maxLength', 'pattern'),
+    'array': ('items', 'minItems', 'maxItems', 'uniqueItems'),
+    'object': ('properties', 'required', 'additionalProperties'),
+}
+
+_SUPPORTED = frozenset(itertools.chain(('type', 'enum', 'const', 'allOf', 'anyOf', 'oneOf'),
+                                       *_KEYWORDS_BY_TYPE.values()))
+
+
+class SchemaValidationError(ValueError):
+
+    def __init__(self, path: str, message: str):
+        super(SchemaValidationError, self).__init__(f"{path or '<root>'}: {message}")
+        self.path = path
+        self.message = message
+
+
+def _fail(path: str, message: str):
+    raise SchemaValidationError(path, message)
+
+
+def _json_key(value: Any) -> Any:
+    """A hashable key equal for values equal as JSON: unlike Python values,
+    true is not 1 and false is not 0, while 1 and 1.0 are the same number"""
+    if isinstance(value, bool) or value is None:
+        return value, type(value)
+    if isinstance(value, (int, float)):
+        return value, float
+    if isinstance(value, str):
+        return value, str
+    if isinstance(value, (list, tuple)):
+        return tuple(map(_json_key, value)), list
+    if isinstance(value, dict):
+        return frozenset((k, _json_key(v)) for k, v in value.items()), dict
+    raise ValueError(f"{value!r} is not a JSON value")
+
+
+def _unique(values) -> bool:
+    keys = [_json_key(value) for value in values]
+    return len(set(keys)) == len(keys)
+
+
+def _count(schema: dict, keyword: str) -> int:
+    """The value of a keyword that must be a non-negative integer, checked
+    before it is written into generated code"""
+    value = schema[keyword]
+    if type(value) is not int or value < 0:
+        raise ValueError(f"JSON schema keyword {keyword} must be a non-negative integer, not {value!r}")
+    return value
+
+
+def _limit(schema: dict, keyword: str) -> int | float:
+    """The value of a keyword that must be a number, checked before it is
+    written into generated code"""
+    value = schema[keyword]
+    if type(value) not in (int, float) or value != value or value in (float("inf"), float("-inf")):
+        raise ValueError(f"JSON schema keyword {keyword} must be a finite number, not {value!r}")
+    return value
+
+
+class _Generator:
+
+    def __init__(self):
+        self.functions: list[list[str]] = []
+        self.constants: dict[str, Any] = {}
+        self.names = itertools.count()
+
+    def constant(self, value: Any) -> str:
+        name = f"_c{next(self.names)}"
+        self.constants[name] = value
+        return name
+
+    def function(self, schema: Any) -> str:
+        """Generate a function checking its argument against a schema,
+        returning its name"""
+        name = f"_v{next(self.names)}"
+        lines = [f"def {name}(v, path):"]
+        self.functions.append(lines)
+        body = []
+        self.node(schema, "v", "path", body, 1)
+        lines.extend(body or ["    pass"])
+        return name
+
+    def node(self, schema: Any, v: str, path: str, out: list[str], depth: int) -> None:
+        """Append code checking the value of the expression `v` against a
+        schema, where `path` is an expression for the value's JSON pointer,
+        evaluated only on failure"""
+        pad = "    " * depth
+        if schema is True or schema == {}:
+            return
+        if schema is False:
+            out.append(f"{pad}_fail({path}, 'no value is allowed here')")
+            return
+        if unsupported := [k for k in schema if k not in _SUPPORTED and k not in _ANNOTATIONS]:
+            raise ValueError(f"unsupported JSON schema keyword(s) {', '.join(unsupported)}")
+
+        types = schema.get('type')
+        types = [types] if isinstance(types, str) else types
+        if types is not None:
+            check = " or ".join(_TYPE_CHECKS[t].format(v=v) for t in types)
+            out.append(f"{pad}if not ({check}):")
+            out.append(f"{pad}    _fail({path}, {('is not of type ' + ', '.join(types))!r})")
+        if 'enum' in schema:
+            keys = self.constant(frozenset(map(_json_key, schema['enum'])))
+            out.append(f"{pad}if _json_key({v}) not in {keys}:")
+            out.append(f"{pad}    _fail({path}, {('is not one of ' + json.dumps(schema['enum']))!r})")
+        if 'const' in schema:
+            out.append(f"{pad}if _json_key({v}) != {self.constant(_json_key(schema['const']))}:")
+            out.append(f"{pad}    _fail({path}, {('is not ' + json.dumps(schema['const']))!r})")
+
+        for kind, keywords in _KEYWORDS_BY_TYPE.items():
+            if not any(k in schema for k in keywords):
+                continue
+            # keywords apply only to instances of their type, so need a guard
+            # unless the type keyword has already restricted the instance to it
+            instance_types = {'number', 'integer'} if kind == 'number' else {kind}
+            if types is not None and set(types) <= instance_types:
+                getattr(self, f"_{kind}")(schema, v, path, out, depth)
+            else:
+                check = " or ".join(_TYPE_CHECKS[t].format(v=v) for t in sorted(instance_types))
+                guarded: list[str] = []
+                getattr(self, f"_{kind}")(schema, v, path, guarded, depth + 1)
+                out.append(f"{pad}if {check}:")
+                out.extend(guarded)
+
+        for keyword in ('allOf', 'anyOf', 'oneOf'):
+            if keyword in schema:
+                functions = ", ".join(self.function(s) for s in schema[keyword])
+                out.append(f"{pad}_matches = sum(_valid(f, {v}, {path}) for f in ({functions},))")
+                test, description = {'allOf': (f"_matches != {len(schema[keyword])}", "all"),
+                                     'anyOf': ("_matches == 0", "any"),
+                                     'oneOf': ("_matches != 1", "exactly one")}[keyword]
+                out.append(f"{pad}if {test}:")
+                out.append(f"{pad}    _fail({path}, 'is not valid under {description} of the given schemas')")
+
+    def _number(self, schema, v, path, out, depth):
+        pad = "    " * depth
+        for keyword, operator, relation in (('minimum', '<', 'less than'),
+                                            ('maximum', '>', 'greater than'),
+                                            ('exclusiveMinimum', '<=', 'less than or equal to'),
+                                            ('exclusiveMaximum', '>=', 'greater than or equal to')):
+            if keyword in schema:
+                limit = _limit(schema, keyword)
+                out.append(f"{pad}if {v} {operator} {limit!r}:")
+                out.append(f"{pad}    _fail({path}, {f'is {relation} {keyword} {limit}'!r})")
+
+    def _string(self, schema, v, path, out, depth):
+        pad = "    " * depth
+        if 'minLength' in schema:
+            limit = _count(schema, 'minLength')
+            out.append(f"{pad}if len({v}) < {limit}:")
+            out.append(f"{pad}    _fail({path}, 'is shorter than {limit} characters')")
+        if 'maxLength' in schema:
+            limit = _count(schema, 'maxLength')
+            out.append(f"{pad}if len({v}) > {limit}:")
+            out.append(f"{pad}    _fail({path}, 'is longer than {limit} characters')")
+        if 'pattern' in schema:
+            pattern = self.constant(re.compile(schema['pattern']))
+            out.append(f"{pad}if {pattern}.search({v}) is None:")
+            out.append(f"{pad}    _fail({path}, {('does not match ' + schema['pattern'])!r})")
+
+    def _array(self, schema, v, path, out, depth):
+        pad = "    " * depth
+        if 'minItems' in schema:
+            limit = _count(schema, 'minItems')
+            out.append(f"{pad}if len({v}) < {limit}:")
+            out.append(f"{pad}    _fail({path}, 'has fewer than {limit} items')")
+        if 'maxItems' in schema:
+            limit = _count(schema, 'maxItems')
+            out.append(f"{pad}if len({v}) > {limit}:")
+            out.append(f"{pad}    _fail({path}, 'has more than {limit} items')")
+        if schema.get('uniqueItems'):
+            out.append(f"{pad}if not _unique({v}):")
+            out.append(f"{pad}    _fail({path}, 'has non-unique items')")
+        if 'items' in schema and schema['items'] not in (True, {}):
+            n = next(self.names)
+            item_checks: list[str] = []
+            self.node(schema['items'], f"x{n}", f"{path} + '/' + str(i{n})", item_checks, depth + 1)
+            out.append(f"{pad}for i{n}, x{n} in enumerate({v}):")
+            out.extend(item_checks)
+
+    def _object(self, schema, v, path, out, depth):
+        pad = "    " * depth
+        for name in schema.get('required', ()):
+            if not isinstance(name, str):
+                raise ValueError(f"JSON schema required property names must be strings, not {name!r}")
+            out.append(f"{pad}if {name!r} not in {v}:")
+            out.append(f"{pad}    _fail({path}, {f'{name!r} is a required property'!r})")
+        properties = schema.get('properties', {})
+        for name, subschema in properties.items():
+            if not isinstance(name, str):
+                raise ValueError(f"JSON schema property names must be strings, not {name!r}")
+            if subschema in (True, {}):
+                continue
+            n = next(self.names)
+            checks: list[str] = []
+            self.node(subschema, f"x{n}", f"{path} + {('/' + name)!r}", checks, depth + 1)
+            out.append(f"{pad}if {name!r} in {v}:")
+            out.append(f"{pad}    x{n} = {v}[{name!r}]")
+            out.extend(checks)
+        additional = schema.get('additionalProperties', True)
+        if additional is True:
+            return
+        allowed = self.constant(frozenset(properties))
+        n = next(self.names)
+        out.append(f"{pad}if not {allowed}.issuperset({v}):")
+        out.append(f"{pad}    for k{n} in {v}:")
+        out.append(f"{pad}        if k{n} not in {allowed}:")
+        if additional is False:
+            out.append(f"{pad}            _fail({path}, f'additional property {{k{n}!r}} is not allowed')")
+        else:
+            checks = []
+            self.node(additional, f"{v}[k{n}]", f"{path} + '/' + k{n}", checks, depth + 3)
+            out.extend(checks or [f"{pad}            pass"])
+
+
+def _valid(function: Callable[[Any, str], None], value: Any, path: str) -> bool:
+    try:
+        function(value, path)
+        return True
+    except SchemaValidationError:
+        return False
+
+
+def _generate(schema: Any) -> tuple[str, dict[str, Any]]:
+    generator = _Generator()
+    entry = generator.function(schema)
+    source = "\n\n".join("\n".join(lines) for lines in reversed(generator.functions))
+    source += f"\n\n\ndef validate(instance):\n    {entry}(instance, '')\n"
+    return source, generator.constants
+
+
+def validator_source(schema: Any) -> str:
+    """The generated Python source of the validator for a schema, for
+    inspection; its constants (compiled patterns, enumerations) are named
+    _c0, _c1..."""
+    return _generate(schema)[0]
+
+
+def compile_schema(schema: Any) -> Callable[[Any], None]:
+    """A function raising SchemaValidationError if its argument, a decoded
+    JSON value, is not valid against the schema"""
+    source, constants = _generate(schema)
+    namespace = {'_fail': _fail, '_unique': _unique, '_valid': _valid, '_json_key': _json_key, **constants}
+    exec(compile(source, "<camdkit schema validator>", "exec"), namespace)
+    return namespace['validate']
+
+
+@functools.cache
+def sample_validator() -> Callable[[Any], None]:
+    """The compiled validator of the OpenTrackIO schema, compiled on first use"""
+    from camdkit.clip import Clip
+    return compile_schema(Clip.make_json_schema())
+
+
+def validate_sample(sample: Any) -> None:
+    """Raise SchemaValidationError if a decoded OpenTrackIO sample is not
+    valid against the OpenTrackIO schema"""
+    sample_validator()(sample)
+
+
+def sample_from_frame(frame_json: dict[str, Any]) -> dict[str, Any]:
+    """The OpenTrackIO sample for the JSON of one frame of a Clip (as from
+    Clip.frames_to_json()), in which each regular parameter is a tuple of
+    one value"""
+    sample = {}
+    for key, value in frame_json.items():
+        if key == "static":
+            sample[key] = value
+        elif isinstance(value, dict):
+            sample[key] = {k: v[0] for k, v in value.items()}
+        else:
+            sample[key] = value[0]
+    return sample
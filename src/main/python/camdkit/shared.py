@@ -0,0 +1,356 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+"""Clips shared between processes through shared memory or a mapped file
+
+publish() lays out the regular parameters of a Clip as columns in a block
+of shared memory, and attach() maps that block from another process as a
+read-only SharedClipView; write_shared() and open_shared() do the same
+through a file, mapped with mmap. Handing a clip to another process then
+costs passing the name of the block or file rather than pickling the Clip.
+
+The block starts with a header (the magic bytes CAMDKSHM, the length of the
+header JSON as a little-endian uint64, then the JSON), which holds the
+static parameters and, for each regular parameter, its JSON path, its number
+of samples (which, as in a Clip, may differ between parameters) and the
+offset of its column:
+
+- "d": float64 values, for parameters whose values are all floats
+- "q": int64 values, for parameters whose values are all integers
+- "json": the compact JSON of each value, one after the other, with a column
+  of uint64 offsets to the start of each, for everything else
+
+Numbers are read in place; other values are decoded and validated when
+read, a whole slice at a time. Columns are in native byte order, recorded in
+the header.
+"""
+
+import os
+import sys
+import json
+import mmap
+import struct
+from array import array
+from collections.abc import Sequence
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Callable, Optional, Self
+
+from pydantic.json_schema import JsonSchemaValue
+
+from camdkit.clip import Clip
+
+__all__ = ['MAGIC', 'SharedClip', 'SharedClipView', 'publish', 'attach', 'write_shared', 'open_shared']
+
+MAGIC = b"CAMDKSHM"
+_VERSION = 1
+_PREFIX = struct.Struct("<8sQ")
+_ALIGNMENT = 8
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def _json_path(clip_property_name: str, values: tuple) -> list[str]:
+    """The keys leading to the values of a regular parameter in clip JSON,
+    found by serializing a clip holding at most one of its values"""
+    probe = Clip()
+    setattr(probe, clip_property_name, values[:1])
+    path = []
+    node = probe.to_json()
+    while isinstance(node, dict):
+        (key, node), = node.items()
+        path.append(key)
+    return path
+
+
+def _nested(path: list[str], values: list[Any]) -> JsonSchemaValue:
+    node: Any = values
+    for key in reversed(path):
+        node = {key: node}
+    return node
+
+
+def _at(clip_json: JsonSchemaValue, path: list[str]) -> Any:
+    for key in path:
+        clip_json = clip_json[key]
+    return clip_json
+
+
+def _kind(values: tuple) -> str:
+    if all(type(v) is float for v in values):
+        return "d"
+    if all(type(v) is int and _INT64_MIN <= v <= _INT64_MAX for v in values):
+        return "q"
+    return "json"
+
+
+def _layout(clip: Clip) -> tuple[dict[str, Any], list[tuple[int, bytes | memoryview]]]:
+    """The header and the (offset, bytes) of each column of a clip"""
+    clip_json = clip.to_json()
+    columns: dict[str, Any] = {}
+    blocks: list[tuple[int, bytes | memoryview]] = []
+    offset = 0
+
+    def add(data: bytes | memoryview) -> int:
+        nonlocal offset
+        start = offset
+        blocks.append((start, data))
+        offset = _aligned(offset + len(data))
+        return start
+
+    for clip_property_name in Clip._regular_clip_properties:
+        if (values := getattr(clip, clip_property_name)) is None:
+            continue
+        path = _json_path(clip_property_name, values)
+        column = {"path": path, "kind": _kind(values), "length": len(values)}
+        if column["kind"] == "json":
+            encoded = [json.dumps(v, separators=(",", ":")).encode("utf-8") for v in _at(clip_json, path)]
+            offsets = array('Q', [0])
+            for value in encoded:
+                offsets.append(offsets[-1] + len(value))
+            column["offsets"] = add(memoryview(offsets).cast('B'))
+            column["offset"] = add(b"".join(encoded))
+        else:
+            column["offset"] = add(memoryview(array(column["kind"], values)).cast('B'))
+        columns[clip_property_name] = column
+    header = {"version": _VERSION,
+              "byteorder": sys.byteorder,
+              "frames": clip.frame_count(),
+              "static": clip_json.get("static", {}),
+              "columns": columns}
+    return header, blocks
+
+
+def _write(clip: Clip, allocate: Callable[[int], memoryview]) -> int:
+    """Lay out a clip in a buffer of the size it needs from `allocate`,
+    returning that size"""
+    header, blocks = _layout(clip)
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    data_start = _aligned(_PREFIX.size + len(header_bytes))
+    size = data_start + (blocks[-1][0] + len(blocks[-1][1]) if blocks else 0)
+    buffer = allocate(size)
+    buffer[:_PREFIX.size] = _PREFIX.pack(MAGIC, len(header_bytes))
+    buffer[_PREFIX.size:_PREFIX.size + len(header_bytes)] = header_bytes
+    for offset, data in blocks:
+        start = data_start + offset
+        buffer[start:start + len(data)] = data
+    return size
+
+
+class _Column(Sequence):
+    """The values of a regular parameter of a SharedClipView"""
+
+    def __init__(self, view: "SharedClipView", clip_property_name: str, column: dict[str, Any]):
+        self._view = view
+        self._name = clip_property_name
+        self._path = column["path"]
+        self._kind = column["kind"]
+        self._length = frames = column["length"]
+        start = view._data_start + column["offset"]
+        if self._kind == "json":
+            offsets_start = view._data_start + column["offsets"]
+            self._offsets = view._slice(offsets_start, offsets_start + 8 * (frames + 1)).cast('Q')
+            self._values = view._slice(start, start + self._offsets[frames])
+        else:
+            self._values = view._slice(start, start + 8 * frames).cast(self._kind)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, i: int | slice) -> Any:
+        if isinstance(i, slice):
+            return self._decode(range(*i.indices(len(self))))
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(f"{self._name} index out of range")
+        return self._decode((i,))[0]
+
+    def __iter__(self):
+        return iter(self._decode(range(len(self))))
+
+    def _json(self, indices: range | tuple[int, ...]) -> list[Any]:
+        """The JSON of the values at `indices`"""
+        values = self._values
+        if self._kind != "json":
+            return [values[i] for i in indices]
+        offsets = self._offsets
+        return [json.loads(bytes(values[offsets[i]:offsets[i + 1]])) for i in indices]
+
+    def _decode(self, indices: range | tuple[int, ...]) -> tuple:
+        if self._kind != "json":
+            return tuple(self._values[i] for i in indices)
+        if not (decoded := self._json(indices)):
+            return ()
+        return getattr(Clip.from_json(_nested(self._path, decoded)), self._name)
+
+    def _release(self) -> None:
+        self._values.release()
+        if self._kind == "json":
+            self._offsets.release()
+
+
+class SharedClipView:
+    """A read-only view of a clip laid out by publish() or write_shared().
+    Regular parameters are sequences read from the shared buffer, static
+    parameters are decoded once; to_clip() makes an ordinary Clip of it."""
+
+    def __init__(self, buffer: memoryview, closer: Callable[[], None]):
+        self._buffer = buffer
+        self._closer = closer
+        self._views: list[memoryview] = []
+        magic, header_length = _PREFIX.unpack_from(buffer)
+        if magic != MAGIC:
+            raise ValueError("not a shared camdkit clip")
+        header = json.loads(bytes(buffer[_PREFIX.size:_PREFIX.size + header_length]))
+        if header["version"] != _VERSION:
+            raise ValueError(f"unsupported shared clip version {header['version']}")
+        if header["byteorder"] != sys.byteorder:
+            raise ValueError(f"shared clip was written on a {header['byteorder']}-endian machine")
+        self._frames = header["frames"]
+        self._data_start = _aligned(_PREFIX.size + header_length)
+        self._static_json = header["static"]
+        self._static = Clip.from_json({"static": self._static_json}) if self._static_json else Clip()
+        self._columns = {name: _Column(self, name, column) for name, column in header["columns"].items()}
+
+    def _slice(self, start: int, stop: int) -> memoryview:
+        view = self._buffer[start:stop]
+        self._views.append(view)
+        return view
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if name in self._columns:
+            return self._columns[name]
+        if name in Clip._static_clip_properties:
+            return getattr(self._static, name)
+        if name in Clip._regular_clip_properties:
+            return None
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def frame_count(self) -> int:
+        return self._frames
+
+    def __getitem__(self, i: int) -> Clip:
+        """The ith frame, as a Clip"""
+        return self.to_clip(i, i + 1)
+
+    def to_clip(self, start: int = 0, stop: Optional[int] = None) -> Clip:
+        """An ordinary Clip of the samples from `start` up to `stop`"""
+        clip_json: JsonSchemaValue = {"static": self._static_json} if self._static_json else {}
+        for column in self._columns.values():
+            node = clip_json
+            for key in column._path[:-1]:
+                node = node.setdefault(key, {})
+            node[column._path[-1]] = column._json(range(*slice(start, stop).indices(len(column))))
+        return Clip.from_json(clip_json)
+
+    def close(self) -> None:
+        """Release the buffer; values already read remain valid"""
+        if self._buffer is None:
+            return
+        for column in self._columns.values():
+            column._release()
+        for view in self._views:
+            view.release()
+        self._buffer.release()
+        self._buffer = None
+        self._closer()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class SharedClip:
+    """A clip published in shared memory by publish(). The publisher owns the
+    block: it stays available to attach() until unlink()."""
+
+    def __init__(self, memory: shared_memory.SharedMemory, nbytes: int):
+        self._memory = memory
+        self.nbytes = nbytes
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    def close(self) -> None:
+        self._memory.close()
+
+    def unlink(self) -> None:
+        if sys.version_info < (3, 13):
+            # attach() from a process sharing this one's resource tracker
+            # unregistered the block; unlink() expects it to be registered
+            from multiprocessing import resource_tracker
+            resource_tracker.register(self._memory._name, "shared_memory")
+        self._memory.unlink()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+        self.unlink()
+
+
+def publish(clip: Clip, name: Optional[str] = None) -> SharedClip:
+    """Lay out a clip in a new block of shared memory, by default with a
+    generated name, for other processes to attach()"""
+    memory: Optional[shared_memory.SharedMemory] = None
+
+    def allocate(size: int) -> memoryview:
+        nonlocal memory
+        memory = shared_memory.SharedMemory(name=name, create=True, size=max(size, 1))
+        return memory.buf
+
+    nbytes = _write(clip, allocate)
+    return SharedClip(memory, nbytes)
+
+
+def attach(name: str) -> SharedClipView:
+    """A read-only view of a clip published in shared memory by publish()"""
+    if sys.version_info >= (3, 13):
+        memory = shared_memory.SharedMemory(name=name, track=False)
+    else:
+        memory = shared_memory.SharedMemory(name=name)
+        # before 3.13, attaching registers the block with the resource
+        # tracker, which would unlink it when this process exits
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(memory._name, "shared_memory")
+    return SharedClipView(memory.buf, memory.close)
+
+
+def write_shared(clip: Clip, path: str | os.PathLike) -> Path:
+    """Lay out a clip in a file, through a memory map, for open_shared()"""
+    path = Path(path)
+    with open(path, "w+b") as fp:
+        mapped: Optional[mmap.mmap] = None
+
+        def allocate(size: int) -> memoryview:
+            nonlocal mapped
+            fp.truncate(size)
+            mapped = mmap.mmap(fp.fileno(), size)
+            return memoryview(mapped)
+
+        try:
+            _write(clip, allocate)
+        finally:
+            if mapped is not None:
+                mapped.close()
+    return path
+
+
+def open_shared(path: str | os.PathLike) -> SharedClipView:
+    """A read-only view of a clip written by write_shared()"""
+    with open(path, "rb") as fp:
+        mapped = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+    return SharedClipView(memoryview(mapped), mapped.close)
@@ -0,0 +1,258 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+"""ST-map generation from the lens distortion of a Clip, with caching
+
+An ST-map gives, for each pixel of an output image, the normalized (s, t)
+coordinates of the point of the input image to sample, with s running from
+0 at the left edge to 1 at the right and t from 0 at the bottom edge to 1
+at the top. An undistortion map has the undistorted image as output and the
+distorted (camera) image as input; a distortion map is the reverse.
+
+Consecutive samples usually share the same lens state, and the same state
+recurs whenever a focus puller returns to a mark, so STMapGenerator keeps
+recently generated maps in an LRU cache keyed by the quantized lens state,
+bounded by a memory budget.
+"""
+
+import os
+import math
+import mmap
+import sys
+import dataclasses
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from camdkit.camera_types import PhysicalDimensions
+from camdkit.clip import Clip
+from camdkit.distortion import LensDistortion, sensor_from_normalized, normalized_from_sensor
+
+__all__ = ['UNDISTORT', 'DISTORT', 'STMap', 'CacheStatistics', 'STMapGenerator',
+           'DEFAULT_QUANTUM', 'lens_state', 'write_stmap', 'read_stmap']
+
+UNDISTORT = "undistort"
+DISTORT = "distort"
+
+# bytes per pixel of a two-channel float32 map
+_PIXEL_BYTES = 2 * array('f').itemsize
+
+
+@dataclasses.dataclass(frozen=True)
+class STMap:
+    width: int
+    height: int
+    data: array
+    """Interleaved float32 s and t values, row by row from the top row"""
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.data) * self.data.itemsize
+
+    def __getitem__(self, pixel: tuple[int, int]) -> tuple[float, float]:
+        """(s, t) at (column, row)"""
+        column, row = pixel
+        i = 2 * (row * self.width + column)
+        return self.data[i], self.data[i + 1]
+
+
+@dataclasses.dataclass
+class CacheStatistics:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    nbytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+# Lens states whose terms differ by less than this fraction of the sensor
+# width at its corners share a map: about the resolution of lens encoders,
+# and under half a pixel on a map 4096 pixels wide
+DEFAULT_QUANTUM = 1e-4
+
+
+def _quantize(value: float, quantum: float) -> int:
+    return round(value / quantum)
+
+
+def lens_state(distortion: LensDistortion, dimensions: PhysicalDimensions,
+               focal_length: Optional[float] = None, quantum: float = DEFAULT_QUANTUM) -> tuple:
+    """A hashable key for the lens state on a sensor. Each term is scaled to
+    the largest displacement it causes on the sensor, at its corners, as a
+    fraction of the sensor width, and rounded to a multiple of `quantum`, so
+    that states differing only by encoder noise below that share a map. The
+    focal length is scaled by the sensor width too."""
+    width = dimensions.width
+    # half the diagonal, the largest radius on the sensor
+    corner = math.hypot(dimensions.width, dimensions.height) / 2
+    return (distortion.model,
+            tuple(_quantize(k * corner ** (2 * i + 1) / width, quantum)
+                  for i, k in enumerate(distortion.radial, 1)),
+            tuple(_quantize(3.0 * p * corner * corner / width, quantum) for p in distortion.tangential),
+            tuple(_quantize(c / width, quantum) for c in distortion.distortion_offset),
+            tuple(_quantize(p / width, quantum) for p in distortion.projection_offset),
+            None if focal_length is None else _quantize(focal_length / width, quantum))
+
+
+def _grid(count: int, step: int) -> list[int]:
+    """Indices sampled along an axis: every step-th one and the last one"""
+    indices = list(range(0, count, step))
+    if indices[-1] != count - 1:
+        indices.append(count - 1)
+    return indices
+
+
+class STMapGenerator:
+    """Generator of ST-maps of a fixed size for a sensor, caching the most
+    recently used maps within a memory budget"""
+
+    def __init__(self, width: int, height: int, dimensions: PhysicalDimensions,
+                 direction: str = UNDISTORT,
+                 max_bytes: int = 512 * 1024 * 1024,
+                 quantum: float = DEFAULT_QUANTUM,
+                 step: int = 1):
+        """`width` and `height` are those of the map in pixels, and `dimensions`
+        those of the active sensor area it covers. With `step` greater than
+        one, the distortion is evaluated at every step-th pixel in each
+        direction and interpolated bilinearly between them, which is much
+        faster and, the distortion being smooth, usually accurate enough."""
+        if width < 1 or height < 1:
+            raise ValueError("ST-map width and height must be positive")
+        if direction not in (UNDISTORT, DISTORT):
+            raise ValueError(f"ST-map direction must be '{UNDISTORT}' or '{DISTORT}'")
+        if step < 1:
+            raise ValueError("ST-map step must be positive")
+        self.width = width
+        self.height = height
+        self.dimensions = dimensions
+        self.direction = direction
+        self.max_bytes = max_bytes
+        self.quantum = quantum
+        self.step = step
+        self._cache: OrderedDict[tuple, STMap] = OrderedDict()
+        self._statistics = CacheStatistics()
+
+    def statistics(self) -> CacheStatistics:
+        return dataclasses.replace(self._statistics, entries=len(self._cache))
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self._statistics.nbytes = 0
+
+    def map_for_clip(self, clip: Clip, i: int = 0) -> STMap:
+        """The map for the ith sample of a clip"""
+        focal_length = clip.lens_focal_length[i] if clip.lens_focal_length else None
+        return self.map_for(LensDistortion.from_clip(clip, i), focal_length)
+
+    def map_for(self, distortion: LensDistortion, focal_length: Optional[float] = None) -> STMap:
+        """The map for a lens state. The focal length does not change the map
+        but, being part of the lens state, is part of the cache key."""
+        key = lens_state(distortion, self.dimensions, focal_length, self.quantum)
+        statistics = self._statistics
+        if (stmap := self._cache.get(key)) is not None:
+            self._cache.move_to_end(key)
+            statistics.hits += 1
+            return stmap
+        statistics.misses += 1
+        stmap = self._generate(distortion)
+        if stmap.nbytes <= self.max_bytes:
+            while self._cache and statistics.nbytes + stmap.nbytes > self.max_bytes:
+                _, evicted = self._cache.popitem(last=False)
+                statistics.nbytes -= evicted.nbytes
+                statistics.evictions += 1
+            self._cache[key] = stmap
+            statistics.nbytes += stmap.nbytes
+        return stmap
+
+    def _generate(self, distortion: LensDistortion) -> STMap:
+        width, height, step = self.width, self.height, self.step
+        columns, rows = _grid(width, step), _grid(height, step)
+        us = [(column + 0.5) / width for column in columns] * len(rows)
+        vs = [(row + 0.5) / height for row in rows for _ in columns]
+        xs, ys = sensor_from_normalized(us, vs, self.dimensions)
+        # the output image's coordinates are mapped to the input image's
+        if self.direction == UNDISTORT:
+            xs, ys = distortion.distort(xs, ys)
+        else:
+            xs, ys = distortion.undistort(xs, ys)
+        ss, ts = normalized_from_sensor(xs, ys, self.dimensions)
+        ts = array('d', [1.0 - t for t in ts])
+        if step == 1:
+            data = array('f', bytes(width * height * _PIXEL_BYTES))
+            data[0::2] = array('f', ss)
+            data[1::2] = array('f', ts)
+            return STMap(width, height, data)
+        return STMap(width, height, _interpolated(ss, ts, columns, rows, width, height))
+
+
+def _interpolated(ss: array, ts: array, columns: list[int], rows: list[int],
+                  width: int, height: int) -> array:
+    """Bilinear interpolation of values on a grid of nodes to every pixel"""
+    node_columns = len(columns)
+
+    def spans(nodes: list[int], count: int) -> list[tuple[int, float]]:
+        # for each pixel along an axis, the preceding node and the fraction of
+        # the way to the next one
+        result = []
+        for n in range(len(nodes) - 1):
+            start, end = nodes[n], nodes[n + 1]
+            result.extend((n, (p - start) / (end - start)) for p in range(start, end))
+        result.append((max(len(nodes) - 2, 0), 1.0 if len(nodes) > 1 else 0.0))
+        return result[:count]
+
+    column_spans = spans(columns, width)
+    data = array('f')
+    extend = data.extend
+    for node_row, v in spans(rows, height):
+        top = node_row * node_columns
+        bottom = top + node_columns if len(rows) > 1 else top
+        row = []
+        append = row.append
+        for node_column, u in column_spans:
+            i, j = top + node_column, bottom + node_column
+            i1 = i + 1 if node_columns > 1 else i
+            j1 = j + 1 if node_columns > 1 else j
+            for values in (ss, ts):
+                upper = values[i] + (values[i1] - values[i]) * u
+                lower = values[j] + (values[j1] - values[j]) * u
+                append(upper + (lower - upper) * v)
+        extend(row)
+    return data
+
+
+def write_stmap(stmap: STMap, path: str | os.PathLike) -> Path:
+    """Write a map as a headerless file of little-endian float32 values,
+    interleaved s and t, row by row from the top row, through a memory map"""
+    path = Path(path)
+    data = stmap.data
+    if sys.byteorder != "little":
+        data = array('f', data)
+        data.byteswap()
+    with open(path, "w+b") as fp:
+        fp.truncate(stmap.nbytes)
+        if stmap.nbytes:
+            with mmap.mmap(fp.fileno(), stmap.nbytes) as mapped:
+                mapped[:] = memoryview(data).cast('B')
+    return path
+
+
+def read_stmap(path: str | os.PathLike, width: int, height: int) -> STMap:
+    """Read a map written by write_stmap()"""
+    data = array('f')
+    with open(path, "rb") as fp:
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if len(mapped) != width * height * _PIXEL_BYTES:
+                raise ValueError(f"{path} does not hold a {width}x{height} ST-map")
+            data.frombytes(mapped)
+    if sys.byteorder != "little":
+        data.byteswap()
+    return STMap(width, height, data)
@@ -6,8 +6,12 @@
 
 """Types for modeling of time-related metadata"""
 
+import struct
+import operator
+from array import array
+from bisect import bisect_left
 from enum import Enum, verify, UNIQUE, StrEnum
-from typing import Annotated, Optional
+from typing import Annotated, Iterable, Optional, Self, Sequence
 from fractions import Fraction
 
 from pydantic import Field, field_validator, model_validator
@@ -15,8 +19,10 @@
 from camdkit.compatibility import (CompatibleBaseModel,
                                    NON_NEGATIVE_INTEGER,
                                    STRICTLY_POSITIVE_RATIONAL)
-from camdkit.numeric_types import (rationalize_strictly_and_positively,
+from camdkit.numeric_types import (MAX_UINT_48,
+                                   rationalize_strictly_and_positively,
                                    StrictlyPositiveRational,
+                                   StrictlyPositiveRationalValue,
                                    NonNegative8BitInt,
                                    NonNegativeInt,
                                    NonNegative48BitInt)
@@ -56,6 +62,57 @@ def __init__(self, frameRate: StrictlyPositiveRational, subFrame: int = 0):
     def to_int(self) -> int:
         return Fraction(self.frame_rate.num, self.frame_rate.denom).__ceil__()
 
+    def is_drop_frame(self) -> bool:
+        """Whether timecode at this rate drops frame numbers to keep up with
+        real time, i.e. whether the rate is 30000/1001 or 60000/1001"""
+        return _frame_counting(self)[1] != 0
+
+    def frames_per_day(self) -> int:
+        """Number of distinct timecodes (i.e. frames) from 00:00:00:00 to 23:59:59:xx"""
+        return _frame_counting(self)[2]
+
+
+# Frame rates (as num, denom) of drop-frame timecode, and the frame numbers
+# dropped at the start of each minute not divisible by 10
+_DROP_FRAME_RATES = {(30000, 1001): 2, (60000, 1001): 4}
+
+# (nominal frame rate, frames dropped per minute, frames per day) by (num, denom)
+_FRAME_COUNTING: dict[tuple[int, int], tuple[int, int, int]] = {}
+
+
+def _frame_counting(format: TimecodeFormat) -> tuple[int, int, int]:
+    key = (format.frame_rate.num, format.frame_rate.denom)
+    if (counting := _FRAME_COUNTING.get(key)) is None:
+        nominal = format.to_int()
+        drop = _DROP_FRAME_RATES.get(key, 0)
+        counting = _FRAME_COUNTING[key] = (nominal, drop, 24 * 60 * (60 * nominal - drop) + 24 * 6 * drop)
+    return counting
+
+
+def _to_frames(hours: int, minutes: int, seconds: int, frames: int, nominal: int, drop: int) -> int:
+    total_minutes = 60 * hours + minutes
+    count = (60 * total_minutes + seconds) * nominal + frames
+    if drop:
+        if seconds == 0 and frames < drop and minutes % 10:
+            raise ValueError(f"{hours:02}:{minutes:02}:{seconds:02};{frames:02} is dropped in drop-frame timecode")
+        count -= drop * (total_minutes - total_minutes // 10)
+    return count
+
+
+def _from_frames(count: int, nominal: int, drop: int, frames_per_day: int) -> tuple[int, int, int, int]:
+    count %= frames_per_day
+    if drop:
+        # add back the frame numbers dropped up to this frame
+        frames_per_minute = 60 * nominal - drop
+        tens, remainder = divmod(count, 10 * frames_per_minute + drop)
+        count += 9 * drop * tens
+        if remainder > drop:
+            count += drop * ((remainder - drop) // frames_per_minute)
+    seconds, frames = divmod(count, nominal)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return hours, minutes, seconds, frames
+
 
 class Timecode(CompatibleBaseModel):
     """SMPTE timecode of the sample. Timecode is a standard for labeling
@@ -81,6 +138,98 @@ def check_frames_allowed_by_format(self):
             raise ValueError("The frame number must be less than the frame rate.")
         return self
 
+    def to_frames(self) -> int:
+        """Number of frames since 00:00:00:00, counting drop-frame timecode
+        (at 30000/1001 and 60000/1001) in actual frames; the frame numbers
+        drop-frame timecode skips raise ValueError"""
+        nominal, drop, _ = _frame_counting(self.format)
+        return _to_frames(self.hours, self.minutes, self.seconds, self.frames, nominal, drop)
+
+    @classmethod
+    def from_frames(cls, frame_count: int, format: TimecodeFormat) -> Self:
+        """The timecode of the frame a given number of frames after
+        00:00:00:00, wrapping at 24 hours"""
+        return cls(*_from_frames(frame_count, *_frame_counting(format)), format)
+
+    def __add__(self, frames: int) -> Self:
+        if not isinstance(frames, int):
+            return NotImplemented
+        return Timecode.from_frames(self.to_frames() + frames, self.format)
+
+    def __sub__(self, other: Self | int) -> Self | int:
+        """A timecode the given number of frames earlier, or the number of
+        frames from another timecode of the same format to this one"""
+        if isinstance(other, int):
+            return self + -other
+        if isinstance(other, Timecode):
+            if other.format != self.format:
+                raise ValueError("cannot subtract timecodes of different formats")
+            return self.to_frames() - other.to_frames()
+        return NotImplemented
+
+
+def timecodes_to_frames(timecodes: Sequence[Timecode]) -> array:
+    """Timecode.to_frames() of each of a sequence of timecodes (e.g. a Clip's
+    timing_timecode), as an array of signed 64-bit integers"""
+    counting: dict[int, tuple[int, int, int]] = {}
+    result = array('q', bytes(8 * len(timecodes)))
+    for i, tc in enumerate(timecodes):
+        # formats are nearly always shared between samples, so look them up by identity
+        if (format_counting := counting.get(id(tc.format))) is None:
+            format_counting = counting[id(tc.format)] = _frame_counting(tc.format)
+        nominal, drop, _ = format_counting
+        result[i] = _to_frames(tc.hours, tc.minutes, tc.seconds, tc.frames, nominal, drop)
+    return result
+
+
+def frames_to_timecodes(frame_counts: Sequence[int], format: TimecodeFormat) -> tuple[Timecode, ...]:
+    """Timecode.from_frames() of each of a sequence of frame counts"""
+    counting = _frame_counting(format)
+    return tuple(Timecode(*_from_frames(n, *counting), format) for n in frame_counts)
+
+
+def find_timecode(timecodes: Sequence[Timecode] | array, timecode: Timecode,
+                  assume_sorted: bool = False) -> Optional[int]:
+    """Index of the first sample with the given timecode, or None. The search
+    is binary where the frame counts are non-decreasing. Searching the array
+    returned by timecodes_to_frames() avoids converting the timecodes on each
+    search; with `assume_sorted`, the caller vouches that its frame counts are
+    non-decreasing, which skips checking them, so that each search takes
+    O(log n) rather than O(n) time."""
+    frame_counts = timecodes if isinstance(timecodes, array) else timecodes_to_frames(timecodes)
+    target = timecode.to_frames()
+    if assume_sorted or all(a <= b for a, b in zip(frame_counts, frame_counts[1:])):
+        i = bisect_left(frame_counts, target)
+        return i if i < len(frame_counts) and frame_counts[i] == target else None
+    try:
+        return frame_counts.index(target)
+    except ValueError:
+        return None
+
+
+def timecode_discontinuities(timecodes: Sequence[Timecode] | array,
+                             allow_repeats: bool = False,
+                             frames_per_day: Optional[int] = None) -> list[int]:
+    """Indices of the samples whose timecode does not follow on by one frame
+    from that of the previous sample, allowing for the wrap at midnight.
+    Where the sample rate is a multiple of the timecode rate, `allow_repeats`
+    accepts a timecode equal to the previous one.
+    """
+    if isinstance(timecodes, array):
+        frame_counts = timecodes
+    else:
+        frame_counts = timecodes_to_frames(timecodes)
+        if timecodes and frames_per_day is None:
+            frames_per_day = timecodes[0].format.frames_per_day()
+    result = []
+    for i in range(1, len(frame_counts)):
+        step = frame_counts[i] - frame_counts[i - 1]
+        if frames_per_day is not None:
+            step %= frames_per_day
+        if step != 1 and not (allow_repeats and step == 0):
+            result.append(i)
+    return result
+
 class Timestamp(CompatibleBaseModel):
     seconds: NonNegative48BitInt
     nanoseconds: NonNegativeInt
@@ -91,6 +240,167 @@ def __init__(self, seconds: NonNegativeInt, nanoseconds: NonNegativeInt):
     class Config:
         json_schema_extra = {"units": SECOND}
 
+    def to_nanoseconds(self) -> int:
+        return self.seconds * NANOSECONDS_PER_SECOND + self.nanoseconds
+
+    @classmethod
+    def from_nanoseconds(cls, nanoseconds: int) -> Self:
+        return cls(*divmod(nanoseconds, NANOSECONDS_PER_SECOND))
+
+    def to_ptp(self) -> bytes:
+        """The 10-byte PTP wire format: 48-bit seconds and 32-bit nanoseconds, big-endian"""
+        return _PTP_TIMESTAMP.pack(self.seconds >> 32, self.seconds & 0xFFFFFFFF, self.nanoseconds)
+
+    @classmethod
+    def from_ptp(cls, data: bytes) -> Self:
+        seconds_high, seconds_low, nanoseconds = _PTP_TIMESTAMP.unpack(data)
+        return cls((seconds_high << 32) | seconds_low, nanoseconds)
+
+    def __sub__(self, other: Self) -> int:
+        """Nanoseconds from another timestamp to this one"""
+        if not isinstance(other, Timestamp):
+            return NotImplemented
+        return self.to_nanoseconds() - other.to_nanoseconds()
+
+    def __lt__(self, other: Self) -> bool:
+        if not isinstance(other, Timestamp):
+            return NotImplemented
+        return self.to_nanoseconds() < other.to_nanoseconds()
+
+    def __le__(self, other: Self) -> bool:
+        if not isinstance(other, Timestamp):
+            return NotImplemented
+        return self.to_nanoseconds() <= other.to_nanoseconds()
+
+    def __gt__(self, other: Self) -> bool:
+        if not isinstance(other, Timestamp):
+            return NotImplemented
+        return self.to_nanoseconds() > other.to_nanoseconds()
+
+    def __ge__(self, other: Self) -> bool:
+        if not isinstance(other, Timestamp):
+            return NotImplemented
+        return self.to_nanoseconds() >= other.to_nanoseconds()
+
+
+NANOSECONDS_PER_SECOND = 1_000_000_000
+
+_PTP_TIMESTAMP = struct.Struct(">HII")
+
+
+class TimestampColumn:
+    """A sequence of timestamps packed into an array of signed 64-bit
+    seconds and an array of unsigned 32-bit nanoseconds, i.e. 12 bytes per
+    timestamp rather than a Timestamp model each.
+
+    Time differences are returned as Python ints of nanoseconds, which
+    unlike 64-bit integers cover the full 80-bit range of PTP timestamps.
+    """
+    __slots__ = ('seconds', 'nanoseconds')
+
+    def __init__(self, seconds: Iterable[int] = (), nanoseconds: Iterable[int] = ()):
+        self.seconds = seconds if isinstance(seconds, array) and seconds.typecode == 'q' else array('q', seconds)
+        self.nanoseconds = (nanoseconds if isinstance(nanoseconds, array) and nanoseconds.typecode == 'I'
+                            else array('I', nanoseconds))
+        if len(self.seconds) != len(self.nanoseconds):
+            raise ValueError("seconds and nanoseconds must have the same length")
+        if self.seconds and (min(self.seconds) < 0 or max(self.seconds) > MAX_UINT_48):
+            raise ValueError("timestamp seconds must be unsigned 48-bit integers")
+        if self.nanoseconds and max(self.nanoseconds) >= NANOSECONDS_PER_SECOND:
+            raise ValueError(f"timestamp nanoseconds must be less than {NANOSECONDS_PER_SECOND}")
+
+    @classmethod
+    def from_timestamps(cls, timestamps: Iterable[Timestamp]) -> Self:
+        """Pack e.g. a Clip's timing_sample_timestamp"""
+        timestamps = tuple(timestamps)
+        return cls([t.seconds for t in timestamps], [t.nanoseconds for t in timestamps])
+
+    @classmethod
+    def from_nanoseconds(cls, nanoseconds: Iterable[int]) -> Self:
+        seconds_and_nanoseconds = [divmod(n, NANOSECONDS_PER_SECOND) for n in nanoseconds]
+        return cls([s for s, _ in seconds_and_nanoseconds], [n for _, n in seconds_and_nanoseconds])
+
+    @classmethod
+    def from_ptp(cls, data: bytes) -> Self:
+        """Unpack consecutive 10-byte PTP timestamps"""
+        if len(data) % _PTP_TIMESTAMP.size:
+            raise ValueError(f"PTP timestamp data must be a multiple of {_PTP_TIMESTAMP.size} bytes long")
+        unpacked = list(_PTP_TIMESTAMP.iter_unpack(data))
+        return cls([(high << 32) | low for high, low, _ in unpacked], [n for _, _, n in unpacked])
+
+    def to_timestamps(self) -> tuple[Timestamp, ...]:
+        return tuple(map(Timestamp, self.seconds, self.nanoseconds))
+
+    def to_nanoseconds(self) -> list[int]:
+        return [s * NANOSECONDS_PER_SECOND + n for s, n in zip(self.seconds, self.nanoseconds)]
+
+    def to_ptp(self) -> bytes:
+        """Pack as consecutive 10-byte PTP timestamps"""
+        data = bytearray(_PTP_TIMESTAMP.size * len(self))
+        for offset, s, n in zip(range(0, len(data), _PTP_TIMESTAMP.size), self.seconds, self.nanoseconds):
+            _PTP_TIMESTAMP.pack_into(data, offset, s >> 32, s & 0xFFFFFFFF, n)
+        return bytes(data)
+
+    @property
+    def nbytes(self) -> int:
+        return (self.seconds.itemsize + self.nanoseconds.itemsize) * len(self)
+
+    def __len__(self) -> int:
+        return len(self.seconds)
+
+    def __getitem__(self, i: int | slice) -> Timestamp | Self:
+        if isinstance(i, slice):
+            return TimestampColumn(self.seconds[i], self.nanoseconds[i])
+        return Timestamp(self.seconds[i], self.nanoseconds[i])
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TimestampColumn):
+            return NotImplemented
+        return self.seconds == other.seconds and self.nanoseconds == other.nanoseconds
+
+    def __repr__(self) -> str:
+        return f"TimestampColumn({len(self)} timestamps)"
+
+    def __sub__(self, other: Self | Timestamp) -> list[int]:
+        """Nanoseconds from each timestamp of `other` (or from a single
+        timestamp) to the corresponding timestamp of this column"""
+        if isinstance(other, Timestamp):
+            other_seconds, other_nanoseconds = other.seconds, other.nanoseconds
+            return [(s - other_seconds) * NANOSECONDS_PER_SECOND + (n - other_nanoseconds)
+                    for s, n in zip(self.seconds, self.nanoseconds)]
+        if isinstance(other, TimestampColumn):
+            if len(other) != len(self):
+                raise ValueError("timestamp columns must have the same length")
+            return [(s - t) * NANOSECONDS_PER_SECOND + (n - m)
+                    for s, n, t, m in zip(self.seconds, self.nanoseconds, other.seconds, other.nanoseconds)]
+        return NotImplemented
+
+    def intervals(self) -> list[int]:
+        """Nanoseconds from each timestamp to the next"""
+        nanoseconds = self.to_nanoseconds()
+        return list(map(operator.sub, nanoseconds[1:], nanoseconds))
+
+    def argsort(self) -> list[int]:
+        """Indices that would sort the column, stably"""
+        return sorted(range(len(self)), key=self.to_nanoseconds().__getitem__)
+
+    def sorted(self) -> Self:
+        order = self.argsort()
+        return TimestampColumn([self.seconds[i] for i in order], [self.nanoseconds[i] for i in order])
+
+    def is_sorted(self) -> bool:
+        nanoseconds = self.to_nanoseconds()
+        return all(map(operator.le, nanoseconds, nanoseconds[1:]))
+
+    def _bisect_left(self, timestamp: Timestamp) -> int:
+        seconds, nanoseconds = self.seconds, self.nanoseconds
+        return bisect_left(range(len(self)), (timestamp.seconds, timestamp.nanoseconds),
+                           key=lambda i: (seconds[i], nanoseconds[i]))
+
+    def search(self, start: Timestamp, end: Timestamp) -> range:
+        """Indices of the timestamps t of a sorted column with start <= t < end"""
+        return range(self._bisect_left(start), self._bisect_left(end))
+
 
 @verify(UNIQUE)
 class SynchronizationSource(StrEnum):
@@ -175,7 +485,7 @@ class Timing(CompatibleBaseModel):
     integer (nanoseconds)
     """
 
-    sample_rate: Annotated[tuple[StrictlyPositiveRational, ...] | None,
+    sample_rate: Annotated[tuple[StrictlyPositiveRationalValue, ...] | None,
       Field(alias="sampleRate",
             json_schema_extra={"clip_property": "timing_sample_rate",
                                "constraints": STRICTLY_POSITIVE_RATIONAL})] = None
@@ -241,14 +551,6 @@ class Timing(CompatibleBaseModel):
 seconds and frames with appropriate min/max values.
 """})] = None
 
-    # noinspection PyNestedDecorators
-    @field_validator("sample_rate", mode="before")
-    @classmethod
-    def coerce_sample_rates_to_strictly_positive_rationals(cls, vs):
-        if isinstance(vs, (tuple, list)):
-            return tuple([rationalize_strictly_and_positively(v) for v in vs])
-        return rationalize_strictly_and_positively(vs)
-
 
 class Sampling(Enum):
     STATIC = 'static'
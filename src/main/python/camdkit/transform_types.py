@@ -5,8 +5,10 @@
 # Copyright Contributors to the SMTPE RIS OSVP Metadata Project
 
 """Types for modeling of spatial transforms"""
+import math
+from bisect import bisect_right
 from multiprocessing.context import DefaultContext
-from typing import Optional, Annotated
+from typing import Optional, Annotated, Sequence
 
 from pydantic import Field
 
@@ -46,3 +48,300 @@ class Transform(CompatibleBaseModel):
 
     # Nothing in the original code base initializes Transform objects with
     # positional arguments, thus, no need for one
+
+
+# Composition of transform chains into camera poses
+#
+# A Matrix4 is a 4x4 affine matrix flattened in row-major order into a
+# 16-tuple, acting on column vectors, so that a point p in the space of a
+# transform maps to M p in the space of its parent. Rotations follow the
+# Clip.transforms convention: intrinsic about Z (pan), then X (tilt), then
+# Y (roll), i.e. R = Rz(pan) Rx(tilt) Ry(roll), right-handed, in degrees.
+
+type Matrix4 = tuple[float, float, float, float,
+                     float, float, float, float,
+                     float, float, float, float,
+                     float, float, float, float]
+
+IDENTITY_MATRIX4: Matrix4 = (1.0, 0.0, 0.0, 0.0,
+                             0.0, 1.0, 0.0, 0.0,
+                             0.0, 0.0, 1.0, 0.0,
+                             0.0, 0.0, 0.0, 1.0)
+
+
+def _components(transform: Transform) -> tuple[float, ...]:
+    t = transform.translation
+    r = transform.rotation
+    s = transform.scale
+    return (t.x or 0.0, t.y or 0.0, t.z or 0.0,
+            r.pan or 0.0, r.tilt or 0.0, r.roll or 0.0,
+            1.0 if s is None or s.x is None else s.x,
+            1.0 if s is None or s.y is None else s.y,
+            1.0 if s is None or s.z is None else s.z)
+
+
+def _matrix_from_components(x: float, y: float, z: float,
+                            pan: float, tilt: float, roll: float,
+                            sx: float, sy: float, sz: float) -> Matrix4:
+    a, b, c = math.radians(pan), math.radians(tilt), math.radians(roll)
+    ca, sa = math.cos(a), math.sin(a)
+    cb, sb = math.cos(b), math.sin(b)
+    cc, sc = math.cos(c), math.sin(c)
+    return ((ca * cc - sa * sb * sc) * sx, -sa * cb * sy, (ca * sc + sa * sb * cc) * sz, x,
+            (sa * cc + ca * sb * sc) * sx, ca * cb * sy, (sa * sc - ca * sb * cc) * sz, y,
+            -cb * sc * sx, sb * sy, cb * cc * sz, z,
+            0.0, 0.0, 0.0, 1.0)
+
+
+def transform_to_matrix(transform: Transform) -> Matrix4:
+    """Matrix applying the transform's scale, then its rotation, then its translation"""
+    return _matrix_from_components(*_components(transform))
+
+
+def multiply_matrices(m: Matrix4, n: Matrix4) -> Matrix4:
+    """The product m n, for affine m and n"""
+    m00, m01, m02, m03, m10, m11, m12, m13, m20, m21, m22, m23 = m[:12]
+    n00, n01, n02, n03, n10, n11, n12, n13, n20, n21, n22, n23 = n[:12]
+    return (m00 * n00 + m01 * n10 + m02 * n20, m00 * n01 + m01 * n11 + m02 * n21,
+            m00 * n02 + m01 * n12 + m02 * n22, m00 * n03 + m01 * n13 + m02 * n23 + m03,
+            m10 * n00 + m11 * n10 + m12 * n20, m10 * n01 + m11 * n11 + m12 * n21,
+            m10 * n02 + m11 * n12 + m12 * n22, m10 * n03 + m11 * n13 + m12 * n23 + m13,
+            m20 * n00 + m21 * n10 + m22 * n20, m20 * n01 + m21 * n11 + m22 * n21,
+            m20 * n02 + m21 * n12 + m22 * n22, m20 * n03 + m21 * n13 + m22 * n23 + m23,
+            0.0, 0.0, 0.0, 1.0)
+
+
+def invert_matrix(m: Matrix4) -> Matrix4:
+    """Inverse of an affine matrix; raises ValueError if it is singular (e.g. a zero scale)"""
+    a, b, c, tx, d, e, f, ty, g, h, i, tz = m[:12]
+    co00, co01, co02 = e * i - f * h, f * g - d * i, d * h - e * g
+    det = a * co00 + b * co01 + c * co02
+    if det == 0.0:
+        raise ValueError("cannot invert a singular transform matrix")
+    inv = 1.0 / det
+    r00, r01, r02 = co00 * inv, (c * h - b * i) * inv, (b * f - c * e) * inv
+    r10, r11, r12 = co01 * inv, (a * i - c * g) * inv, (c * d - a * f) * inv
+    r20, r21, r22 = co02 * inv, (b * g - a * h) * inv, (a * e - b * d) * inv
+    return (r00, r01, r02, -(r00 * tx + r01 * ty + r02 * tz),
+            r10, r11, r12, -(r10 * tx + r11 * ty + r12 * tz),
+            r20, r21, r22, -(r20 * tx + r21 * ty + r22 * tz),
+            0.0, 0.0, 0.0, 1.0)
+
+
+def compose_transforms(chain: Sequence[Transform]) -> Matrix4:
+    """Compose a transform chain in order, the first transform being outermost
+    (relative to the stage origin) and the last that of the camera, into the
+    matrix mapping camera space to stage space"""
+    result = IDENTITY_MATRIX4
+    for transform in chain:
+        result = multiply_matrices(result, transform_to_matrix(transform))
+    return result
+
+
+def world_matrices(transforms: Sequence[Sequence[Transform]]) -> tuple[Matrix4, ...]:
+    """Compose the transform chain of every frame of e.g. Clip.transforms into
+    camera-to-stage matrices. Matrices of transforms recurring across frames
+    (a static dolly or crane base, say) are computed once."""
+    cache: dict[tuple[float, ...], Matrix4] = {}
+    result = []
+    for chain in transforms:
+        composed = IDENTITY_MATRIX4
+        for transform in chain:
+            key = _components(transform)
+            if (matrix := cache.get(key)) is None:
+                matrix = cache[key] = _matrix_from_components(*key)
+            composed = multiply_matrices(composed, matrix)
+        result.append(composed)
+    return tuple(result)
+
+
+def inverse_world_matrices(transforms: Sequence[Sequence[Transform]]) -> tuple[Matrix4, ...]:
+    """Stage-to-camera (view) matrices for every frame, the inverses of world_matrices()"""
+    return tuple(invert_matrix(m) for m in world_matrices(transforms))
+
+
+# Quaternions and interpolation of rotations
+#
+# A Quaternion is a unit quaternion (w, x, y, z) representing the same
+# rotation as a Rotator3 under the ZXY intrinsic convention above, i.e.
+# q = qz(pan) qx(tilt) qy(roll). Conversion back to a Rotator3 yields tilt in
+# [-90, 90] and pan and roll in (-180, 180]; any cycles beyond that range in
+# the original Euler angles are lost.
+
+type Quaternion = tuple[float, float, float, float]
+
+# Below this, cos(tilt) is treated as zero and roll folded into pan
+_GIMBAL_LOCK_EPSILON = 1e-9
+
+# Above this dot product, slerp() falls back to normalized linear interpolation
+_SLERP_DOT_THRESHOLD = 0.9995
+
+
+def _quaternion_from_angles(pan: float, tilt: float, roll: float) -> Quaternion:
+    a, b, c = math.radians(pan) / 2, math.radians(tilt) / 2, math.radians(roll) / 2
+    ca, sa = math.cos(a), math.sin(a)
+    cb, sb = math.cos(b), math.sin(b)
+    cc, sc = math.cos(c), math.sin(c)
+    # qz(pan) qx(tilt) = (ca cb, ca sb, sa sb, sa cb), then times qy(roll)
+    w, x, y, z = ca * cb, ca * sb, sa * sb, sa * cb
+    return w * cc - y * sc, x * cc - z * sc, w * sc + y * cc, x * sc + z * cc
+
+
+def _angles_from_quaternion(q: Quaternion) -> tuple[float, float, float]:
+    w, x, y, z = q
+    r21 = 2.0 * (y * z + w * x)
+    if abs(r21) >= 1.0 - _GIMBAL_LOCK_EPSILON:
+        # tilt of +/-90 degrees: only pan + roll (or pan - roll) is determined
+        pan = math.atan2(2.0 * (x * y + w * z), 1.0 - 2.0 * (y * y + z * z))
+        return math.degrees(pan), math.copysign(90.0, r21), 0.0
+    pan = math.atan2(-2.0 * (x * y - w * z), 1.0 - 2.0 * (x * x + z * z))
+    tilt = math.asin(r21)
+    roll = math.atan2(-2.0 * (x * z - w * y), 1.0 - 2.0 * (x * x + y * y))
+    return math.degrees(pan), math.degrees(tilt), math.degrees(roll)
+
+
+def rotator_to_quaternion(rotator: Rotator3) -> Quaternion:
+    return _quaternion_from_angles(rotator.pan or 0.0, rotator.tilt or 0.0, rotator.roll or 0.0)
+
+
+def quaternion_to_rotator(q: Quaternion) -> Rotator3:
+    return Rotator3(*_angles_from_quaternion(q))
+
+
+def rotators_to_quaternions(rotators: Sequence[Rotator3]) -> tuple[Quaternion, ...]:
+    return tuple(_quaternion_from_angles(r.pan or 0.0, r.tilt or 0.0, r.roll or 0.0) for r in rotators)
+
+
+def quaternions_to_rotators(quaternions: Sequence[Quaternion]) -> tuple[Rotator3, ...]:
+    return tuple(Rotator3(*_angles_from_quaternion(q)) for q in quaternions)
+
+
+def multiply_quaternions(p: Quaternion, q: Quaternion) -> Quaternion:
+    """The Hamilton product p q, i.e. rotation q followed by rotation p"""
+    w1, x1, y1, z1 = p
+    w2, x2, y2, z2 = q
+    return (w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2,
+            w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
+            w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2,
+            w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2)
+
+
+def nlerp(q0: Quaternion, q1: Quaternion, t: float) -> Quaternion:
+    """Normalized linear interpolation along the shorter arc; cheaper than
+    slerp() but not constant angular velocity"""
+    if q0[0] * q1[0] + q0[1] * q1[1] + q0[2] * q1[2] + q0[3] * q1[3] < 0.0:
+        q1 = (-q1[0], -q1[1], -q1[2], -q1[3])
+    w, x, y, z = (a + (b - a) * t for a, b in zip(q0, q1))
+    norm = math.sqrt(w * w + x * x + y * y + z * z)
+    return w / norm, x / norm, y / norm, z / norm
+
+
+def slerp(q0: Quaternion, q1: Quaternion, t: float) -> Quaternion:
+    """Spherical linear interpolation along the shorter arc"""
+    dot = q0[0] * q1[0] + q0[1] * q1[1] + q0[2] * q1[2] + q0[3] * q1[3]
+    if dot < 0.0:
+        q1, dot = (-q1[0], -q1[1], -q1[2], -q1[3]), -dot
+    if dot > _SLERP_DOT_THRESHOLD:
+        return nlerp(q0, q1, t)
+    theta = math.acos(dot)
+    sin_theta = math.sin(theta)
+    s0 = math.sin((1.0 - t) * theta) / sin_theta
+    s1 = math.sin(t * theta) / sin_theta
+    return tuple(s0 * a + s1 * b for a, b in zip(q0, q1))
+
+
+def _nearest_turn(angle: float, reference: float) -> float:
+    """angle plus the multiple of 360 degrees bringing it nearest reference"""
+    return angle + 360.0 * round((reference - angle) / 360.0)
+
+
+def _interpolate_transform(t0: Transform, t1: Transform, u: float, interpolate) -> Transform:
+    def lerp(a: float, b: float) -> float:
+        return a + (b - a) * u
+
+    c0, c1 = _components(t0), _components(t1)
+    pan, tilt, roll = _angles_from_quaternion(interpolate(_quaternion_from_angles(*c0[3:6]),
+                                                          _quaternion_from_angles(*c1[3:6]), u))
+    # keep Euler cycles: pick the turn nearest the linear interpolation of the inputs
+    pan = _nearest_turn(pan, lerp(c0[3], c1[3]))
+    roll = _nearest_turn(roll, lerp(c0[5], c1[5]))
+    scale = None
+    if t0.scale is not None or t1.scale is not None:
+        scale = Vector3(lerp(c0[6], c1[6]), lerp(c0[7], c1[7]), lerp(c0[8], c1[8]))
+    return Transform(translation=Vector3(lerp(c0[0], c1[0]), lerp(c0[1], c1[1]), lerp(c0[2], c1[2])),
+                     rotation=Rotator3(pan, tilt, roll),
+                     scale=scale,
+                     id=t0.id)
+
+
+def interpolate_transforms(chain0: Sequence[Transform],
+                           chain1: Sequence[Transform],
+                           u: float,
+                           method: str = "slerp") -> tuple[Transform, ...]:
+    """Interpolate a fraction `u` of the way between two transform chains.
+    Translations and scales are interpolated linearly and rotations by
+    `method`, "slerp" or "nlerp". Chains differing in length or transform ids
+    cannot be interpolated, and the nearer of the two is returned instead.
+    """
+    if len(chain0) != len(chain1) or any(a.id != b.id for a, b in zip(chain0, chain1)):
+        return tuple(chain0 if u < 0.5 else chain1)
+    interpolate = {"slerp": slerp, "nlerp": nlerp}[method]
+    return tuple(_interpolate_transform(a, b, u, interpolate) for a, b in zip(chain0, chain1))
+
+
+def resample_transforms(times: Sequence[float],
+                        transforms: Sequence[Sequence[Transform]],
+                        new_times: Sequence[float],
+                        method: str = "slerp") -> tuple[tuple[Transform, ...], ...]:
+    """Resample per-frame transform chains (e.g. Clip.transforms) sampled at
+    increasing `times` onto `new_times`, in the same units, with
+    interpolate_transforms(). New times outside the sampled range take the
+    nearest end sample.
+    """
+    if len(times) != len(transforms):
+        raise ValueError("times and transforms must have the same length")
+    if not times:
+        raise ValueError("cannot resample an empty sequence of transforms")
+    last = len(times) - 1
+    result = []
+    for new_time in new_times:
+        i = bisect_right(times, new_time) - 1
+        if i < 0:
+            result.append(tuple(transforms[0]))
+        elif i >= last or times[i] == new_time:
+            result.append(tuple(transforms[min(i, last)]))
+        else:
+            u = (new_time - times[i]) / (times[i + 1] - times[i])
+            result.append(interpolate_transforms(transforms[i], transforms[i + 1], u, method))
+    return tuple(result)
+
+
+def _quaternion_from_matrix(m: Matrix4) -> Quaternion:
+    # normalize the columns to remove any scale, then Shepperd's method
+    sx = math.sqrt(m[0] * m[0] + m[4] * m[4] + m[8] * m[8]) or 1.0
+    sy = math.sqrt(m[1] * m[1] + m[5] * m[5] + m[9] * m[9]) or 1.0
+    sz = math.sqrt(m[2] * m[2] + m[6] * m[6] + m[10] * m[10]) or 1.0
+    r00, r01, r02 = m[0] / sx, m[1] / sy, m[2] / sz
+    r10, r11, r12 = m[4] / sx, m[5] / sy, m[6] / sz
+    r20, r21, r22 = m[8] / sx, m[9] / sy, m[10] / sz
+    trace = r00 + r11 + r22
+    if trace > 0.0:
+        s = 2.0 * math.sqrt(trace + 1.0)
+        q = (0.25 * s, (r21 - r12) / s, (r02 - r20) / s, (r10 - r01) / s)
+    elif r00 > r11 and r00 > r22:
+        s = 2.0 * math.sqrt(1.0 + r00 - r11 - r22)
+        q = ((r21 - r12) / s, 0.25 * s, (r01 + r10) / s, (r02 + r20) / s)
+    elif r11 > r22:
+        s = 2.0 * math.sqrt(1.0 + r11 - r00 - r22)
+        q = ((r02 - r20) / s, (r01 + r10) / s, 0.25 * s, (r12 + r21) / s)
+    else:
+        s = 2.0 * math.sqrt(1.0 + r22 - r00 - r11)
+        q = ((r10 - r01) / s, (r02 + r20) / s, (r12 + r21) / s, 0.25 * s)
+    return q if q[0] >= 0.0 else (-q[0], -q[1], -q[2], -q[3])
+
+
+def world_poses(transforms: Sequence[Sequence[Transform]]) -> tuple[tuple[tuple[float, float, float],
+                                                                           Quaternion], ...]:
+    """Camera position (x, y, z) and orientation quaternion relative to the
+    stage origin for every frame of e.g. Clip.transforms"""
+    return tuple(((m[3], m[7], m[11]), _quaternion_from_matrix(m)) for m in world_matrices(transforms))
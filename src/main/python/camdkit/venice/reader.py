@@ -133,17 +133,9 @@ def t_number_from_frac_stop(frac_stop_str: str) -> typing.Optional[float]:
 def int_or_none(value: typing.Optional[str]) -> typing.Optional[int]:
   return int(value) if value is not None else None
 
-def to_clip(static_file: typing.IO, dynamic_file: typing.IO) -> camdkit.model.Clip:
-  """Read Sony Venice camera metadata into a `Clip`.
-  `static_file`: Static camera metadata. XML file.
-  `dynamic_file`: Per-frame camera metadata. CSV file
-  """
-
-  # read clip metadata
+def _clip_from_static(clip_metadata: ET.ElementTree) -> tuple[camdkit.model.Clip, int, Fraction]:
   clip = camdkit.model.Clip()
 
-  clip_metadata = ET.parse(static_file)
-
   clip.iso = int_or_none(find_value(clip_metadata, "ISOSensitivity"))
 
   clip.lens_serial_number = find_value(clip_metadata, "LensAttributes")
@@ -182,14 +174,33 @@ def to_clip(static_file: typing.IO, dynamic_file: typing.IO) -> camdkit.model.Cl
         height=pix_dims.height * pixel_pitch / 1000.0
       )
 
+  clip.duration = n_frames/clip_fps
+
+  return clip, n_frames, clip_fps
+
+def to_static(static_file: typing.IO) -> camdkit.model.Static:
+  """Read only the static Sony Venice camera metadata, without reading any
+  per-frame metadata.
+  `static_file`: Static camera metadata. XML file.
+  """
+  clip, _, _ = _clip_from_static(ET.parse(static_file))
+  return clip.static
+
+def to_clip(static_file: typing.IO, dynamic_file: typing.IO) -> camdkit.model.Clip:
+  """Read Sony Venice camera metadata into a `Clip`.
+  `static_file`: Static camera metadata. XML file.
+  `dynamic_file`: Per-frame camera metadata. CSV file
+  """
+
+  # read clip metadata
+  clip, n_frames, clip_fps = _clip_from_static(ET.parse(static_file))
+
   # read frame metadata
   csv_data = list(csv.DictReader(dynamic_file))
 
   if len(csv_data) != n_frames:
     raise ValueError(f"Inconsistent frame count between header {n_frames} and frame {len(csv_data)} files")
 
-  clip.duration = len(csv_data)/clip_fps
-
   clip.lens_focal_length = tuple(float(m["Focal Length (mm)"]) for m in csv_data)
 
   clip.lens_focus_distance = tuple(float(m["Focus Distance (ft)"]) * 12.0 * 25.4 / 1000.0 for m in csv_data)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+"""Benchmark of parallel validation and loading of clip JSON against
+Clip.from_json(), for each number of workers up to the number of CPUs
+
+Run from the top of the repo:
+
+    PYTHONPATH=src/main/python python src/test/benchmarks/bench_parallel_json.py --repeat 50
+
+The clip is the first frames of the Mo-Sys test resource, repeated; its
+transforms, timecodes and distortion vary from frame to frame, so compact
+little when sent back from the workers.
+
+The work left in the parent process (splitting the JSON, then unpickling and
+concatenating the chunk Clips) is also timed, which bounds the speedup of
+loading on any number of CPUs, including more than this machine has.
+"""
+
+import os
+import sys
+import json
+import pickle
+import timeit
+import argparse
+from typing import Optional
+
+from camdkit.clip import Clip
+from camdkit.mosys import reader
+from camdkit.parallel import from_json_parallel, validate_clip_json, split_json, _chunk_size
+from camdkit.pipeline import concatenate
+from camdkit.rle import _map_regular
+
+MOSYS_PATH = "src/test/resources/mosys/A003_C001_01 15-03-47-01.f4"
+MOSYS_FRAMES = 200
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="parallel clip JSON validation benchmark")
+    parser.add_argument("--repeat", type=int, default=25,
+                        help=f"Number of times the first {MOSYS_FRAMES} Mo-Sys frames are repeated (default: 25)")
+    args = parser.parse_args(argv)
+
+    clip_json = reader.to_clip(MOSYS_PATH, MOSYS_FRAMES - 1).to_json()
+    clip_json = json.loads(json.dumps(_map_regular(clip_json, lambda values: tuple(values) * args.repeat)))
+    serial = best_of(lambda: Clip.from_json(clip_json))
+    print(f"{MOSYS_FRAMES * args.repeat} frames, Clip.from_json(): {serial:.3f} s")
+    for cpus in (8, 16):
+        chunk_size = _chunk_size(MOSYS_FRAMES * args.repeat, cpus)
+        pickled = []
+        for _, chunk_json in split_json(clip_json, chunk_size):
+            chunk = Clip.from_json(chunk_json)
+            chunk.compact()
+            pickled.append(pickle.dumps(chunk))
+        parent = best_of(lambda: (list(split_json(clip_json, chunk_size)),
+                                  concatenate([pickle.loads(p) for p in pickled])))
+        print(f"work in the parent for {cpus} workers: {parent:.3f} s,"
+              f" so loading is at most {serial / parent:.1f} times faster")
+    print(f"{'workers':>8} {'validate (s)':>13} {'speedup':>8} {'load (s)':>9} {'speedup':>8}")
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        validate = best_of(lambda: validate_clip_json(clip_json, workers))
+        load = best_of(lambda: from_json_parallel(clip_json, workers))
+        print(f"{workers:>8} {validate:>13.3f} {serial / validate:>8.2f} {load:>9.3f} {serial / load:>8.2f}")
+        workers *= 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+"""Benchmark of the StrictlyPositiveRational model against the
+StrictlyPositiveRationalValue value type, for per-frame sample rates
+
+Run from the top of the repo:
+
+    PYTHONPATH=src/main/python python src/test/benchmarks/bench_rational.py
+"""
+
+import sys
+import timeit
+import tracemalloc
+
+from pydantic import TypeAdapter
+
+from camdkit.numeric_types import StrictlyPositiveRational, StrictlyPositiveRationalValue
+
+FRAMES = 100_000
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+
+def allocated_bytes(fn) -> int:
+    tracemalloc.start()
+    kept = fn()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def main() -> int:
+    as_json = [{"num": 24000, "denom": 1001}] * FRAMES
+    models = TypeAdapter(tuple[StrictlyPositiveRational, ...])
+    values = TypeAdapter(tuple[StrictlyPositiveRationalValue, ...])
+    model_data, value_data = models.validate_python(as_json), values.validate_python(as_json)
+    cases = (
+        ("construction",
+         lambda: [StrictlyPositiveRational(24000, 1001) for _ in range(FRAMES)],
+         lambda: [StrictlyPositiveRationalValue(24000, 1001) for _ in range(FRAMES)]),
+        ("validation from JSON",
+         lambda: models.validate_python(as_json),
+         lambda: values.validate_python(as_json)),
+        ("serialization to JSON",
+         lambda: models.dump_python(model_data),
+         lambda: values.dump_python(value_data)),
+        ("frame durations (1 / rate)",
+         lambda: [1 / r for r in model_data],
+         lambda: [1 / r for r in value_data]))
+
+    print(f"{FRAMES} frames of 24000/1001")
+    print(f"{'':32} {'model':>12} {'value':>12}")
+    for label, model_fn, value_fn in cases:
+        print(f"{label + ' (ms)':32} {best_of(model_fn) * 1000:>12.1f} {best_of(value_fn) * 1000:>12.1f}")
+    model_bytes = allocated_bytes(cases[0][1])
+    value_bytes = allocated_bytes(cases[0][2])
+    print(f"{'memory (bytes per frame)':32} {model_bytes / FRAMES:>12.1f} {value_bytes / FRAMES:>12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
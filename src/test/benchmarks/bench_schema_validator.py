@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+"""Benchmark of the compiled OpenTrackIO sample validator against jsonschema
+
+Run from the top of the repo:
+
+    PYTHONPATH=src/main/python python src/test/benchmarks/bench_schema_validator.py
+"""
+
+import sys
+import json
+import timeit
+
+import jsonschema
+
+from camdkit.clip import Clip
+from camdkit.examples import _get_recommended_dynamic_clip, _get_complete_dynamic_clip
+from camdkit.schema_validator import sample_from_frame, sample_validator
+
+
+def per_second(fn, number: int) -> float:
+    return number / min(timeit.repeat(fn, number=number, repeat=3))
+
+
+def main() -> int:
+    schema = Clip.make_json_schema()
+    compiled = sample_validator()
+    prebuilt = jsonschema.validators.validator_for(schema)(schema)
+    print(f"{'samples/s':24} {'compiled':>12} {'jsonschema':>12} {'validate()':>12}")
+    for label, clip in (("recommended", _get_recommended_dynamic_clip()),
+                        ("complete", _get_complete_dynamic_clip())):
+        sample = json.loads(json.dumps(sample_from_frame(next(iter(clip.frames_to_json())))))
+        print(f"{label:24}"
+              f" {per_second(lambda: compiled(sample), 2000):>12.0f}"
+              f" {per_second(lambda: prebuilt.validate(sample), 100):>12.0f}"
+              f" {per_second(lambda: jsonschema.validate(sample, schema), 5):>12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
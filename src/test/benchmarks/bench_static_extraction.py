@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+"""Benchmark of header-only static metadata extraction against full reads
+
+Run from the top of the repo:
+
+    PYTHONPATH=src/main/python python src/test/benchmarks/bench_static_extraction.py
+
+to_static() times should stay flat as the number of frames grows, while
+to_clip() times grow with it.
+"""
+
+import sys
+import timeit
+import tempfile
+from pathlib import Path
+
+from scaled_resources import SCALERS
+
+from camdkit.registry import read_clip, read_static
+
+VENDORS = ('arri', 'canon', 'red', 'venice')
+FACTORS = (1, 10, 100)
+
+
+def best_of(fn, repeat: int = 5) -> float:
+    return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+
+def main() -> int:
+    print(f"{'vendor':8} {'frames':>8} {'to_static (ms)':>15} {'to_clip (ms)':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for vendor in VENDORS:
+            for factor in FACTORS:
+                directory = Path(tmp) / f"{vendor}_{factor}"
+                directory.mkdir()
+                paths = SCALERS[vendor](directory, factor)
+                frames = read_clip(vendor, paths).frame_count()
+                static_seconds = best_of(lambda: read_static(vendor, paths))
+                clip_seconds = best_of(lambda: read_clip(vendor, paths), repeat=1)
+                print(f"{vendor:8} {frames:>8} {static_seconds * 1000:>15.2f} {clip_seconds * 1000:>13.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
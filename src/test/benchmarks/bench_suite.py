@@ -0,0 +1,308 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+"""Benchmark suite: vendor readers, Clip operations, serialization, schema
+generation and import time
+
+Run from the top of the repo, saving the results as JSON:
+
+    PYTHONPATH=src/main/python python src/test/benchmarks/bench_suite.py run -o before.json
+
+and after a change compare two sets of results, which exits with status 1
+if any benchmark got slower (or used more memory) by more than the threshold:
+
+    PYTHONPATH=src/main/python python src/test/benchmarks/bench_suite.py compare before.json after.json
+
+Each benchmark reports the best of several wall-clock times and, from a
+separate run under tracemalloc, the peak memory allocated while it ran. The
+memory footprint of each parameter of the clips read (Clip.memory_report())
+is recorded too, and compared parameter by parameter.
+"""
+
+import sys
+import json
+import timeit
+import argparse
+import platform
+import tempfile
+import importlib
+import subprocess
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+from scaled_resources import SCALERS
+
+from camdkit.clip import Clip
+from camdkit.registry import READERS, read_clip
+
+FORMAT_VERSION = 2
+
+# The Mo-Sys F4 test resource holds a frame with a negative focal length after
+# its first 400 or so frames, so it is not scaled and only its first frames are
+# read; the F4 reader appends one frame at a time, so fewer still suffice
+MOSYS_FRAMES = 100
+
+# Clip operations are timed, and memory reported, on this vendor's test
+# resource scaled by the --factor of the run
+CLIP_VENDOR = 'venice'
+
+_IMPORT_SCRIPT = """
+import time, tracemalloc
+tracemalloc.start()
+start = time.perf_counter()
+import camdkit.clip
+print(time.perf_counter() - start, tracemalloc.get_traced_memory()[1])
+"""
+
+type Benchmark = tuple[str, Callable[[], Any], dict[str, Any]]
+
+
+def best_of(fn: Callable[[], Any], repeat: int) -> float:
+    return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+
+def peak_bytes(fn: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _reader_benchmarks(directory: Path, factor: int) -> Iterator[Benchmark]:
+    for vendor, scaler in sorted(SCALERS.items()):
+        vendor_directory = directory / vendor
+        vendor_directory.mkdir()
+        if vendor == 'mosys':
+            paths = scaler(vendor_directory, 1)
+            reader = importlib.import_module(READERS[vendor].module)
+            fn = lambda path=paths[0]: reader.to_clip(path, MOSYS_FRAMES)
+        else:
+            paths = scaler(vendor_directory, factor)
+            fn = lambda vendor=vendor, paths=paths: read_clip(vendor, paths)
+        yield f"reader/{vendor}", fn, {}
+
+
+def _clip_benchmarks(directory: Path, factor: int) -> Iterator[Benchmark]:
+    clip_directory = directory / "clip"
+    clip_directory.mkdir()
+    clip = read_clip(CLIP_VENDOR, SCALERS[CLIP_VENDOR](clip_directory, factor))
+    frames = clip.frame_count()
+    middle = frames // 2
+    frame = clip[middle]
+    clip_json = clip.to_json()
+    info = {"frames": frames}
+
+    def append():
+        copy = clip.model_copy()
+        copy.append(frame)
+
+    yield "clip/append", append, info
+    yield "clip/getitem", lambda: clip[middle], info
+    yield "clip/to_json(i)", lambda: clip.to_json(middle), info
+    yield "clip/to_json", lambda: clip.to_json(), info
+    yield "clip/from_json", lambda: Clip.from_json(clip_json), info
+    yield "clip/frames_to_json", lambda: list(clip.frames_to_json()), info
+
+
+def _memory_reports(directory: Path, factor: int,
+                    selected: Callable[[str], bool]) -> Iterator[tuple[str, Clip]]:
+    """The clips whose memory footprint is recorded: the clip used for the
+    clip operations, also once compacted, and the Mo-Sys clip; only those
+    whose names are selected are read"""
+    memory_directory = directory / "memory"
+    memory_directory.mkdir()
+    plain, compact = f"memory/{CLIP_VENDOR}", f"memory/{CLIP_VENDOR}.compact"
+    if selected(plain) or selected(compact):
+        clip = read_clip(CLIP_VENDOR, SCALERS[CLIP_VENDOR](memory_directory, factor))
+        if selected(plain):
+            yield plain, clip
+        if selected(compact):
+            compacted = clip.model_copy(deep=True)
+            compacted.compact()
+            yield compact, compacted
+    if selected("memory/mosys"):
+        reader = importlib.import_module(READERS['mosys'].module)
+        mosys_directory = memory_directory / "mosys"
+        mosys_directory.mkdir()
+        yield "memory/mosys", reader.to_clip(SCALERS['mosys'](mosys_directory, 1)[0], MOSYS_FRAMES)
+
+
+def _memory_result(clip: Clip) -> dict[str, Any]:
+    report = clip.memory_report()
+    return {"deep_bytes": report.total_bytes,
+            "best_bytes": report.best_bytes,
+            "objects": report.total_objects,
+            "frames": report.frames,
+            "parameters": {p.name: p.deep_bytes for p in report.parameters}}
+
+
+def _schema_benchmarks() -> Iterator[Benchmark]:
+    yield "schema/make_json_schema", lambda: Clip.make_json_schema(), {}
+
+
+def _import_time(repeat: int) -> dict[str, Any]:
+    """Time and peak memory of importing camdkit.clip in a fresh interpreter"""
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", _IMPORT_SCRIPT], check=True,
+                                capture_output=True, text=True).stdout.split()
+        runs.append((float(output[0]), int(output[1])))
+    return {"seconds": min(r[0] for r in runs), "peak_bytes": min(r[1] for r in runs)}
+
+
+def run(factor: int, repeat: int, only: Optional[str] = None) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+
+    def selected(name: str) -> bool:
+        return not only or only in name
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        benchmarks = [*_reader_benchmarks(directory, factor),
+                      *_clip_benchmarks(directory, factor),
+                      *_schema_benchmarks()]
+        for name, fn, info in benchmarks:
+            if not selected(name):
+                continue
+            print(name, file=sys.stderr)
+            try:
+                results[name] = {"seconds": best_of(fn, repeat), "peak_bytes": peak_bytes(fn), **info}
+            except Exception as e:
+                results[name] = {"error": f"{type(e).__name__}: {e}"}
+        for name, clip in _memory_reports(directory, factor, selected):
+            print(name, file=sys.stderr)
+            results[name] = _memory_result(clip)
+    if selected("import/camdkit.clip"):
+        print("import/camdkit.clip", file=sys.stderr)
+        results["import/camdkit.clip"] = _import_time(repeat)
+    return {"format_version": FORMAT_VERSION,
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "factor": factor,
+            "repeat": repeat,
+            "results": results}
+
+
+def compare(before: dict[str, Any], after: dict[str, Any], threshold: float) -> list[str]:
+    """Print a comparison of two runs, returning the names of benchmarks
+    whose time or peak memory grew by more than `threshold` (a fraction), or
+    that fail or are missing in the later run but not the earlier one"""
+    regressions = []
+    if before.get("factor") != after.get("factor"):
+        print(f"warning: runs used different scale factors ({before.get('factor')} and {after.get('factor')})")
+    print(f"{'benchmark':28} {'before (ms)':>12} {'after (ms)':>12} {'ratio':>7}"
+          f" {'before (KiB)':>13} {'after (KiB)':>13} {'ratio':>7}")
+    memory_names = []
+    for name in sorted(before["results"].keys() | after["results"].keys()):
+        old, new = before["results"].get(name), after["results"].get(name)
+        if name.startswith("memory/"):
+            memory_names.append(name)
+            continue
+        if not old or not new or "error" in old or "error" in new:
+            status = _status(old, new)
+            regressed = _newly_broken(old, new)
+            if regressed:
+                regressions.append(name)
+            print(f"{name:28} {status:>12}{'  REGRESSION' if regressed else ''}")
+            continue
+        time_ratio = new["seconds"] / old["seconds"] if old["seconds"] else float("inf")
+        memory_ratio = new["peak_bytes"] / old["peak_bytes"] if old["peak_bytes"] else float("inf")
+        regressed = time_ratio > 1.0 + threshold or memory_ratio > 1.0 + threshold
+        if regressed:
+            regressions.append(name)
+        print(f"{name:28} {old['seconds'] * 1000:>12.2f} {new['seconds'] * 1000:>12.2f} {time_ratio:>7.2f}"
+              f" {old['peak_bytes'] / 1024:>13.1f} {new['peak_bytes'] / 1024:>13.1f} {memory_ratio:>7.2f}"
+              f"{'  REGRESSION' if regressed else ''}")
+    for name in memory_names:
+        regressions.extend(_compare_memory(name, before["results"].get(name), after["results"].get(name),
+                                           threshold))
+    return regressions
+
+
+def _status(old: Optional[dict[str, Any]], new: Optional[dict[str, Any]]) -> str:
+    if (old and "error" in old) or (new and "error" in new):
+        return "error"
+    return "new" if new else "missing"
+
+
+def _newly_broken(old: Optional[dict[str, Any]], new: Optional[dict[str, Any]]) -> bool:
+    """Whether a benchmark that ran in the earlier run is missing or failed
+    in the later one"""
+    return bool(old) and "error" not in old and (not new or "error" in new)
+
+
+def _compare_memory(name: str, old: Optional[dict[str, Any]], new: Optional[dict[str, Any]],
+                    threshold: float) -> list[str]:
+    """Print the deep size of a clip and of each of its parameters before and
+    after, returning the names of those that grew by more than `threshold`"""
+    print()
+    if not old or not new or "error" in old or "error" in new:
+        status = _status(old, new)
+        regressed = _newly_broken(old, new)
+        print(f"{name:40} {status:>12}{'  REGRESSION' if regressed else ''}")
+        return [name] if regressed else []
+    regressions = []
+    print(f"{name + ' (KiB)':40} {'before':>12} {'after':>12} {'ratio':>7}")
+    rows = [("total", old["deep_bytes"], new["deep_bytes"])]
+    rows.extend((parameter, old["parameters"].get(parameter), new["parameters"].get(parameter))
+                for parameter in sorted(old["parameters"].keys() | new["parameters"].keys()))
+    for parameter, before_bytes, after_bytes in rows:
+        if before_bytes is None or after_bytes is None:
+            print(f"  {parameter:38} {'-' if before_bytes is None else f'{before_bytes / 1024:.1f}':>12}"
+                  f" {'-' if after_bytes is None else f'{after_bytes / 1024:.1f}':>12}")
+            continue
+        ratio = after_bytes / before_bytes if before_bytes else float("inf")
+        regressed = ratio > 1.0 + threshold
+        if regressed:
+            regressions.append(f"{name}/{parameter}")
+        print(f"  {parameter:38} {before_bytes / 1024:>12.1f} {after_bytes / 1024:>12.1f} {ratio:>7.2f}"
+              f"{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="camdkit benchmark suite")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="Run the benchmarks and write the results as JSON")
+    run_parser.add_argument("-o", "--output", type=str, default=None,
+                            help="Path of the JSON results (default: standard output)")
+    run_parser.add_argument("--factor", type=int, default=10,
+                            help="Scale factor applied to the reader test resources (default: 10)")
+    run_parser.add_argument("--repeat", type=int, default=3,
+                            help="Number of timed runs of each benchmark, of which the best is kept (default: 3)")
+    run_parser.add_argument("--only", type=str, default=None,
+                            help="Run only the benchmarks whose names contain this string")
+    compare_parser = commands.add_parser("compare", help="Compare two sets of results")
+    compare_parser.add_argument("before", type=str)
+    compare_parser.add_argument("after", type=str)
+    compare_parser.add_argument("--threshold", type=float, default=0.1,
+                                help="Fractional increase in time or memory counted as a regression (default: 0.1)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        results = run(args.factor, args.repeat, args.only)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as fp:
+                json.dump(results, fp, indent=2)
+        else:
+            json.dump(results, sys.stdout, indent=2)
+            print()
+        return 0
+    with open(args.before, "r", encoding="utf-8") as fp:
+        before = json.load(fp)
+    with open(args.after, "r", encoding="utf-8") as fp:
+        after = json.load(fp)
+    return 1 if compare(before, after, args.threshold) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
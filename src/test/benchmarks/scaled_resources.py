@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+"""Scaled-up copies of the reader test resources, for benchmarking
+
+Each function writes a copy of the vendor's test resources into a directory,
+with the per-frame data repeated `factor` times (and any frame count in the
+static metadata adjusted to match), and returns the paths of the copies in
+the order the vendor's to_clip() takes them.
+"""
+
+import re
+import csv
+import io
+from pathlib import Path
+
+RESOURCES = Path("src/test/resources")
+
+
+def _repeat_csv_rows(src: Path, dst: Path, factor: int, dialect: str = "excel") -> int:
+    with open(src, "r", encoding="utf-8", newline="") as fp:
+        header, *rows = list(csv.reader(fp, dialect=dialect))
+    with open(dst, "w", encoding="utf-8", newline="") as fp:
+        writer = csv.writer(fp, dialect=dialect)
+        writer.writerow(header)
+        for _ in range(factor):
+            writer.writerows(rows)
+    return len(rows) * factor
+
+
+def scale_arri(directory: Path, factor: int) -> tuple[str, ...]:
+    dst = directory / "B001C001_180327_R1ZA.mov.csv"
+    _repeat_csv_rows(RESOURCES / "arri" / dst.name, dst, factor, "excel-tab")
+    return str(dst),
+
+
+def scale_canon(directory: Path, factor: int) -> tuple[str, ...]:
+    static = directory / "20221007_TNumber_CanonCameraMetadata_Static.csv"
+    frames = directory / "20221007_TNumber_CanonCameraMetadata_Frames.csv"
+    static.write_bytes((RESOURCES / "canon" / static.name).read_bytes())
+    _repeat_csv_rows(RESOURCES / "canon" / frames.name, frames, factor)
+    return str(static), str(frames)
+
+
+def scale_red(directory: Path, factor: int) -> tuple[str, ...]:
+    static = directory / "A001_C066_0303LZ_001.static.csv"
+    frames = directory / "A001_C066_0303LZ_001.frames.csv"
+    n_frames = _repeat_csv_rows(RESOURCES / "red" / frames.name, frames, factor)
+    with open(RESOURCES / "red" / static.name, "r", encoding="utf-8", newline="") as fp:
+        rows = list(csv.DictReader(fp))
+    rows[0]["Total Frames"] = str(n_frames)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(rows[0]))
+    writer.writeheader()
+    writer.writerows(rows)
+    static.write_text(buffer.getvalue(), encoding="utf-8")
+    return str(static), str(frames)
+
+
+def scale_venice(directory: Path, factor: int) -> tuple[str, ...]:
+    static = directory / "D001C005_210716AGM01.xml"
+    frames = directory / "D001C005_210716AG.csv"
+    n_frames = _repeat_csv_rows(RESOURCES / "venice" / frames.name, frames, factor)
+    xml = (RESOURCES / "venice" / static.name).read_text(encoding="utf-8")
+    static.write_text(re.sub(r'<Duration value="\d+"/>', f'<Duration value="{n_frames}"/>', xml),
+                      encoding="utf-8")
+    return str(static), str(frames)
+
+
+def scale_bmd(directory: Path, factor: int) -> tuple[str, ...]:
+    dst = directory / "metadata.txt"
+    text = (RESOURCES / "bmd" / dst.name).read_text(encoding="utf-8")
+    clip_part, frame_part = re.split(r"(?m)^(?=Frame 0 Metadata$)", text, maxsplit=1)
+    frames = re.split(r"(?m)^(?=Frame \d+ Metadata$)", frame_part)
+    bodies = [f.split("\n", 1)[1] for f in frames if f]
+    with open(dst, "w", encoding="utf-8") as fp:
+        fp.write(clip_part)
+        for i in range(factor * len(bodies)):
+            fp.write(f"Frame {i} Metadata\n")
+            fp.write(bodies[i % len(bodies)])
+    return str(dst),
+
+
+def scale_mosys(directory: Path, factor: int) -> tuple[str, ...]:
+    dst = directory / "A003_C001_01 15-03-47-01.f4"
+    dst.write_bytes((RESOURCES / "mosys" / dst.name).read_bytes() * factor)
+    return str(dst),
+
+
+SCALERS = {
+    'arri': scale_arri,
+    'bmd': scale_bmd,
+    'canon': scale_canon,
+    'mosys': scale_mosys,
+    'red': scale_red,
+    'venice': scale_venice,
+}
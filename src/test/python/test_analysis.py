@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+"""Tests for analysis of timing parameters"""
+
+import unittest
+from fractions import Fraction
+
+from camdkit.analysis import F4_SEQUENCE_MODULUS, TimingAnalyzer, analyze_clip
+from camdkit.clip import Clip
+from camdkit.timing_types import Timecode, TimecodeFormat, Timestamp, frames_to_timecodes
+
+
+class AnalysisTestCases(unittest.TestCase):
+
+    def test_sequence_numbers(self):
+        clip = Clip()
+        # samples 3 and 4, 7 through 9, then 11 through 26 are missing
+        clip.timing_sequence_number = tuple(n % F4_SEQUENCE_MODULUS for n in (0, 1, 2, 5, 6, 10, 27, 27))
+        report = analyze_clip(clip, sequence_modulus=F4_SEQUENCE_MODULUS)
+        self.assertEqual(8, report.samples)
+        self.assertEqual(2, report.sequence_gaps)
+        # a gap of a whole multiple of the modulus is invisible
+        self.assertEqual(2 + 3, report.sequence_dropped)
+        self.assertEqual(1, report.sequence_repeats)
+        self.assertEqual((3, 5), report.sequence_gap_indices)
+        clip.timing_sequence_number = (5, 6, 1, 2)
+        report = analyze_clip(clip)
+        self.assertEqual((0, 1), (report.sequence_gaps, report.sequence_resets))
+
+    def test_timestamps(self):
+        clip = Clip()
+        clip.timing_sample_rate = (Fraction(50),) * 6
+        offsets_ms = (0, 20, 40, 81, 100, 140)
+        clip.timing_sample_timestamp = tuple(Timestamp(100, ms * 1_000_000) for ms in offsets_ms)
+        report = analyze_clip(clip)
+        self.assertEqual(20_000_000, report.expected_interval_ns)
+        self.assertEqual(28_000_000, report.interval_mean_ns)
+        self.assertEqual((19_000_000, 41_000_000), (report.interval_min_ns, report.interval_max_ns))
+        self.assertEqual(21_000_000, report.interval_max_deviation_ns)
+        self.assertEqual((3, 5), report.irregular_interval_indices)
+        self.assertEqual(2, report.timestamp_dropped)
+
+    def test_streaming_matches_whole_clip(self):
+        fps_25 = TimecodeFormat(25)
+        frames = [0, 1, 2, 4, 5, 5, 6]
+        clip = Clip()
+        clip.timing_sample_rate = (Fraction(25),) * len(frames)
+        clip.timing_timecode = frames_to_timecodes(frames, fps_25)
+        clip.timing_sequence_number = tuple(frames)
+        clip.timing_sample_timestamp = tuple(Timestamp(0, 40_000_000 * n) for n in frames)
+        whole = analyze_clip(clip)
+        self.assertEqual((3, 5), whole.timecode_discontinuity_indices)
+        analyzer = TimingAnalyzer()
+        for i in range(len(frames)):
+            frame = Clip()
+            frame.timing_sample_rate = (Fraction(25),)
+            frame.timing_timecode = (clip.timing_timecode[i],)
+            frame.timing_sequence_number = (frames[i],)
+            frame.timing_sample_timestamp = (clip.timing_sample_timestamp[i],)
+            analyzer.update_clip(frame)
+        self.assertEqual(whole, analyzer.report())
+        # at twice the timecode rate, repeated timecodes are expected
+        clip.timing_sample_rate = (Fraction(50),) * len(frames)
+        self.assertEqual((3,), analyze_clip(clip).timecode_discontinuity_indices)
+        self.assertEqual(Timecode(0, 0, 0, 6, fps_25), clip.timing_timecode[-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -50,3 +50,11 @@ def test_reader(self):
 
   def test_linear_iris_value(self):
     self.assertEqual(round(camdkit.arri.reader.t_number_from_linear_iris_value(6000) * 1000), 5657)
+
+  def test_static(self):
+    clip = camdkit.arri.reader.to_clip("src/test/resources/arri/B001C001_180327_R1ZA.mov.csv")
+    static = camdkit.arri.reader.to_static("src/test/resources/arri/B001C001_180327_R1ZA.mov.csv")
+
+    self.assertIsNone(static.duration)
+    static.duration = clip.duration
+    self.assertEqual(static, clip.static)
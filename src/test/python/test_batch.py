@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+"""Tests for batch ingest"""
+
+import json
+import unittest
+import tempfile
+from pathlib import Path
+
+from camdkit.batch import BatchJob, jobs_from_directory, jobs_from_manifest, run_batch
+
+
+class BatchTestCases(unittest.TestCase):
+
+    def test_directory_pairing(self):
+        jobs = {job.vendor: job for job in jobs_from_directory("src/test/resources")}
+        self.assertEqual({'arri', 'bmd', 'canon', 'mosys', 'red', 'venice'}, set(jobs))
+        self.assertEqual(("src/test/resources/red/A001_C066_0303LZ_001.static.csv",
+                          "src/test/resources/red/A001_C066_0303LZ_001.frames.csv"),
+                         jobs['red'].paths)
+        self.assertEqual(("src/test/resources/venice/D001C005_210716AGM01.xml",
+                          "src/test/resources/venice/D001C005_210716AG.csv"),
+                         jobs['venice'].paths)
+        self.assertEqual("20221007_TNumber_CanonCameraMetadata", jobs['canon'].name)
+        self.assertEqual(("src/test/resources/bmd/metadata.txt",), jobs['bmd'].paths)
+
+    def test_manifest(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            manifest_path = Path(tmp) / "manifest.json"
+            with open(manifest_path, "w", encoding="utf-8") as fp:
+                json.dump([{"vendor": "bmd", "paths": ["metadata.txt"], "name": "clip"}], fp)
+            self.assertEqual([BatchJob('bmd', (str(Path(tmp) / "metadata.txt"),), "clip")],
+                             jobs_from_manifest(manifest_path))
+            with open(manifest_path, "w", encoding="utf-8") as fp:
+                json.dump([{"vendor": "nikon", "paths": ["clip.csv"]}], fp)
+            with self.assertRaises(ValueError):
+                jobs_from_manifest(manifest_path)
+
+    def test_run_batch(self):
+        jobs = [BatchJob('red', ("src/test/resources/red/A001_C066_0303LZ_001.static.csv",
+                                 "src/test/resources/red/A001_C066_0303LZ_001.frames.csv"), "red"),
+                BatchJob('arri', ("src/test/resources/no_such_file.csv",), "missing")]
+        with tempfile.TemporaryDirectory() as tmp:
+            results = list(run_batch(jobs, tmp, ('json', 'ndjson'), workers=1))
+            self.assertEqual(["red", "missing"], [r.name for r in results])
+            self.assertIsNone(results[0].error)
+            self.assertEqual(2, results[0].frames)
+            with open(Path(tmp) / "red.ndjson", "r", encoding="utf-8") as fp:
+                frames = [json.loads(line) for line in fp]
+            with open(Path(tmp) / "red.json", "r", encoding="utf-8") as fp:
+                clip_json = json.load(fp)
+            self.assertEqual(2, len(frames))
+            self.assertEqual([clip_json["lens"]["focalLength"][1]], frames[1]["lens"]["focalLength"])
+            self.assertEqual(clip_json["static"], frames[1]["static"])
+            self.assertTrue(results[1].error.startswith("FileNotFoundError"))
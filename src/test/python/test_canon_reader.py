@@ -38,3 +38,25 @@ def test_reader(self):
     self.assertEqual(clip.anamorphic_squeeze, 1)  # anamorphic_squeeze: 1
 
     self.assertIsNone(clip.active_sensor_physical_dimensions)
+
+  def test_column_decoding(self):
+    self.assertEqual(camdkit.canon.reader._read_float32_column_as_hex(("3F000000", "40490FDB", "BF800000")),
+                     (0.5, 3.1415927410125732, -1.0))
+    self.assertEqual(camdkit.canon.reader._read_float32_as_hex("3F000000"), 0.5)
+    # rows too short or too long are not absorbed by their neighbours
+    for column in (("3F0000", "0040490FDB"), ("3F000000", "4049 0FD", "B")):
+      with self.assertRaises(ValueError):
+        camdkit.canon.reader._read_float32_column_as_hex(column)
+    self.assertEqual(camdkit.canon.reader._read_rational_column(("180/10", "45/10", "180/10")),
+                     (18.0, 4.5, 18.0))
+
+  def test_static(self):
+    with open("src/test/resources/canon/20221007_TNumber_CanonCameraMetadata_Static.csv", "r", encoding="utf-8") as static_csv, \
+      open("src/test/resources/canon/20221007_TNumber_CanonCameraMetadata_Frames.csv", "r", encoding="utf-8") as frame_csv:
+      clip = camdkit.canon.reader.to_clip(static_csv, frame_csv)
+
+    with open("src/test/resources/canon/20221007_TNumber_CanonCameraMetadata_Static.csv", "r", encoding="utf-8") as static_csv, \
+      open("src/test/resources/canon/20221007_TNumber_CanonCameraMetadata_Frames.csv", "r", encoding="utf-8") as frame_csv:
+      static = camdkit.canon.reader.to_static(static_csv, frame_csv)
+
+    self.assertEqual(static, clip.static)
@@ -505,6 +505,31 @@ def print_doc_entry(entry, fp) -> None:
         #     for doc_entry in sorted_doc:
         #         print_doc_entry(doc_entry, fp)
 
+    def test_frames_to_json(self):
+        clip = Clip()
+        self.assertEqual(0, clip.frame_count())
+        self.assertEqual([], list(clip.frames_to_json()))
+        clip.camera_make = "Bob"
+        clip.lens_focal_length = (24.0, 25.0, 26.0)
+        clip.timing_sequence_number = (1, 2, 3)
+        clip.transforms = ((Transform(translation=Vector3(1.0, 2.0, 3.0),
+                                      rotation=Rotator3(0.0, 0.0, 0.0)),),) * 3
+        self.assertEqual(3, clip.frame_count())
+        frames = list(clip.frames_to_json())
+        self.assertEqual(3, len(frames))
+        for i, frame_json in enumerate(frames):
+            self.assertEqual(Clip.to_json(clip[i]), frame_json)
+        # parameters of fewer samples are left out of the later frames
+        clip.lens_focal_length = (24.0,)
+        clip.timing_sequence_number = (1, 2, 3, 4)
+        frames = list(clip.frames_to_json())
+        self.assertEqual(4, len(frames))
+        self.assertEqual({"focalLength": (24.0,)}, frames[0]["lens"])
+        self.assertNotIn("lens", frames[1])
+        self.assertNotIn("transforms", frames[3])
+        self.assertEqual((4,), frames[3]["timing"]["sequenceNumber"])
+        self.assertEqual({"make": "Bob"}, frames[3]["static"]["camera"])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+"""Tests for evaluation of lens distortion"""
+
+import math
+import unittest
+
+from camdkit.camera_types import PhysicalDimensions
+from camdkit.clip import Clip
+from camdkit.distortion import (BROWN_CONRADY_D_U, BROWN_CONRADY_U_D, LensDistortion,
+                                sensor_from_normalized, normalized_from_sensor)
+from camdkit.lens_types import Distortion, DistortionOffset, ProjectionOffset
+
+XS = (-18.0, -9.5, 0.0, 0.25, 7.0, 18.0)
+YS = (-12.0, 3.0, 0.0, -0.5, 11.0, 12.0)
+
+
+class DistortionTestCases(unittest.TestCase):
+
+    def assertPointsAlmostEqual(self, expected, actual, places=9):
+        for e, a in zip(expected, actual):
+            self.assertAlmostEqual(e, a, places)
+
+    def test_identity(self):
+        xs, ys = LensDistortion().undistort(XS, YS)
+        self.assertEqual(list(XS), list(xs))
+        self.assertEqual(list(YS), list(ys))
+        xs, ys = LensDistortion(projection_offset=(1.0, 2.0)).distort(XS, YS)
+        self.assertPointsAlmostEqual([x + 1.0 for x in XS], xs)
+        self.assertPointsAlmostEqual([y + 2.0 for y in YS], ys)
+
+    def test_closed_form(self):
+        # r^2 = 25, R = 1 + 0.01 * 25 + 0.002 * 25^2 = 2.5
+        distortion = LensDistortion(radial=(0.01, 0.002), tangential=(0.001, 0.002))
+        xs, ys = distortion.undistort((3.0,), (4.0,))
+        self.assertAlmostEqual(2.5 * 3.0 + 2 * 0.001 * 12.0 + 0.002 * (25.0 + 18.0), xs[0])
+        self.assertAlmostEqual(2.5 * 4.0 + 2 * 0.002 * 12.0 + 0.001 * (25.0 + 32.0), ys[0])
+        self.assertAlmostEqual(7.61, xs[0])
+        self.assertAlmostEqual(10.105, ys[0])
+        # R = 1 + 0.01 * 25 + 0.002 * 25^2 + 1e-5 * 25^3 = 2.65625
+        xs, ys = LensDistortion(radial=(0.01, 0.002, 1e-5)).undistort((3.0,), (4.0,))
+        self.assertAlmostEqual(7.96875, xs[0])
+        self.assertAlmostEqual(10.625, ys[0])
+
+    def test_newton(self):
+        # the inverse of test_closed_form, which has no closed form
+        distortion = LensDistortion(radial=(0.01, 0.002), tangential=(0.001, 0.002))
+        xs, ys = distortion.distort((7.61,), (10.105,))
+        self.assertAlmostEqual(3.0, xs[0])
+        self.assertAlmostEqual(4.0, ys[0])
+        xs, ys = LensDistortion(radial=(0.01, 0.002), model=BROWN_CONRADY_U_D).undistort((7.5,), (10.0,))
+        self.assertAlmostEqual(3.0, xs[0])
+        self.assertAlmostEqual(4.0, ys[0])
+
+    def test_round_trip(self):
+        for model in (BROWN_CONRADY_D_U, BROWN_CONRADY_U_D):
+            distortion = LensDistortion(radial=(1e-4, 2e-7, -1e-10), tangential=(1e-4, -2e-4),
+                                        model=model, distortion_offset=(0.1, -0.05),
+                                        projection_offset=(0.2, 0.1))
+            undistorted_xs, undistorted_ys = distortion.undistort(XS, YS)
+            self.assertNotEqual(list(XS), list(undistorted_xs))
+            xs, ys = distortion.distort(undistorted_xs, undistorted_ys)
+            self.assertPointsAlmostEqual(XS, xs)
+            self.assertPointsAlmostEqual(YS, ys)
+
+    def test_no_convergence(self):
+        xs, ys = LensDistortion(radial=(1.0,), iterations=2).distort((10.0,), (10.0,))
+        self.assertTrue(math.isnan(xs[0]) and math.isnan(ys[0]))
+
+    def test_from_clip(self):
+        clip = Clip()
+        clip.lens_distortions = ((Distortion([0.1], None, BROWN_CONRADY_D_U),
+                                  Distortion([0.2], [0.01, 0.02], BROWN_CONRADY_U_D)),)
+        clip.lens_distortion_offset = (DistortionOffset(1.0, 2.0),)
+        clip.lens_projection_offset = (ProjectionOffset(3.0, 4.0),)
+        self.assertEqual(LensDistortion((0.1,), (), BROWN_CONRADY_D_U, (1.0, 2.0), (3.0, 4.0)),
+                         LensDistortion.from_clip(clip))
+        self.assertEqual(LensDistortion((0.2,), (0.01, 0.02), BROWN_CONRADY_U_D, (1.0, 2.0), (3.0, 4.0)),
+                         LensDistortion.from_clip(clip, 0, BROWN_CONRADY_U_D))
+        self.assertEqual(LensDistortion(), LensDistortion.from_clip(Clip()))
+        with self.assertRaises(ValueError):
+            LensDistortion(model="Fisheye")
+
+    def test_normalized(self):
+        dimensions = PhysicalDimensions(width=36.0, height=24.0)
+        xs, ys = sensor_from_normalized((0.0, 0.5, 1.0), (0.0, 0.5, 1.0), dimensions)
+        self.assertEqual([-18.0, 0.0, 18.0], list(xs))
+        self.assertEqual([-12.0, 0.0, 12.0], list(ys))
+        us, vs = normalized_from_sensor(xs, ys, dimensions)
+        self.assertEqual([0.0, 0.5, 1.0], list(us))
+        self.assertEqual([0.0, 0.5, 1.0], list(vs))
+
+
+if __name__ == '__main__':
+    unittest.main()
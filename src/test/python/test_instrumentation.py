@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+"""Tests for instrumentation of hot paths"""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from camdkit import instrumentation
+from camdkit.clip import Clip
+from camdkit.mosys import reader
+from camdkit.mosys.f4 import F4PacketParser
+
+
+class InstrumentationTestCases(unittest.TestCase):
+
+    def setUp(self):
+        instrumentation.reset()
+
+    def tearDown(self):
+        instrumentation.disable()
+        instrumentation.reset()
+
+    def test_disabled_is_untouched(self):
+        to_json = Clip.__dict__["to_json"]
+        from_json = Clip.__dict__["from_json"]
+        get_tracking_frame = F4PacketParser.get_tracking_frame
+        instrumentation.enable()
+        self.assertTrue(instrumentation.is_enabled())
+        self.assertIsNot(to_json, Clip.__dict__["to_json"])
+        self.assertIn("__setattr__", Clip.__dict__)
+        instrumentation.disable()
+        self.assertIs(to_json, Clip.__dict__["to_json"])
+        self.assertIs(from_json, Clip.__dict__["from_json"])
+        self.assertNotIn("__setattr__", Clip.__dict__)
+        self.assertIs(get_tracking_frame, F4PacketParser.get_tracking_frame)
+        instrumentation.reset()
+        Clip().lens_focal_length = (10.0,)
+        self.assertEqual({}, instrumentation.snapshot())
+
+    def test_clip_metrics(self):
+        instrumentation.enable()
+        clip = Clip()
+        clip.lens_focal_length = (10.0, 11.0)
+        clip.lens_focal_length = (12.0,)
+        self.assertEqual((12.0,), clip.lens_focal_length)
+        with self.assertRaises(ValueError):
+            clip.lens_focal_length = (-1.0,)
+        clip_json = clip.to_json()
+        self.assertEqual(clip_json, Clip.from_json(clip_json).to_json())
+        metrics = instrumentation.snapshot()
+        setter = metrics["clip.set.lens_focal_length"]
+        self.assertEqual(3, setter.count)
+        self.assertLessEqual(setter.min_ns, setter.max_ns)
+        self.assertEqual(setter.total_ns, 3 * setter.mean_ns)
+        self.assertEqual(2, metrics["clip.to_json"].count)
+        self.assertEqual(1, metrics["clip.from_json"].count)
+
+    def test_reader_metrics(self):
+        instrumentation.enable()
+        reader.to_clip("src/test/resources/mosys/A003_C001_01 15-03-47-01.f4", 5)
+        metrics = instrumentation.snapshot()
+        self.assertEqual(1, metrics["reader.mosys.to_clip"].count)
+        self.assertEqual(6, metrics["reader.mosys.to_frame"].count)
+        self.assertGreaterEqual(metrics["f4.get_tracking_frame"].count, 6)
+        self.assertLessEqual(metrics["reader.mosys.to_frame"].total_ns,
+                             metrics["reader.mosys.to_clip"].total_ns)
+
+    def test_reset(self):
+        instrumentation.enable()
+        Clip().to_json()
+        self.assertEqual(1, instrumentation.snapshot()["clip.to_json"].count)
+        instrumentation.reset()
+        self.assertEqual({}, instrumentation.snapshot())
+
+    def test_export(self):
+        instrumentation.enable()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "metrics.json"
+            with instrumentation.Exporter(path, interval=0.01):
+                Clip().to_json()
+            exported = json.loads(path.read_text())
+            self.assertTrue(exported["enabled"])
+            self.assertEqual(1, exported["metrics"]["clip.to_json"]["count"])
+            self.assertEqual([path], list(Path(tmp).iterdir()))
+        with self.assertRaises(ValueError):
+            instrumentation.Exporter(path, interval=0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -17,7 +17,9 @@
 from pydantic.json_schema import JsonSchemaValue
 
 from camdkit.compatibility import canonicalize_descriptions
-from camdkit.lens_types import StaticLens, Distortion, Lens
+from camdkit.clip import Clip
+from camdkit.lens_types import (StaticLens, Distortion, Lens, FizEncoders, RawFizEncoders,
+                                LensCalibrationTable, EncoderRange, EncoderRanging)
 
 
 CLASSIC_LENS_SCHEMA_PATH = Path("src/test/resources/model/lens.json")
@@ -94,6 +96,88 @@ def test_regular_lens_schemas_match(self):
         actual = Lens.make_json_schema()
         self.assertEqual(expected, actual)
 
+    def test_lens_calibration_table(self):
+        zoom, focus = (0.0, 0.25, 0.5, 1.0), (0.0, 0.3, 1.0)
+        table = LensCalibrationTable(zoom, focus,
+                                     focal_length=[[20.0 + 60.0 * z + f for f in focus] for z in zoom],
+                                     radial=[[[1e-4 * (1 + z)] * 3 for z in zoom]],
+                                     model="Brown-Conrady D-U")
+        # grid points are reproduced, bilinear data interpolated exactly, and
+        # values outside the grid are those at its edge
+        self.assertEqual([35.3, 50.0], list(table.focal_length((0.25, 0.5), (0.3, 0.0))))
+        for expected, actual in zip((26.5, 81.0, 20.0), table.focal_length((0.1, 1.5, -1.0), (0.5, 2.0, 0.0))):
+            self.assertAlmostEqual(expected, actual)
+        self.assertIsNone(table.focus_distance((0.0,), (0.0,)))
+        distortion, = table.distortion((0.5,), (0.7,))
+        self.assertAlmostEqual(1.5e-4, distortion.radial[0])
+        self.assertEqual("Brown-Conrady D-U", distortion.model)
+        with self.assertRaises(ValueError):
+            LensCalibrationTable((0.0, 0.0), focus)
+        with self.assertRaises(ValueError):
+            LensCalibrationTable(zoom, focus, focal_length=[[1.0, 2.0]])
+
+    def test_lens_calibration_table_smooth(self):
+        zoom = tuple(i / 8 for i in range(9))
+        focus = tuple(i / 8 for i in range(9))
+        def f(z, x):
+            return 30.0 + 50.0 * z * z + 5.0 * x ** 3 - 2.0 * z * x
+        table = LensCalibrationTable(zoom, focus, focal_length=[[f(z, x) for x in focus] for z in zoom])
+        points = [(i / 37, (i * 7 % 37) / 37) for i in range(37)]
+        for (z, x), actual in zip(points, table.focal_length(*zip(*points))):
+            self.assertAlmostEqual(f(z, x), actual, delta=0.02)
+
+    def test_lens_calibration_table_apply(self):
+        # a prime: one zoom, focus distance over the focus encoder
+        table = LensCalibrationTable.from_json({"zoom": [0.0], "focus": [0.0, 1.0],
+                                                "focalLength": [[50.0, 50.5]],
+                                                "focusDistance": [[100.0, 0.5]],
+                                                "radial": [[[1e-4, 2e-4]]],
+                                                "tangential": [[[1e-5, 1e-5]], [[0.0, 0.0]]]})
+        clip = Clip()
+        clip.lens_encoders = (FizEncoders(focus=0.0), FizEncoders(focus=0.5, zoom=0.7), FizEncoders(iris=0.1))
+        table.apply(clip)
+        self.assertEqual((50.0, 50.25, 50.0), clip.lens_focal_length)
+        self.assertEqual((100.0, 50.25, 100.0), clip.lens_focus_distance)
+        self.assertIsNone(clip.lens_entrance_pupil_offset)
+        self.assertEqual(Distortion((1e-4,), (1e-5, 0.0)), clip.lens_distortions[0][0])
+        with self.assertRaises(ValueError):
+            table.apply(Clip())
+
+    def test_encoder_range(self):
+        encoder_range = EncoderRange(100, 300)
+        self.assertEqual([0.0, 0.25, 1.0, 0.0, None], encoder_range.normalize((100, 150, 400, 0, None)))
+        self.assertEqual([1.0, 0.75], EncoderRange(100, 300, inverted=True).normalize((100, 150)))
+        self.assertEqual([0.0], EncoderRange(7, 7).normalize((7,)))
+        encoder_range.include((50, 200))
+        self.assertEqual(EncoderRange(50, 300), encoder_range)
+
+    def test_encoder_ranging(self):
+        ranging = EncoderRanging(focus=EncoderRange(0, 1000), zoom=EncoderRange(0, 100, inverted=True))
+        raw = (RawFizEncoders(focus=0, iris=5, zoom=0), RawFizEncoders(focus=250, iris=5, zoom=25),
+               RawFizEncoders(focus=250, iris=5, zoom=25))
+        normalized = ranging.normalize(raw)
+        self.assertEqual((FizEncoders(focus=0.0, zoom=1.0), FizEncoders(focus=0.25, zoom=0.75)), normalized[:2])
+        self.assertIs(normalized[1], normalized[2])
+        with self.assertRaisesRegex(ValueError, "sample 1 has no value"):
+            ranging.normalize((RawFizEncoders(focus=0), RawFizEncoders(iris=5)))
+        with self.assertRaisesRegex(ValueError, "no axis with a known range"):
+            EncoderRanging().normalize((RawFizEncoders(iris=5),))
+        self.assertEqual((), EncoderRanging().normalize(()))
+
+    def test_encoder_ranging_streaming(self):
+        ranging = EncoderRanging(learn=True, inverted=("iris",))
+        self.assertEqual((FizEncoders(focus=0.0, iris=0.0),),
+                         ranging.normalize((RawFizEncoders(focus=500, iris=20),)))
+        self.assertEqual((FizEncoders(focus=1.0, iris=1.0), FizEncoders(focus=0.5, iris=0.5)),
+                         ranging.normalize((RawFizEncoders(focus=700, iris=10), RawFizEncoders(focus=600, iris=15))))
+        clip = Clip()
+        clip.lens_raw_encoders = (RawFizEncoders(focus=300), RawFizEncoders(focus=400))
+        ranging.apply(clip)
+        self.assertEqual((FizEncoders(focus=0.0), FizEncoders(focus=0.25)), clip.lens_encoders)
+        self.assertEqual(EncoderRange(300, 700), ranging.ranges['focus'])
+        with self.assertRaises(ValueError):
+            ranging.apply(Clip())
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+"""Tests for the memory footprint of Clip parameters"""
+
+import sys
+import unittest
+from array import array
+from fractions import Fraction
+
+from camdkit.clip import Clip
+from camdkit.lens_types import FizEncoders
+from camdkit.memory import deep_size
+
+
+class MemoryTestCases(unittest.TestCase):
+
+    def test_deep_size(self):
+        value = 1.5
+        self.assertEqual((sys.getsizeof(value), 1), deep_size(value))
+        shared = (value, value, None, True)
+        self.assertEqual((sys.getsizeof(shared) + sys.getsizeof(value), 2), deep_size(shared))
+        seen = {id(value)}
+        self.assertEqual((sys.getsizeof(shared), 1), deep_size(shared, seen))
+        self.assertIn(id(shared), seen)
+        size, objects = deep_size(Fraction(1, 3))
+        self.assertEqual(3, objects)
+        self.assertGreater(size, sys.getsizeof(Fraction(1, 3)))
+        # a model's fields are reached through its __dict__
+        self.assertGreater(deep_size(FizEncoders(focus=0.5))[1], 2)
+
+    def test_report(self):
+        clip = Clip()
+        clip.camera_make = "Bogus"
+        clip.lens_focal_length = tuple(float(i % 3 + 1) for i in range(30))
+        clip.tracker_status = ("Ok",) * 30
+        clip.lens_encoders = tuple(FizEncoders(focus=0.5, iris=0.25) for _ in range(30))
+        report = clip.memory_report()
+        self.assertEqual(30, report.frames)
+        self.assertEqual({"camera_make", "lens_focal_length", "tracker_status", "lens_encoders"},
+                         {p.name for p in report.parameters})
+
+        make = report["camera_make"]
+        self.assertTrue(make.static)
+        self.assertIsNone(make.runs)
+        self.assertEqual(deep_size("Bogus")[0], make.deep_bytes)
+
+        focal_length = report["lens_focal_length"]
+        self.assertFalse(focal_length.static)
+        self.assertEqual(30, focal_length.runs)
+        self.assertEqual(focal_length.deep_bytes / 30, focal_length.per_frame_bytes)
+        self.assertEqual(sys.getsizeof(array('d')) + 30 * 8, focal_length.packed_bytes)
+
+        # one string shared by every frame: one run, nothing to gain by sharing
+        status = report["tracker_status"]
+        self.assertEqual(1, status.runs)
+        self.assertEqual(status.deep_bytes, status.shared_bytes)
+        self.assertIsNone(status.packed_bytes)
+
+        encoders = report["lens_encoders"]
+        self.assertEqual(1, encoders.runs)
+        self.assertLess(encoders.shared_bytes, encoders.deep_bytes / 10)
+        self.assertEqual(3 * (sys.getsizeof(array('d')) + 30 * 8), encoders.packed_bytes)
+        self.assertEqual(encoders.shared_bytes, encoders.best_bytes)
+        clip.compact()
+        self.assertEqual(encoders.shared_bytes, clip.memory_report()["lens_encoders"].deep_bytes)
+
+        self.assertGreater(report.total_bytes, sum(p.deep_bytes for p in report.parameters) // 2)
+        self.assertIn("lens_encoders", str(report))
+        self.assertEqual(report.total_bytes, report.to_json()["total_bytes"])
+        with self.assertRaises(KeyError):
+            report["lens_t_number"]
+
+
+if __name__ == '__main__':
+    unittest.main()
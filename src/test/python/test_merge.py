@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+"""Tests for temporal alignment and merge of clips"""
+
+import unittest
+from fractions import Fraction
+
+from camdkit.clip import Clip
+from camdkit.lens_types import FizEncoders
+from camdkit.merge import MergeSource, sample_times, merge_clips
+from camdkit.timing_types import (Timestamp, Synchronization, SynchronizationOffsets,
+                                  SynchronizationSource)
+from camdkit.transform_types import Vector3, Rotator3, Transform
+
+
+def tracker_clip(frames: int) -> Clip:
+    # 50 Hz, moving 1 m/s along X and panning 50 degrees/s
+    clip = Clip()
+    clip.timing_sample_rate = (Fraction(50),) * frames
+    clip.tracker_status = tuple(f"status {i}" for i in range(frames))
+    clip.transforms = tuple((Transform(translation=Vector3(i / 50, 0.0, 0.0),
+                                       rotation=Rotator3(float(i), 0.0, 0.0)),)
+                            for i in range(frames))
+    clip.lens_encoders = tuple(FizEncoders(focus=i / 100, iris=0.5) for i in range(frames))
+    return clip
+
+
+def camera_clip(frames: int) -> Clip:
+    # 25 Hz
+    clip = Clip()
+    clip.timing_sample_rate = (Fraction(25),) * frames
+    clip.lens_focal_length = tuple(float(10 + i) for i in range(frames))
+    clip.tracker_status = ("camera",) * frames
+    return clip
+
+
+class MergeTestCases(unittest.TestCase):
+
+    def test_sample_times(self):
+        self.assertEqual((0, 40_000_000, 80_000_000), sample_times(camera_clip(3)))
+        self.assertEqual((10_000_000, 50_000_000, 90_000_000), sample_times(camera_clip(3), 0.01))
+        clip = Clip()
+        clip.timing_sample_timestamp = (Timestamp(1718806554, 500), Timestamp(1718806555, 0))
+        self.assertEqual((1718806554_000_000_500, 1718806555_000_000_000), sample_times(clip))
+        clip = Clip()
+        clip.lens_focal_length = (1.0,)
+        with self.assertRaises(ValueError):
+            sample_times(clip)
+
+    def test_merge_onto_camera(self):
+        merged = merge_clips((camera_clip(4), MergeSource(tracker_clip(10), offset=0.01)))
+        self.assertEqual(4, merged.frame_count())
+        self.assertEqual((10.0, 11.0, 12.0, 13.0), merged.lens_focal_length)
+        # the first source wins
+        self.assertEqual(("camera",) * 4, merged.tracker_status)
+        # tracker samples are at 10, 30, 50... ms, so camera frames fall halfway between them
+        self.assertEqual(0.0, merged.transforms[0][0].translation.x)
+        self.assertAlmostEqual(0.03, merged.transforms[1][0].translation.x)
+        self.assertAlmostEqual(1.5, merged.transforms[1][0].rotation.pan)
+        self.assertAlmostEqual(0.035, merged.lens_encoders[2].focus)
+        self.assertEqual(0.5, merged.lens_encoders[2].iris)
+        self.assertIsNone(merged.lens_encoders[2].zoom)
+
+    def test_merge_onto_tracker(self):
+        merged = merge_clips((tracker_clip(6), camera_clip(3)))
+        self.assertEqual(tuple(f"status {i}" for i in range(6)), merged.tracker_status)
+        self.assertEqual((10.0, 10.5, 11.0, 11.5, 12.0, 12.0), merged.lens_focal_length)
+        self.assertEqual(tracker_clip(6).transforms, merged.transforms)
+        self.assertIsNone(merged.timing_sample_timestamp)
+
+    def test_timeline_and_offsets(self):
+        tracker = tracker_clip(3)
+        sync = Synchronization(locked=True, source=SynchronizationSource.GENLOCK,
+                               offsets=SynchronizationOffsets(translation=0.0, rotation=0.0,
+                                                              lensEncoders=-0.01))
+        tracker.timing_synchronization = (sync,) * 3
+        timeline = (1_000_000_000, 1_010_000_000)
+        merged = merge_clips((MergeSource(tracker, offset=1.0),), timeline)
+        self.assertEqual((Timestamp(1, 0), Timestamp(1, 10_000_000)), merged.timing_sample_timestamp)
+        self.assertEqual(0.0, merged.transforms[0][0].translation.x)
+        self.assertAlmostEqual(0.01, merged.transforms[1][0].translation.x)
+        # lens encoders were captured 10 ms before the sample time
+        self.assertAlmostEqual(0.005, merged.lens_encoders[0].focus)
+        self.assertAlmostEqual(0.01, merged.lens_encoders[1].focus)
+        with self.assertRaises(ValueError):
+            merge_clips((tracker,), (2, 1))
+
+    def test_mixed_timing(self):
+        camera = camera_clip(3)
+        camera.timing_sample_timestamp = tuple(Timestamp(1718806554, i * 40_000_000) for i in range(3))
+        tracker = tracker_clip(6)
+        # rate-timed samples would otherwise start in 1970
+        with self.assertRaises(ValueError):
+            merge_clips((camera, tracker))
+        with self.assertRaises(ValueError):
+            merge_clips((tracker, camera))
+        merged = merge_clips((camera, MergeSource(tracker, offset=1718806554.0)))
+        self.assertEqual(camera.timing_sample_timestamp, merged.timing_sample_timestamp)
+        self.assertAlmostEqual(0.04, merged.transforms[1][0].translation.x)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+'''Mo-Sys F4 replay tests'''
+
+import json
+import socket
+import unittest
+from fractions import Fraction
+
+from camdkit.mosys import replay
+
+F4_PATH = "src/test/resources/mosys/A003_C001_01 15-03-47-01.f4"
+
+class MoSysReplayTest(unittest.TestCase):
+
+  def setUp(self):
+    with open(F4_PATH, "rb") as f4_file:
+      self.packets = replay.split_packets(f4_file.read())
+    self.receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    self.receiver.bind(("127.0.0.1", 0))
+    self.receiver.settimeout(5)
+    self.sender = replay.open_socket("127.0.0.1")
+
+  def tearDown(self):
+    self.receiver.close()
+    self.sender.close()
+
+  def test_packets(self):
+    self.assertGreater(len(self.packets), 20)
+    self.assertTrue(all(p[0] == 0xF4 for p in self.packets))
+    self.assertEqual(replay.frame_rate(self.packets), Fraction(25))
+
+  def test_replay_raw_at_max_speed(self):
+    stats = replay.replay(self.packets[:5], self.sender, self.receiver.getsockname(), Fraction(25), None)
+    self.assertEqual(stats.packets, 5)
+    self.assertIsNone(stats.target_rate)
+    self.assertEqual([self.receiver.recv(4096) for _ in range(5)], self.packets[:5])
+
+  def test_replay_paced(self):
+    # 25 Hz at 10x is a 4 ms period; sends never precede their deadlines
+    stats = replay.replay(self.packets[:6], self.sender, self.receiver.getsockname(), Fraction(25), 10.0)
+    self.assertEqual(stats.packets, 6)
+    self.assertAlmostEqual(stats.target_rate, 250.0)
+    self.assertGreaterEqual(stats.elapsed_seconds, 5 * 0.004)
+    self.assertGreaterEqual(stats.lateness_max_ns, 0)
+
+  def test_replay_decoded(self):
+    payloads = replay.decode_packets(self.packets[:2])
+    replay.replay(payloads, self.sender, self.receiver.getsockname(), None)
+    frame = json.loads(self.receiver.recv(65536))
+    self.assertEqual(frame["timing"]["sampleRate"], [{"num": 25, "denom": 1}])
@@ -7,6 +7,7 @@
 """Types for numeric types"""
 
 import sys
+from fractions import Fraction
 from typing import Optional
 import unittest
 
@@ -21,7 +22,8 @@
                                    StrictlyPositiveInt,
                                    NonNegativeFloat, StrictlyPositiveFloat, NormalizedFloat,
                                    UnityOrGreaterFloat,
-                                   Rational, StrictlyPositiveRational)
+                                   Rational, StrictlyPositiveRational,
+                                   RationalValue, StrictlyPositiveRationalValue)
 
 
 class NumericsTestCases(unittest.TestCase):
@@ -329,6 +331,54 @@ def test_strictly_positive_rational(self):
         schema = StrictlyPositiveRational.make_json_schema()
         self.assertDictEqual(expected_schema, schema)
 
+    def test_rational_values(self):
+        class RationalValueTestbed(CompatibleBaseModel):
+            value: StrictlyPositiveRationalValue
+            signed: RationalValue | None = None
+
+        # common frame rates are interned
+        self.assertIs(StrictlyPositiveRationalValue(24000, 1001), StrictlyPositiveRationalValue(24000, 1001))
+        self.assertIs(StrictlyPositiveRationalValue(25, 1), StrictlyPositiveRationalValue(25))
+        rate = RationalValueTestbed(value={"num": 30000, "denom": 1001}).value
+        self.assertIs(StrictlyPositiveRationalValue(30000, 1001), rate)
+        self.assertEqual((30000, 1001), (rate.num, rate.denom))
+        # hashing, ordering and arithmetic are those of Fraction
+        self.assertEqual(hash(Fraction(30000, 1001)), hash(rate))
+        self.assertLess(rate, 30)
+        self.assertEqual(Fraction(1001, 30000), 1 / rate)
+        self.assertEqual(rate, StrictlyPositiveRational(30000, 1001))
+        self.assertEqual(StrictlyPositiveRational(30000, 1001), rate)
+        for accepted in (Fraction(24000, 1001), StrictlyPositiveRational(24000, 1001), 24):
+            self.assertIsInstance(RationalValueTestbed(value=accepted).value, StrictlyPositiveRationalValue)
+        self.assertEqual(Fraction(-1, 2), RationalValueTestbed(value=1, signed={"num": -2, "denom": 4}).signed)
+        for rejected in (0, -1, 1.5, True, "24", {"num": 1, "denom": 0}, {"num": 1.0, "denom": 1},
+                         Fraction(MAX_INT_32 + 1), Fraction(1, MAX_UINT_32 + 1)):
+            with self.assertRaises(ValidationError):
+                RationalValueTestbed(value=rejected)
+        with self.assertRaises(ValidationError):
+            RationalValueTestbed(value=1, signed=Fraction(MIN_INT_32 - 1))
+        # construction applies the same checks as validation, interned or not
+        with self.assertRaises(ZeroDivisionError):
+            StrictlyPositiveRationalValue(24, 0)
+        for invalid in ((-24, 1), (24, -1), (0, 1), (MAX_INT_32 + 1, 1), (1, MAX_UINT_32 + 1)):
+            with self.assertRaises(ValueError):
+                StrictlyPositiveRationalValue(*invalid)
+        self.assertEqual(Fraction(-24), RationalValue(-24, 1))
+        self.assertEqual(Fraction(-24), RationalValue(24, -1))
+        with self.assertRaises(ValueError):
+            RationalValue(MIN_INT_32 - 1)
+        self.assertEqual({"value": {"num": 30000, "denom": 1001}},
+                         RationalValueTestbed.to_json(RationalValueTestbed(value=rate)))
+        self.assertDictEqual({
+            "type": "object",
+            "properties": {
+                "num": {"type": "integer", "maximum": MAX_INT_32, "minimum": 1},
+                "denom": {"type": "integer", "maximum": MAX_UINT_32, "minimum": 1}
+            },
+            "required": ["num", "denom"],
+            "additionalProperties": False
+        }, RationalValueTestbed.make_json_schema()["properties"]["value"])
+
 
 if __name__ == '__main__':
     unittest.main()
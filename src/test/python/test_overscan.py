@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+"""Tests for computation of overscan from lens distortion"""
+
+import unittest
+
+from camdkit.camera_types import PhysicalDimensions
+from camdkit.clip import Clip
+from camdkit.distortion import LensDistortion
+from camdkit.lens_types import Distortion
+from camdkit.overscan import Overscan, overscan, clip_overscans, fill_overscan
+
+DIMENSIONS = PhysicalDimensions(width=36.0, height=24.0)
+
+
+class OverscanTestCases(unittest.TestCase):
+
+    def test_no_distortion(self):
+        self.assertEqual(Overscan(1.0, 1.0), overscan(LensDistortion(), DIMENSIONS))
+
+    def test_radial(self):
+        # the corner (18, 12) has r^2 = 468, and is where the undistorted image extends furthest
+        result = overscan(LensDistortion(radial=(1e-4,)), DIMENSIONS)
+        self.assertAlmostEqual(1 + 1e-4 * 468, result.distortion)
+        self.assertEqual(1.0, result.undistortion)
+        # the same lens as the inverse model overscans the other way
+        result = overscan(LensDistortion(radial=(1e-4,), model="Brown-Conrady U-D"), DIMENSIONS)
+        self.assertEqual(1.0, result.distortion)
+        self.assertAlmostEqual(1 + 1e-4 * 468, result.undistortion)
+
+    def test_projection_offset(self):
+        result = overscan(LensDistortion(projection_offset=(1.8, 0.0)), DIMENSIONS)
+        self.assertAlmostEqual(1.1, result.distortion)
+        self.assertAlmostEqual(1.1, result.undistortion)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            overscan(LensDistortion(), DIMENSIONS, samples=1)
+        with self.assertRaises(ValueError):
+            overscan(LensDistortion(), PhysicalDimensions(width=36.0, height=0.0))
+        with self.assertRaises(ValueError):
+            clip_overscans(Clip())
+
+    def test_no_convergence(self):
+        # four iterations invert the distortion near the middle of each edge but not at the corners
+        with self.assertRaises(ValueError):
+            overscan(LensDistortion(radial=(1e-3,), iterations=4), DIMENSIONS)
+        with self.assertRaises(ValueError):
+            overscan(LensDistortion(radial=(1e-3,), iterations=4, model="Brown-Conrady U-D"), DIMENSIONS)
+        self.assertGreater(overscan(LensDistortion(radial=(1e-3,), iterations=5), DIMENSIONS).distortion, 1.0)
+
+    def test_fill_overscan(self):
+        clip = Clip()
+        clip.lens_distortions = ((Distortion([1e-4]),),) * 3 + ((Distortion([2e-4]),),)
+        fill_overscan(clip, DIMENSIONS)
+        self.assertEqual(4, len(clip.lens_distortion_overscan))
+        self.assertEqual(clip.lens_distortion_overscan[0], clip.lens_distortion_overscan[2])
+        self.assertAlmostEqual(1 + 2e-4 * 468, clip.lens_distortion_overscan_max)
+        self.assertEqual((1.0,) * 4, clip.lens_undistortion_overscan)
+        self.assertEqual(1.0, clip.lens_undistortion_overscan_max)
+        clip.active_sensor_physical_dimensions = PhysicalDimensions(width=18.0, height=12.0)
+        self.assertAlmostEqual(1 + 1e-4 * 117, clip_overscans(clip)[0].distortion)
+
+
+if __name__ == '__main__':
+    unittest.main()
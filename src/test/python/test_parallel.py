@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+"""Tests for parallel validation of clip JSON"""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from camdkit.clip import Clip
+from camdkit.mosys import reader
+from camdkit.parallel import (ClipValidationError, split_json, validate_clip_json, from_json_parallel,
+                              load_json_parallel)
+
+
+class ParallelTestCases(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        clip = reader.to_clip("src/test/resources/mosys/A003_C001_01 15-03-47-01.f4", 19)
+        clip.camera_make = "Bogus"
+        cls.clip_json = json.loads(json.dumps(clip.to_json()))
+
+    def test_split(self):
+        chunks = list(split_json(self.clip_json, 8))
+        self.assertEqual([0, 8, 16], [start for start, _ in chunks])
+        self.assertIn("static", chunks[0][1])
+        self.assertNotIn("static", chunks[1][1])
+        self.assertEqual(self.clip_json["sampleId"][8:16], chunks[1][1]["sampleId"])
+        self.assertEqual(self.clip_json["tracker"]["status"][16:], chunks[2][1]["tracker"]["status"])
+        self.assertEqual([(0, {"static": {"camera": {"make": "Bogus"}}})],
+                         list(split_json({"static": {"camera": {"make": "Bogus"}}}, 8)))
+
+    def test_from_json(self):
+        expected = Clip.from_json(self.clip_json).to_json()
+        for workers in (1, 2):
+            clip = from_json_parallel(self.clip_json, workers=workers, chunk_size=6)
+            self.assertEqual(20, clip.frame_count())
+            self.assertEqual(expected, clip.to_json())
+        compressed = Clip.from_json(self.clip_json).to_json(rle=True)
+        self.assertEqual(expected, from_json_parallel(compressed, workers=2, chunk_size=6).to_json())
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "clip.json"
+            path.write_text(json.dumps(self.clip_json), encoding="utf-8")
+            self.assertEqual(expected, load_json_parallel(path, workers=2, chunk_size=6).to_json())
+
+    def test_errors(self):
+        clip_json = json.loads(json.dumps(self.clip_json))
+        clip_json["static"]["camera"]["make"] = 5
+        clip_json["lens"]["focusDistance"][13] = -1.0
+        clip_json["tracker"]["recording"][3] = "maybe"
+        errors = validate_clip_json(clip_json, workers=2, chunk_size=6)
+        self.assertEqual([("static", "camera", "make"), ("tracker", "recording", 3), ("lens", "focusDistance", 13)],
+                         [e["loc"] for e in errors])
+        self.assertEqual([], validate_clip_json(self.clip_json, workers=2, chunk_size=6))
+        with self.assertRaises(ClipValidationError) as cm:
+            from_json_parallel(clip_json, workers=2, chunk_size=6)
+        self.assertEqual(errors, cm.exception.errors)
+        self.assertIn("lens.focusDistance.13", str(cm.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+"""Tests for chunked processing of Clips"""
+
+import json
+import time
+import socket
+import tempfile
+import unittest
+from fractions import Fraction
+from pathlib import Path
+
+from camdkit.analysis import TimingAnalyzer, analyze_clip
+from camdkit.clip import Clip
+from camdkit.merge import merge_clips
+from camdkit.mosys import reader
+from camdkit.numeric_types import StrictlyPositiveRational
+from camdkit.registry import read_clip
+from camdkit.pipeline import (slice_clip, concatenate, chunks, mosys_chunks, read_chunks, pipeline,
+                              rechunk, scale_property, retime, merge_with, analyze, collect,
+                              write_ndjson, send_udp)
+
+MOSYS_PATH = "src/test/resources/mosys/A003_C001_01 15-03-47-01.f4"
+VENICE_PATHS = ("src/test/resources/venice/D001C005_210716AGM01.xml",
+                "src/test/resources/venice/D001C005_210716AG.csv")
+
+
+def _clip(frames: int, rate: int = 24) -> Clip:
+    clip = Clip()
+    clip.camera_make = "Bogus"
+    clip.timing_sample_rate = (StrictlyPositiveRational(rate, 1),) * frames
+    clip.timing_sequence_number = tuple(range(frames))
+    clip.lens_focal_length = tuple(float(i + 1) for i in range(frames))
+    return clip
+
+
+class PipelineTestCases(unittest.TestCase):
+
+    def test_slice_and_concatenate(self):
+        clip = _clip(10)
+        head, tail = slice_clip(clip, 0, 4), slice_clip(clip, 4, 10)
+        self.assertEqual((1.0, 2.0, 3.0, 4.0), head.lens_focal_length)
+        self.assertEqual("Bogus", tail.camera_make)
+        self.assertEqual(clip.to_json(), concatenate((head, tail)).to_json())
+        self.assertEqual([4, 4, 2], [c.frame_count() for c in chunks(clip, 4)])
+        self.assertEqual([], list(chunks(Clip(), 4)))
+        with self.assertRaises(ValueError):
+            next(chunks(clip, 0))
+
+    def test_read_chunks(self):
+        venice = collect(read_chunks("venice", VENICE_PATHS, 100))
+        self.assertEqual(read_clip("venice", VENICE_PATHS).to_json(), venice.to_json())
+
+    def test_mosys_chunks(self):
+        sizes = [c.frame_count() for c in mosys_chunks(MOSYS_PATH, 7, 20)]
+        self.assertEqual([7, 7, 6], sizes)
+        chunked = collect(mosys_chunks(MOSYS_PATH, 7, 20))
+        whole = reader.to_clip(MOSYS_PATH, 19)
+        self.assertEqual(20, whole.frame_count())
+        for name in ("transforms", "lens_encoders", "timing_timecode", "lens_distortions", "tracker_status"):
+            self.assertEqual(getattr(whole, name), getattr(chunked, name))
+
+    def test_rechunk_and_scale(self):
+        clip = _clip(10)
+        rechunked = list(pipeline(chunks(clip, 3), rechunk(4), scale_property("lens_focal_length", 0.5)))
+        self.assertEqual([4, 4, 2], [c.frame_count() for c in rechunked])
+        self.assertEqual(tuple(0.5 * (i + 1) for i in range(10)), collect(rechunked).lens_focal_length)
+        with self.assertRaises(ValueError):
+            scale_property("camera_make", 2.0)
+
+    def test_retime(self):
+        clip = _clip(10)
+        retimed = collect(pipeline(chunks(clip, 3), retime(Fraction(48))))
+        whole = merge_clips([clip], [round(Fraction(i * 10**9, 48)) for i in range(19)])
+        self.assertEqual(19, retimed.frame_count())
+        self.assertEqual(whole.lens_focal_length, retimed.lens_focal_length)
+        self.assertEqual(whole.timing_sequence_number, retimed.timing_sequence_number)
+        self.assertIsNone(retimed.timing_sample_timestamp)
+        self.assertEqual(StrictlyPositiveRational(48, 1), retimed.timing_sample_rate[-1])
+        # a start a billion seconds (exactly 48e9 periods) before the data
+        # gives the same timeline, without counting the periods in between
+        distant = collect(pipeline(chunks(clip, 3), retime(Fraction(48), start=-10**18)))
+        self.assertEqual(retimed.lens_focal_length, distant.lens_focal_length)
+
+    def test_merge_with(self):
+        tracker = _clip(10)
+        camera = Clip()
+        camera.timing_sample_rate = (StrictlyPositiveRational(12, 1),) * 5
+        camera.lens_focus_distance = tuple(float(i + 1) for i in range(5))
+        merged = collect(pipeline(chunks(tracker, 3), merge_with([camera])))
+        whole = merge_clips([tracker, camera])
+        self.assertEqual(whole.lens_focus_distance, merged.lens_focus_distance)
+        self.assertEqual(tracker.lens_focal_length, merged.lens_focal_length)
+
+    def test_analyze(self):
+        clip = _clip(10)
+        clip.timing_sequence_number = (0, 1, 2, 3, 5, 6, 7, 8, 9, 10)
+        analyzer = TimingAnalyzer()
+        self.assertEqual(10, collect(pipeline(chunks(clip, 3), analyze(analyzer))).frame_count())
+        self.assertEqual(analyze_clip(clip), analyzer.report())
+        self.assertEqual(1, analyzer.report().sequence_dropped)
+
+    def test_sinks(self):
+        clip = _clip(10)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "clip.ndjson"
+            self.assertEqual(10, write_ndjson(chunks(clip, 3), path))
+            lines = path.read_text(encoding="utf-8").splitlines()
+            self.assertEqual([json.loads(json.dumps(f)) for f in clip.frames_to_json()],
+                             [json.loads(line) for line in lines])
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as receiver, \
+                socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender:
+            receiver.bind(("127.0.0.1", 0))
+            receiver.settimeout(1.0)
+            self.assertEqual(10, send_udp(chunks(clip, 4), sender, receiver.getsockname()))
+            received = [json.loads(receiver.recv(65536)) for _ in range(10)]
+            self.assertEqual([9], received[-1]["timing"]["sequenceNumber"])
+
+        def slow_source():
+            time.sleep(0.05)
+            yield slice_clip(clip, 0, 3)
+
+        class Recorder:
+            def __init__(self):
+                self.sent = []
+
+            def sendto(self, payload, address):
+                self.sent.append(time.perf_counter())
+
+        # pacing starts at the first send, so the time spent producing the
+        # first chunk does not release its samples in a burst
+        recorder = Recorder()
+        self.assertEqual(3, send_udp(slow_source(), recorder, ("127.0.0.1", 0), Fraction(50)))
+        self.assertGreater(recorder.sent[-1] - recorder.sent[0], 0.03)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -54,3 +54,13 @@ def test_reader(self):
       clip.active_sensor_physical_dimensions,
       camdkit.model.Dimensions(width=(4096 * 5 / 1000.0), height=(2160 * 5 / 1000.0))
     )
+
+  def test_static(self):
+    with open("src/test/resources/red/A001_C066_0303LZ_001.static.csv", "r", encoding="utf-8") as type_3_file, \
+      open("src/test/resources/red/A001_C066_0303LZ_001.frames.csv", "r", encoding="utf-8") as type_5_file:
+      clip = camdkit.red.reader.to_clip(type_3_file, type_5_file)
+
+    with open("src/test/resources/red/A001_C066_0303LZ_001.static.csv", "r", encoding="utf-8") as type_3_file:
+      static = camdkit.red.reader.to_static(type_3_file)
+
+    self.assertEqual(static, clip.static)
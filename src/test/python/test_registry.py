@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+"""Tests for the vendor reader registry"""
+
+import sys
+import unittest
+
+from camdkit.registry import STATIC, DYNAMIC, READERS, detect, get_reader, read_clip, read_static, open_clip
+
+RED_STATIC = "src/test/resources/red/A001_C066_0303LZ_001.static.csv"
+RED_FRAMES = "src/test/resources/red/A001_C066_0303LZ_001.frames.csv"
+
+
+class RegistryTestCases(unittest.TestCase):
+
+    def test_detection(self):
+        self.assertEqual(('arri', DYNAMIC), detect("src/test/resources/arri/B001C001_180327_R1ZA.mov.csv"))
+        self.assertEqual(('bmd', DYNAMIC), detect("src/test/resources/bmd/metadata.txt"))
+        self.assertEqual(('canon', STATIC),
+                         detect("src/test/resources/canon/20221007_TNumber_CanonCameraMetadata_Static.csv"))
+        self.assertEqual(('canon', DYNAMIC),
+                         detect("src/test/resources/canon/20221007_TNumber_CanonCameraMetadata_Frames.csv"))
+        self.assertEqual(('mosys', DYNAMIC), detect("src/test/resources/mosys/A003_C001_01 15-03-47-01.f4"))
+        self.assertEqual(('red', STATIC), detect(RED_STATIC))
+        self.assertEqual(('red', DYNAMIC), detect(RED_FRAMES))
+        self.assertEqual(('venice', STATIC), detect("src/test/resources/venice/D001C005_210716AGM01.xml"))
+        self.assertEqual(('venice', DYNAMIC), detect("src/test/resources/venice/D001C005_210716AG.csv"))
+        self.assertIsNone(detect("src/test/resources/red/README.txt"))
+
+    def test_open_clip(self):
+        # file order doesn't matter
+        clip = open_clip(RED_FRAMES, RED_STATIC)
+        self.assertEqual("RED", clip.camera_make)
+        self.assertEqual(2, clip.frame_count())
+        with self.assertRaises(ValueError):
+            open_clip(RED_STATIC)
+        with self.assertRaises(ValueError):
+            open_clip(RED_STATIC, "src/test/resources/venice/D001C005_210716AG.csv")
+
+    def test_read_static(self):
+        canon = ("src/test/resources/canon/20221007_TNumber_CanonCameraMetadata_Static.csv",
+                 "src/test/resources/canon/20221007_TNumber_CanonCameraMetadata_Frames.csv")
+        arri = ("src/test/resources/arri/B001C001_180327_R1ZA.mov.csv",)
+        for vendor, paths in (('canon', canon), ('red', (RED_STATIC, RED_FRAMES))):
+            self.assertEqual(read_clip(vendor, paths).static, read_static(vendor, paths))
+        # ARRI files give the duration only as the number of frame rows
+        static = read_static('arri', arri)
+        static.duration = read_clip('arri', arri).duration
+        self.assertEqual(read_clip('arri', arri).static, static)
+        with self.assertRaises(ValueError):
+            read_static('bmd', ("src/test/resources/bmd/metadata.txt",))
+
+    def test_lazy_import(self):
+        self.assertEqual({'arri', 'bmd', 'canon', 'mosys', 'red', 'venice'}, set(READERS))
+        sys.modules.pop('camdkit.bmd.reader', None)
+        detect("src/test/resources/bmd/metadata.txt")
+        self.assertNotIn('camdkit.bmd.reader', sys.modules)
+        self.assertTrue(hasattr(get_reader('bmd'), 'to_clip'))
+        self.assertIn('camdkit.bmd.reader', sys.modules)
+        with self.assertRaises(ValueError):
+            get_reader('nikon')
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+"""Tests for run-length encoding of regular parameters"""
+
+import unittest
+from fractions import Fraction
+
+from camdkit.clip import Clip
+from camdkit.lens_types import FizEncoders
+from camdkit.rle import encode_runs, decode_runs, share_runs, compress_json, expand_json, is_compressed
+
+
+class RLETestCases(unittest.TestCase):
+
+    def test_runs(self):
+        self.assertEqual([], encode_runs(()))
+        self.assertEqual([(2, "a"), (1, "b"), (3, "a")], encode_runs("aabaaa"))
+        self.assertEqual(tuple("aabaaa"), decode_runs(encode_runs("aabaaa")))
+        values = [[1, 2], [1, 2], [3]]
+        shared = share_runs(values)
+        self.assertEqual(tuple(values), shared)
+        self.assertIs(shared[0], shared[1])
+        self.assertIsNot(shared[1], shared[2])
+
+    def test_json(self):
+        clip_json = {"static": {"lens": {"make": ["not", "a", "run", "run", "run"]}},
+                     "tracker": {"status": ["Ok"] * 4, "recording": [True, False]},
+                     "sampleId": ["a", "b", "c"]}
+        compressed = compress_json(clip_json)
+        self.assertEqual({"rle": [[4, "Ok"]]}, compressed["tracker"]["status"])
+        self.assertEqual([True, False], compressed["tracker"]["recording"])
+        self.assertEqual(["a", "b", "c"], compressed["sampleId"])
+        self.assertEqual(clip_json["static"], compressed["static"])
+        self.assertEqual(("Ok",) * 4, expand_json(compressed)["tracker"]["status"])
+        self.assertEqual(clip_json, expand_json(clip_json))
+        self.assertTrue(is_compressed(compressed))
+        self.assertFalse(is_compressed(clip_json))
+        self.assertTrue(is_compressed({"sampleId": {"rle": [[2, "a"]]}}))
+
+    def test_clip(self):
+        frames = 100
+        clip = Clip()
+        clip.timing_sample_rate = (Fraction(24000, 1001),) * frames
+        clip.lens_encoders = tuple(FizEncoders(focus=0.5, iris=0.25) for _ in range(frames))
+        clip.lens_focal_length = tuple(float(20 if i < 50 else 35) for i in range(frames))
+        clip.timing_sequence_number = tuple(range(frames))
+
+        self.assertEqual(2, len({id(e) for e in clip.lens_encoders[:2]}))
+        clip.compact()
+        self.assertEqual(1, len({id(e) for e in clip.lens_encoders}))
+        self.assertEqual(2, len({id(f) for f in clip.lens_focal_length}))
+        self.assertEqual(tuple(range(frames)), clip.timing_sequence_number)
+
+        clip_json = clip.to_json(rle=True)
+        self.assertEqual({"rle": [[50, 20.0], [50, 35.0]]}, clip_json["lens"]["focalLength"])
+        self.assertEqual(list(range(frames)), list(clip_json["timing"]["sequenceNumber"]))
+        self.assertEqual(clip.to_json(), expand_json(clip_json))
+
+        round_trip = Clip.from_json(clip_json)
+        self.assertEqual(clip, round_trip)
+        self.assertIs(round_trip.lens_encoders[0], round_trip.lens_encoders[-1])
+        self.assertEqual(clip, Clip.from_json(clip.to_json()))
+
+    def test_shared_values(self):
+        clip = Clip()
+        clip.lens_encoders = tuple(FizEncoders(focus=0.5, iris=0.25) for _ in range(3))
+        clip.compact()
+        # a change in place changes the whole run...
+        clip.lens_encoders[0].focus = 0.75
+        self.assertEqual((0.75,) * 3, tuple(e.focus for e in clip.lens_encoders))
+        # ...so a single sample is changed by replacing its value
+        clip.lens_encoders = (FizEncoders(focus=0.5, iris=0.25),) + clip.lens_encoders[1:]
+        self.assertEqual((0.5, 0.75, 0.75), tuple(e.focus for e in clip.lens_encoders))
+
+
+if __name__ == '__main__':
+    unittest.main()
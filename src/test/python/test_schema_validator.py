@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+"""Tests for the compiled JSON Schema validator"""
+
+import copy
+import json
+import unittest
+
+import jsonschema
+
+from camdkit.clip import Clip
+from camdkit.examples import _get_recommended_dynamic_clip, _get_complete_dynamic_clip
+from camdkit.schema_validator import (SchemaValidationError, compile_schema, sample_validator,
+                                      validate_sample, sample_from_frame)
+
+
+def complete_sample():
+    frame_json = next(iter(_get_complete_dynamic_clip().frames_to_json()))
+    return json.loads(json.dumps(sample_from_frame(frame_json)))
+
+
+class SchemaValidatorTestCases(unittest.TestCase):
+
+    def test_valid_samples(self):
+        for clip in (_get_recommended_dynamic_clip(), _get_complete_dynamic_clip()):
+            for frame_json in clip.frames_to_json():
+                validate_sample(sample_from_frame(frame_json))
+        self.assertIs(sample_validator(), sample_validator())
+
+    def test_agrees_with_jsonschema(self):
+        schema = Clip.make_json_schema()
+
+        def mutated(path, value):
+            sample = complete_sample()
+            *parents, last = path
+            node = sample
+            for key in parents:
+                node = node[key]
+            if value is KeyError:
+                del node[last]
+            else:
+                node[last] = value
+            return sample
+
+        cases = (mutated(("lens", "encoders"), {}),
+                 mutated(("lens", "encoders", "focus"), 1.5),
+                 mutated(("lens", "focalLength"), 0.0),
+                 mutated(("lens", "distortion"), []),
+                 mutated(("lens", "distortion", 0, "radial"), []),
+                 mutated(("transforms", 1, "rotation", "pan"), "x"),
+                 mutated(("transforms", 0, "translation"), {"x": 1.0, "w": 2.0}),
+                 mutated(("timing", "mode"), "sideways"),
+                 mutated(("timing", "sampleRate", "num"), 1.5),
+                 mutated(("timing", "sampleRate", "denom"), KeyError),
+                 mutated(("protocol", "version"), [0, 9, 0, 1]),
+                 mutated(("sampleId",), "urn:uuid:not-a-uuid"),
+                 mutated(("tracker", "recording"), 1),
+                 mutated(("tracker", "notes"), ""),
+                 mutated(("unknown",), 1),
+                 mutated(("lens", "encoders", "focus"), 1.0),
+                 mutated(("timing", "sampleRate", "num"), 25.0))
+        validate = compile_schema(schema)
+        for sample in cases:
+            expected = jsonschema.Draft202012Validator(schema).is_valid(sample)
+            try:
+                validate(sample)
+                actual = True
+            except SchemaValidationError:
+                actual = False
+            self.assertEqual(expected, actual, json.dumps(sample)[:200])
+
+    def test_error_path(self):
+        sample = complete_sample()
+        sample["transforms"][1]["rotation"]["pan"] = "x"
+        with self.assertRaises(SchemaValidationError) as cm:
+            validate_sample(sample)
+        self.assertEqual("/transforms/1/rotation/pan", cm.exception.path)
+        self.assertEqual("is not of type number", cm.exception.message)
+        with self.assertRaises(SchemaValidationError) as cm:
+            validate_sample([])
+        self.assertEqual("", cm.exception.path)
+
+    def test_keywords(self):
+        validate = compile_schema({"type": ["integer", "null"], "minimum": 0, "exclusiveMaximum": 10})
+        for valid in (0, 9, None, 3.0):
+            validate(valid)
+        for invalid in (-1, 10, 2.5, "1", True):
+            with self.assertRaises(SchemaValidationError):
+                validate(invalid)
+        validate = compile_schema({"oneOf": [{"const": 1}, {"enum": [1, 2]}], "uniqueItems": True})
+        validate(2)
+        with self.assertRaises(SchemaValidationError):
+            validate(1)
+        validate = compile_schema({"items": {"type": "string"}, "uniqueItems": True,
+                                   "additionalProperties": {"type": "number"}})
+        validate(["a", "b"])
+        validate({"x": 1})
+        for invalid in (["a", "a"], [1], {"x": "1"}):
+            with self.assertRaises(SchemaValidationError):
+                validate(invalid)
+        with self.assertRaises(ValueError):
+            compile_schema({"$ref": "#/$defs/x"})
+
+    def test_json_equality(self):
+        validate = compile_schema({"enum": [1, "a", [1, 2]]})
+        for valid in (1, 1.0, "a", [1, 2], (1.0, 2)):
+            validate(valid)
+        for invalid in (True, [True, 2], "1"):
+            with self.assertRaises(SchemaValidationError):
+                validate(invalid)
+        validate = compile_schema({"const": {"x": False}})
+        validate({"x": False})
+        with self.assertRaises(SchemaValidationError):
+            validate({"x": 0})
+        validate = compile_schema({"uniqueItems": True})
+        validate([1, True, 0, False])
+        with self.assertRaises(SchemaValidationError):
+            validate([1, 1.0])
+
+    def test_keyword_values_checked(self):
+        injected = '99 or print("INJECTED") or 99'
+        for schema in ({"type": "string", "maxLength": injected},
+                       {"type": "string", "minLength": True},
+                       {"type": "array", "minItems": 1.5},
+                       {"type": "array", "maxItems": -1},
+                       {"type": "number", "minimum": injected},
+                       {"type": "number", "exclusiveMaximum": False},
+                       {"type": "number", "maximum": float("nan")},
+                       {"type": "object", "required": [0]}):
+            with self.assertRaises(ValueError):
+                compile_schema(schema)
+        validate = compile_schema({"type": "number", "minimum": 0.5, "maximum": 10})
+        validate(5)
+        with self.assertRaises(SchemaValidationError):
+            validate(0.25)
+
+    def test_does_not_modify_schema(self):
+        schema = Clip.make_json_schema()
+        before = copy.deepcopy(schema)
+        compile_schema(schema)
+        self.assertEqual(before, schema)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+"""Tests for Clips shared between processes"""
+
+import tempfile
+import unittest
+import multiprocessing
+from pathlib import Path
+
+from camdkit.clip import Clip
+from camdkit.mosys import reader
+from camdkit.shared import SharedClipView, publish, attach, write_shared, open_shared
+
+
+def _focal_lengths(name: str) -> tuple[float, ...]:
+    with attach(name) as view:
+        return tuple(view.lens_focal_length)
+
+
+class SharedClipTestCases(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.clip = reader.to_clip("src/test/resources/mosys/A003_C001_01 15-03-47-01.f4", 19)
+        cls.clip.camera_make = "Bogus"
+
+    def test_round_trip(self):
+        with publish(self.clip) as shared:
+            with attach(shared.name) as view:
+                self.assertEqual(20, view.frame_count())
+                self.assertEqual(self.clip.to_json(), view.to_clip().to_json())
+                self.assertEqual(self.clip.to_json(), Clip.from_json(view.to_clip(0, 20).to_json()).to_json())
+                self.assertEqual(self.clip[5].to_json(), view[5].to_json())
+                self.assertEqual("Bogus", view.camera_make)
+                self.assertIsNone(view.camera_model)
+                self.assertIsNone(view.lens_t_number)
+
+    def test_columns(self):
+        with publish(self.clip) as shared, attach(shared.name) as view:
+            self.assertEqual(self.clip.lens_focal_length, tuple(view.lens_focal_length))
+            self.assertEqual(self.clip.lens_focal_length[-1], view.lens_focal_length[-1])
+            self.assertEqual(self.clip.transforms[3:7], view.transforms[3:7])
+            self.assertEqual(self.clip.tracker_recording, tuple(view.tracker_recording))
+            self.assertEqual(self.clip.timing_timecode[2], view.timing_timecode[2])
+            with self.assertRaises(IndexError):
+                view.lens_focal_length[20]
+            with self.assertRaises(AttributeError):
+                view.not_a_parameter
+
+    def test_column_lengths(self):
+        clip = Clip()
+        clip.lens_focal_length = (1.0,)
+        clip.lens_focus_distance = (5.0, 6.0, 7.0)
+        clip.timing_sequence_number = ()
+        clip.sample_id = ()
+        with publish(clip) as shared, attach(shared.name) as view:
+            self.assertEqual((1.0,), tuple(view.lens_focal_length))
+            self.assertEqual((5.0, 6.0, 7.0), tuple(view.lens_focus_distance))
+            self.assertEqual((), tuple(view.timing_sequence_number))
+            self.assertEqual((), view.sample_id[:])
+            with self.assertRaises(IndexError):
+                view.lens_focal_length[1]
+            self.assertEqual(clip.to_json(), view.to_clip().to_json())
+
+    def test_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_shared(self.clip, Path(tmp) / "clip.camdk")
+            view = open_shared(path)
+            self.assertIsInstance(view, SharedClipView)
+            self.assertEqual(self.clip.to_json(), view.to_clip().to_json())
+            view.close()
+            with self.assertRaises(ValueError):
+                path.write_bytes(b"\0" * 64)
+                open_shared(path)
+
+    def test_other_process(self):
+        with publish(self.clip) as shared:
+            with multiprocessing.get_context("spawn").Pool(1) as pool:
+                self.assertEqual(self.clip.lens_focal_length, pool.apply(_focal_lengths, (shared.name,)))
+
+
+if __name__ == '__main__':
+    unittest.main()
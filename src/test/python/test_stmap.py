@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright Contributors to the SMTPE RIS OSVP Metadata Project
+
+"""Tests for cached ST-map generation"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from camdkit.camera_types import PhysicalDimensions
+from camdkit.clip import Clip
+from camdkit.distortion import LensDistortion
+from camdkit.lens_types import Distortion
+from camdkit.stmap import DISTORT, STMapGenerator, lens_state, write_stmap, read_stmap
+
+DIMENSIONS = PhysicalDimensions(width=36.0, height=24.0)
+BARREL = LensDistortion(radial=(1e-4, 2e-7), tangential=(1e-4, -2e-4))
+
+
+class STMapTestCases(unittest.TestCase):
+
+    def test_identity(self):
+        stmap = STMapGenerator(4, 2, DIMENSIONS).map_for(LensDistortion())
+        self.assertEqual(4 * 2 * 2 * 4, stmap.nbytes)
+        self.assertEqual((0.125, 0.75), stmap[0, 0])
+        self.assertEqual((0.875, 0.25), stmap[3, 1])
+
+    def test_directions(self):
+        undistort = STMapGenerator(8, 6, DIMENSIONS).map_for(BARREL)
+        distort = STMapGenerator(8, 6, DIMENSIONS, direction=DISTORT).map_for(BARREL)
+        # the corner of the undistorted image comes from nearer the centre of the distorted one
+        self.assertGreater(undistort[0, 0][0], 1 / 16)
+        self.assertLess(distort[0, 0][0], 1 / 16)
+        with self.assertRaises(ValueError):
+            STMapGenerator(8, 6, DIMENSIONS, direction="sideways")
+
+    def test_interpolation(self):
+        mild = LensDistortion(radial=(1e-4,), tangential=(1e-5, -2e-5))
+        exact = STMapGenerator(33, 17, DIMENSIONS).map_for(mild)
+        interpolated = STMapGenerator(33, 17, DIMENSIONS, step=4).map_for(mild)
+        self.assertEqual(exact[0, 0], interpolated[0, 0])
+        self.assertEqual(exact[32, 16], interpolated[32, 16])
+        for e, i in zip(exact.data, interpolated.data):
+            self.assertAlmostEqual(e, i, delta=2e-3)
+
+    def test_cache(self):
+        generator = STMapGenerator(8, 6, DIMENSIONS, max_bytes=2 * 8 * 6 * 2 * 4)
+        first = generator.map_for(BARREL, 35.0)
+        self.assertIs(first, generator.map_for(LensDistortion(radial=(1e-4 + 1e-12, 2e-7),
+                                                              tangential=(1e-4, -2e-4)), 35.0))
+        generator.map_for(BARREL, 50.0)
+        generator.map_for(LensDistortion(), 35.0)
+        statistics = generator.statistics()
+        self.assertEqual((1, 3, 1, 2), (statistics.hits, statistics.misses, statistics.evictions,
+                                        statistics.entries))
+        self.assertEqual(0.25, statistics.hit_rate)
+        # the least recently used was evicted
+        self.assertIsNot(first, generator.map_for(BARREL, 35.0))
+        generator.clear()
+        self.assertEqual((0, 0), (generator.statistics().entries, generator.statistics().nbytes))
+
+    def test_nearby_states(self):
+        # encoder noise of about 1e-5 of each term shares a map...
+        noisy = LensDistortion(radial=(1.00001e-4, 2.000002e-7), tangential=(1.00001e-4, -2.00002e-4),
+                               distortion_offset=(1e-4, -1e-4))
+        self.assertEqual(lens_state(BARREL, DIMENSIONS, 35.0), lens_state(noisy, DIMENSIONS, 35.0004))
+        generator = STMapGenerator(8, 6, DIMENSIONS)
+        self.assertIs(generator.map_for(BARREL, 35.0), generator.map_for(noisy, 35.0004))
+        self.assertEqual(1, generator.statistics().hits)
+        # ...but not a change of lens state that moves the image
+        moved = LensDistortion(radial=(1.01e-4, 2e-7), tangential=(1e-4, -2e-4))
+        self.assertNotEqual(lens_state(BARREL, DIMENSIONS), lens_state(moved, DIMENSIONS))
+        self.assertNotEqual(lens_state(BARREL, DIMENSIONS, 35.0), lens_state(BARREL, DIMENSIONS, 35.1))
+
+    def test_map_for_clip(self):
+        clip = Clip()
+        clip.lens_distortions = ((Distortion([1e-4, 2e-7], [1e-4, -2e-4]),),) * 3
+        clip.lens_focal_length = (35.0, 35.0, 50.0)
+        generator = STMapGenerator(8, 6, DIMENSIONS)
+        self.assertEqual(lens_state(BARREL, DIMENSIONS, 35.0),
+                         lens_state(LensDistortion.from_clip(clip, 1), DIMENSIONS, 35.0))
+        maps = [generator.map_for_clip(clip, i) for i in range(3)]
+        self.assertIs(maps[0], maps[1])
+        self.assertEqual((1, 2), (generator.statistics().hits, generator.statistics().misses))
+
+    def test_file(self):
+        stmap = STMapGenerator(8, 6, DIMENSIONS).map_for(BARREL)
+        with tempfile.TemporaryDirectory() as directory:
+            path = write_stmap(stmap, Path(directory) / "barrel.stmap")
+            self.assertEqual(stmap.nbytes, path.stat().st_size)
+            self.assertEqual(stmap, read_stmap(path, 8, 6))
+            with self.assertRaises(ValueError):
+                read_stmap(path, 8, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
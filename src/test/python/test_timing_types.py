@@ -19,11 +19,16 @@
                                   TimecodeFormat,
                                   Timecode,
                                   Timestamp,
+                                  TimestampColumn,
                                   SynchronizationSource,
                                   SynchronizationOffsets,
                                   SynchronizationPTP,
                                   Synchronization,
-                                  Timing)
+                                  Timing,
+                                  timecodes_to_frames,
+                                  frames_to_timecodes,
+                                  find_timecode,
+                                  timecode_discontinuities)
 
 
 
@@ -228,6 +233,54 @@ def test_timecode(self):
         actual_schema = Timecode.make_json_schema()
         self.assertEqual(expected_schema, actual_schema)
 
+    def test_timecode_frame_counts(self):
+        fps_25 = TimecodeFormat(25)
+        self.assertEqual(((1 * 60 + 2) * 60 + 3) * 25 + 4, Timecode(1, 2, 3, 4, fps_25).to_frames())
+        self.assertEqual(Timecode(1, 2, 3, 4, fps_25), Timecode.from_frames(93079, fps_25))
+        self.assertEqual(Timecode(0, 0, 0, 0, fps_25), Timecode(23, 59, 59, 24, fps_25) + 1)
+        self.assertEqual(Timecode(23, 59, 59, 24, fps_25), Timecode(0, 0, 0, 0, fps_25) - 1)
+        self.assertEqual(26, Timecode(0, 0, 2, 1, fps_25) - Timecode(0, 0, 1, 0, fps_25))
+        self.assertFalse(fps_25.is_drop_frame())
+        self.assertFalse(TimecodeFormat(StrictlyPositiveRational(24000, 1001)).is_drop_frame())
+        # drop frame: frame numbers 0 and 1 are skipped at each minute but every tenth
+        df_30 = TimecodeFormat(StrictlyPositiveRational(30000, 1001))
+        self.assertTrue(df_30.is_drop_frame())
+        self.assertEqual(1800, Timecode(0, 1, 0, 2, df_30).to_frames())
+        self.assertEqual(Timecode(0, 1, 0, 2, df_30), Timecode(0, 0, 59, 29, df_30) + 1)
+        self.assertEqual(Timecode(0, 10, 0, 0, df_30), Timecode(0, 9, 59, 29, df_30) + 1)
+        self.assertEqual(17982, Timecode(0, 10, 0, 0, df_30).to_frames())
+        self.assertEqual(2589408, df_30.frames_per_day())
+        df_60 = TimecodeFormat(StrictlyPositiveRational(60000, 1001))
+        self.assertEqual(Timecode(0, 1, 0, 4, df_60), Timecode(0, 0, 59, 59, df_60) + 1)
+        # the dropped frame numbers are not labels of any frame
+        for dropped in (Timecode(0, 1, 0, 0, df_30), Timecode(1, 59, 0, 1, df_30), Timecode(0, 1, 0, 3, df_60)):
+            with self.assertRaises(ValueError):
+                dropped.to_frames()
+            with self.assertRaises(ValueError):
+                timecodes_to_frames((dropped,))
+        for n in range(0, df_30.frames_per_day(), 997):
+            self.assertEqual(n, Timecode.from_frames(n, df_30).to_frames())
+
+    def test_timecode_sequences(self):
+        df_30 = TimecodeFormat(StrictlyPositiveRational(30000, 1001))
+        start = Timecode(0, 0, 59, 27, df_30)
+        timecodes = frames_to_timecodes(range(start.to_frames(), start.to_frames() + 6), df_30)
+        self.assertEqual(Timecode(0, 1, 0, 2, df_30), timecodes[3])
+        frame_counts = timecodes_to_frames(timecodes)
+        self.assertEqual(list(range(1797, 1803)), frame_counts.tolist())
+        self.assertEqual(3, find_timecode(timecodes, Timecode(0, 1, 0, 2, df_30)))
+        self.assertEqual(3, find_timecode(frame_counts, Timecode(0, 1, 0, 2, df_30)))
+        self.assertIsNone(find_timecode(timecodes, Timecode(0, 2, 0, 2, df_30)))
+        self.assertEqual(3, find_timecode(frame_counts, Timecode(0, 1, 0, 2, df_30), assume_sorted=True))
+        self.assertIsNone(find_timecode(frame_counts, Timecode(0, 2, 0, 2, df_30), assume_sorted=True))
+        self.assertEqual([], timecode_discontinuities(timecodes))
+        fps_25 = TimecodeFormat(25)
+        jumpy = (Timecode(23, 59, 59, 24, fps_25), Timecode(0, 0, 0, 0, fps_25),
+                 Timecode(0, 0, 0, 0, fps_25), Timecode(0, 0, 0, 2, fps_25))
+        self.assertEqual([2, 3], timecode_discontinuities(jumpy))
+        self.assertEqual([3], timecode_discontinuities(jumpy, allow_repeats=True))
+        self.assertEqual(1, find_timecode(jumpy[::-1], Timecode(0, 0, 0, 0, fps_25)))
+
     def test_timestamp(self):
         with self.assertRaises(ValidationError):
             Timestamp('foo', 0)
@@ -273,6 +326,46 @@ def test_timestamp(self):
         # actual_schema = Timing.make_json_schema()["properties"]["sampleTimestamp"]
         # self.assertEqual(expected_schema, actual_schema)
 
+    def test_timestamp_arithmetic(self):
+        earlier, later = Timestamp(3, 999_999_999), Timestamp(4, 1)
+        self.assertLess(earlier, later)
+        self.assertGreaterEqual(later, earlier)
+        self.assertEqual(2, later - earlier)
+        self.assertEqual(later, Timestamp.from_nanoseconds(later.to_nanoseconds()))
+        largest = Timestamp(MAX_UINT_48, MAX_UINT_32)
+        self.assertEqual(b"\xff" * 10, largest.to_ptp())
+        self.assertEqual(largest, Timestamp.from_ptp(largest.to_ptp()))
+        self.assertEqual(Timestamp(1, 2), Timestamp.from_ptp(b"\x00\x00\x00\x00\x00\x01\x00\x00\x00\x02"))
+
+    def test_timestamp_column(self):
+        timestamps = (Timestamp(5, 0), Timestamp(3, 500), Timestamp(4, 0), Timestamp(3, 0))
+        column = TimestampColumn.from_timestamps(timestamps)
+        self.assertEqual(4, len(column))
+        self.assertEqual(48, column.nbytes)
+        self.assertEqual(timestamps, column.to_timestamps())
+        self.assertEqual(Timestamp(3, 500), column[1])
+        self.assertEqual(column, TimestampColumn.from_ptp(column.to_ptp()))
+        self.assertEqual(column, TimestampColumn.from_nanoseconds(column.to_nanoseconds()))
+        self.assertEqual([-1_999_999_500, 999_999_500, -1_000_000_000], column.intervals())
+        self.assertEqual([2_000_000_000, 500, 1_000_000_000, 0], column - Timestamp(3, 0))
+        self.assertEqual([0, 0, 0, 0], column - column)
+        self.assertEqual([3, 1, 2, 0], column.argsort())
+        self.assertFalse(column.is_sorted())
+        ordered = column.sorted()
+        self.assertTrue(ordered.is_sorted())
+        self.assertEqual(range(1, 3), ordered.search(Timestamp(3, 1), Timestamp(5, 0)))
+        self.assertEqual(range(4, 4), ordered.search(Timestamp(6, 0), Timestamp(7, 0)))
+        with self.assertRaises(ValueError):
+            TimestampColumn([-1], [0])
+        with self.assertRaises(ValueError):
+            TimestampColumn.from_ptp(b"\x00" * 11)
+        with self.assertRaises(ValueError):
+            TimestampColumn([0], [1_000_000_000])
+        with self.assertRaises(ValueError):
+            TimestampColumn.from_ptp(bytes(6) + (1_000_000_000).to_bytes(4, "big"))
+        with self.assertRaises(ValueError):
+            TimestampColumn.from_nanoseconds([-1])
+
     def test_synchronization_source_validation(self) -> None:
         # not perfect but better than nothing
         # TODO use changes in snake case to insert underscores
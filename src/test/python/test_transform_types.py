@@ -17,7 +17,13 @@
 from camdkit.clip import Clip
 from camdkit.compatibility import canonicalize_descriptions
 from camdkit.string_types import UUIDURN
-from camdkit.transform_types import Vector3, Rotator3, Transform
+from camdkit.transform_types import (Vector3, Rotator3, Transform,
+                                     IDENTITY_MATRIX4, transform_to_matrix, multiply_matrices,
+                                     invert_matrix, compose_transforms, world_matrices,
+                                     inverse_world_matrices, rotator_to_quaternion,
+                                     quaternion_to_rotator, rotators_to_quaternions,
+                                     quaternions_to_rotators, multiply_quaternions, slerp, nlerp,
+                                     resample_transforms, world_poses)
 from camdkit.units import DEGREE, METER
 
 
@@ -207,5 +213,99 @@ def test_transform(self):
         self.assertEqual(expected_schema, actual_schema)
 
 
+    def assertMatrixAlmostEqual(self, expected, actual):
+        for e, a in zip(expected, actual, strict=True):
+            self.assertAlmostEqual(e, a)
+
+    @staticmethod
+    def apply(m, p):
+        return tuple(m[4 * r] * p[0] + m[4 * r + 1] * p[1] + m[4 * r + 2] * p[2] + m[4 * r + 3]
+                     for r in range(3))
+
+    def test_transform_to_matrix(self):
+        def rotation_only(pan, tilt, roll):
+            return transform_to_matrix(Transform(translation=Vector3(0.0, 0.0, 0.0),
+                                                 rotation=Rotator3(pan, tilt, roll)))
+        forward = (0.0, 1.0, 0.0)
+        self.assertMatrixAlmostEqual(IDENTITY_MATRIX4, rotation_only(0.0, 0.0, 0.0))
+        self.assertMatrixAlmostEqual((-1.0, 0.0, 0.0), self.apply(rotation_only(90.0, 0.0, 0.0), forward))
+        self.assertMatrixAlmostEqual((0.0, 0.0, 1.0), self.apply(rotation_only(0.0, 90.0, 0.0), forward))
+        self.assertMatrixAlmostEqual((0.0, 0.0, -1.0), self.apply(rotation_only(0.0, 0.0, 90.0), (1.0, 0.0, 0.0)))
+        # intrinsic ZXY: tilt applies in the panned frame
+        self.assertMatrixAlmostEqual((0.0, 0.0, 1.0), self.apply(rotation_only(90.0, 90.0, 0.0), forward))
+        scaled = Transform(translation=Vector3(1.0, 2.0, 3.0), rotation=Rotator3(0.0, 0.0, 0.0),
+                           scale=Vector3(2.0, 3.0, 4.0))
+        self.assertMatrixAlmostEqual((3.0, 5.0, 7.0), self.apply(transform_to_matrix(scaled), (1.0, 1.0, 1.0)))
+
+    def test_compose_and_invert(self):
+        crane = Transform(translation=Vector3(1.0, 0.0, 0.0), rotation=Rotator3(90.0, 0.0, 0.0))
+        camera = Transform(translation=Vector3(0.0, 1.0, 0.5), rotation=Rotator3(10.0, 20.0, 30.0),
+                           scale=Vector3(1.0, 2.0, 1.0))
+        world = compose_transforms((crane, camera))
+        self.assertMatrixAlmostEqual((0.0, 0.0, 0.5), self.apply(world, (0.0, 0.0, 0.0)))
+        self.assertMatrixAlmostEqual(multiply_matrices(transform_to_matrix(crane), transform_to_matrix(camera)),
+                                     world)
+        self.assertMatrixAlmostEqual(IDENTITY_MATRIX4, multiply_matrices(world, invert_matrix(world)))
+        frames = ((crane, camera), (crane,), ())
+        self.assertEqual((world, transform_to_matrix(crane), IDENTITY_MATRIX4), world_matrices(frames))
+        for m, inverse in zip(world_matrices(frames), inverse_world_matrices(frames)):
+            self.assertMatrixAlmostEqual(IDENTITY_MATRIX4, multiply_matrices(inverse, m))
+        flattened = Transform(translation=Vector3(0.0, 0.0, 0.0), rotation=Rotator3(0.0, 0.0, 0.0),
+                              scale=Vector3(1.0, 0.0, 1.0))
+        with self.assertRaises(ValueError):
+            invert_matrix(transform_to_matrix(flattened))
+
+    def test_quaternions(self):
+        for pan, tilt, roll in ((0.0, 0.0, 0.0), (10.0, 20.0, 30.0), (-170.0, 85.0, 120.0), (45.0, -60.0, -90.0)):
+            q = rotator_to_quaternion(Rotator3(pan, tilt, roll))
+            self.assertAlmostEqual(1.0, sum(c * c for c in q))
+            r = quaternion_to_rotator(q)
+            self.assertMatrixAlmostEqual((pan, tilt, roll), (r.pan, r.tilt, r.roll))
+        # the quaternion of a Rotator3 is that of its matrix
+        crane = Transform(translation=Vector3(1.0, 2.0, 3.0), rotation=Rotator3(10.0, 20.0, 30.0))
+        (position, q), = world_poses(((crane,),))
+        self.assertMatrixAlmostEqual((1.0, 2.0, 3.0), position)
+        self.assertMatrixAlmostEqual(rotator_to_quaternion(crane.rotation), q)
+        composed = multiply_quaternions(rotator_to_quaternion(Rotator3(90.0, 0.0, 0.0)),
+                                        rotator_to_quaternion(Rotator3(0.0, 90.0, 0.0)))
+        self.assertMatrixAlmostEqual(rotator_to_quaternion(Rotator3(90.0, 90.0, 0.0)), composed)
+        # gimbal lock folds roll into pan
+        locked = quaternion_to_rotator(rotator_to_quaternion(Rotator3(30.0, 90.0, 20.0)))
+        self.assertMatrixAlmostEqual((50.0, 90.0, 0.0), (locked.pan, locked.tilt, locked.roll))
+        rotators = (Rotator3(1.0, 2.0, 3.0), Rotator3(4.0, 5.0, 6.0))
+        for r, round_tripped in zip(rotators, quaternions_to_rotators(rotators_to_quaternions(rotators)), strict=True):
+            self.assertMatrixAlmostEqual((r.pan, r.tilt, r.roll), (round_tripped.pan, round_tripped.tilt,
+                                                                   round_tripped.roll))
+
+    def test_slerp(self):
+        q0 = rotator_to_quaternion(Rotator3(0.0, 0.0, 0.0))
+        q1 = rotator_to_quaternion(Rotator3(90.0, 0.0, 0.0))
+        for t in (0.0, 0.25, 0.5, 1.0):
+            self.assertAlmostEqual(90.0 * t, quaternion_to_rotator(slerp(q0, q1, t)).pan)
+        self.assertAlmostEqual(45.0, quaternion_to_rotator(nlerp(q0, q1, 0.5)).pan)
+        # shortest arc, even across the quaternion double cover
+        q2 = rotator_to_quaternion(Rotator3(-170.0, 0.0, 0.0))
+        q3 = rotator_to_quaternion(Rotator3(170.0, 0.0, 0.0))
+        self.assertAlmostEqual(180.0, abs(quaternion_to_rotator(slerp(q2, q3, 0.5)).pan))
+
+    def test_resample_transforms(self):
+        def chain(x, pan):
+            return (Transform(translation=Vector3(x, 0.0, 0.0), rotation=Rotator3(pan, 0.0, 0.0), id="tracker"),)
+        times = (0.0, 0.02, 0.04)
+        transforms = (chain(0.0, 350.0), chain(1.0, 370.0), chain(2.0, 390.0))
+        resampled = resample_transforms(times, transforms, (-1.0, 0.0, 0.01, 0.03, 1.0))
+        self.assertEqual(transforms[0], resampled[0])
+        self.assertEqual(transforms[0], resampled[1])
+        self.assertEqual(transforms[2], resampled[4])
+        self.assertAlmostEqual(0.5, resampled[2][0].translation.x)
+        # Euler cycles beyond 360 degrees survive the round trip through quaternions
+        self.assertAlmostEqual(360.0, resampled[2][0].rotation.pan)
+        self.assertAlmostEqual(380.0, resampled[3][0].rotation.pan)
+        self.assertEqual("tracker", resampled[3][0].id)
+        self.assertIsNone(resampled[3][0].scale)
+        with self.assertRaises(ValueError):
+            resample_transforms(times, transforms[:2], (0.0,))
+
+
 if __name__ == '__main__':
     unittest.main()
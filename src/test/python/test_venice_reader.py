@@ -53,3 +53,13 @@ def test_reader(self):
       clip.active_sensor_physical_dimensions,
       camdkit.model.Dimensions(width=5674.0 * 5.9375 / 1000.0, height=3192.0 * 5.9375 / 1000.0)
     )
+
+  def test_static(self):
+    with open("src/test/resources/venice/D001C005_210716AGM01.xml", "r", encoding="utf-8") as static_file, \
+      open("src/test/resources/venice/D001C005_210716AG.csv", "r", encoding="utf-8") as dynamic_file:
+      clip = camdkit.venice.reader.to_clip(static_file, dynamic_file)
+
+    with open("src/test/resources/venice/D001C005_210716AGM01.xml", "r", encoding="utf-8") as static_file:
+      static = camdkit.venice.reader.to_static(static_file)
+
+    self.assertEqual(static, clip.static)
@@ -2,11 +2,7 @@
 import sys
 import json
 import camdkit.model
-import camdkit.red.reader
-import camdkit.arri.reader
-import camdkit.venice.reader
-import camdkit.canon.reader
-import camdkit.mosys.reader
+import camdkit.registry
 
 _CLIP_INTRODUCTION = """# OSVP Clip Documentation
 
@@ -96,34 +92,16 @@ def _generate_reader_coverage(fp, reader_name, doc, clip):
         fp.write(" |")
     fp.write("\n")
 
-  # RED reader
-
-  with open("src/test/resources/red/A001_C066_0303LZ_001.static.csv", "r", encoding="utf-8") as type_3_file, \
-    open("src/test/resources/red/A001_C066_0303LZ_001.frames.csv", "r", encoding="utf-8") as type_5_file:
-    clip = camdkit.red.reader.to_clip(type_3_file, type_5_file)
-
-  _generate_reader_coverage(fp, "RED", doc, clip)
-
-  # ARRI reader
-
-  clip = camdkit.arri.reader.to_clip("src/test/resources/arri/B001C001_180327_R1ZA.mov.csv")
-  _generate_reader_coverage(fp, "ARRI", doc, clip)
-
-  # Venice reader
-
-  with open("src/test/resources/venice/D001C005_210716AGM01.xml", "r", encoding="utf-8") as static_file, \
-    open("src/test/resources/venice/D001C005_210716AG.csv", "r", encoding="utf-8") as dynamic_file:
-    clip = camdkit.venice.reader.to_clip(static_file, dynamic_file)
-
-  _generate_reader_coverage(fp, "Venice", doc, clip)
-
-  # Canon reader
-
-  with open("src/test/resources/canon/20221007_TNumber_CanonCameraMetadata_Static.csv", "r", encoding="utf-8") as static_csv, \
-    open("src/test/resources/canon/20221007_TNumber_CanonCameraMetadata_Frames.csv", "r", encoding="utf-8") as frame_csv:
-    clip = camdkit.canon.reader.to_clip(static_csv, frame_csv)
-
-  _generate_reader_coverage(fp, "Canon", doc, clip)
+  for reader_name, vendor, paths in (
+    ("RED", "red", ("src/test/resources/red/A001_C066_0303LZ_001.static.csv",
+                    "src/test/resources/red/A001_C066_0303LZ_001.frames.csv")),
+    ("ARRI", "arri", ("src/test/resources/arri/B001C001_180327_R1ZA.mov.csv",)),
+    ("Venice", "venice", ("src/test/resources/venice/D001C005_210716AGM01.xml",
+                          "src/test/resources/venice/D001C005_210716AG.csv")),
+    ("Canon", "canon", ("src/test/resources/canon/20221007_TNumber_CanonCameraMetadata_Static.csv",
+                        "src/test/resources/canon/20221007_TNumber_CanonCameraMetadata_Frames.csv"))):
+    clip = camdkit.registry.read_clip(vendor, paths)
+    _generate_reader_coverage(fp, reader_name, doc, clip)
 
 if __name__ == "__main__":
   clip_doc = camdkit.model.Clip.make_documentation()